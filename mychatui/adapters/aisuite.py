@@ -7,12 +7,15 @@ from mychatui.adapters.beanutils import getBeanValue
 
 from aisuite.framework.chat_completion_response import ChatCompletionResponse
 
+
 class AiSuiteAdapter:
     def __init__(self):
         pass
 
     def getChatHistory(self, tab_chat_history):
-        return tab_chat_history
+        # Messages also carry the raw text for the native renderer; only role
+        # and content go to the provider.
+        return [{"role": m["role"], "content": m["content"]} for m in tab_chat_history]
 
     def getResponse(self, response):
         if isinstance(response, ChatCompletionResponse):
@@ -30,6 +33,7 @@ class AiSuiteAdapter:
         return {
             "role": role,
             "content": content,
+            "usage": response_dict.get("usage"),
         }
 
     def getResponseFromChatCompletionResponse(self, response):
@@ -38,12 +42,19 @@ class AiSuiteAdapter:
         choice = response.choices[0]
         response_text = choice.message.content
         role = choice.message.role
-        
-        return {
+
+        result = {
             "role": role,
             "content": response_text,
         }
-
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            result["usage"] = {
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "completion_tokens": getattr(usage, "completion_tokens", None),
+                "total_tokens": getattr(usage, "total_tokens", None),
+            }
+        return result
 
     def completion(self, model, messages, base_url=None):
         client = ai.Client()
@@ -58,14 +69,9 @@ class AiSuiteAdapter:
                 model=model, messages=messages, base_url=base_url
             )
         else:
-            response = client.chat.completions.create(
-                model=model, messages=messages
-                )
+            response = client.chat.completions.create(model=model, messages=messages)
 
         if response is not None:
             response = self.aisuite_adapter.getResponse(response)
 
         return response
-
-        
-        
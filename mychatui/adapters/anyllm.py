@@ -1,6 +1,7 @@
 """
 Utility class to transform aisuite messages to mychatui chat_history representation.
 """
+
 import os
 import pprint
 
@@ -8,18 +9,29 @@ from mychatui.adapters.beanutils import getBeanValue
 
 from any_llm import completion
 
+
 class AnyLlmAdapter:
     def __init__(self):
         pass
 
     def getChatHistory(self, tab_chat_history):
-        return tab_chat_history
+        # Messages also carry the raw text for the native renderer; only role
+        # and content go to the provider.
+        return [{"role": m["role"], "content": m["content"]} for m in tab_chat_history]
 
     def getResponse(self, response):
         """
         Transform any_llm completion to mychatui chat_history representation.
         """
-        return { "role": "assistant", "content": response.choices[0].message.content }
+        result = {"role": "assistant", "content": response.choices[0].message.content}
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            result["usage"] = {
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "completion_tokens": getattr(usage, "completion_tokens", None),
+                "total_tokens": getattr(usage, "total_tokens", None),
+            }
+        return result
 
     def completion(self, model, messages, base_url=None):
         """
@@ -36,4 +48,3 @@ class AnyLlmAdapter:
             response = self.getResponse(response)
 
         return response
-
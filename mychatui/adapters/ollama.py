@@ -0,0 +1,181 @@
+"""
+Native Ollama adapter: streams chat tokens from /api/chat and keeps models loaded.
+
+Models are named the same way as for any_llm (``ollama:<model>``). ``preload()``
+asks Ollama to load a model without generating anything, so picking a local
+model in the UI pays the load time in the background instead of on the first
+message, and ``keep_alive`` keeps it resident between messages.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_PREFIX = "ollama:"
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+
+
+def ollama_base_url(url: Optional[str] = None) -> str:
+    """Resolve the server URL from ``url``, ``$OLLAMA_HOST`` or the default."""
+    url = url or os.getenv("OLLAMA_HOST") or DEFAULT_OLLAMA_URL
+    if "://" not in url:
+        url = "http://" + url
+    return url.rstrip("/")
+
+
+class OllamaAdapter:
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        keep_alive: str = "30m",
+        timeout: float = 300.0,
+        rewarm_after: float = 60.0,
+    ):
+        """
+        Args:
+            base_url: Ollama server, defaults to ``$OLLAMA_HOST`` or localhost:11434
+            keep_alive: How long Ollama keeps a model loaded after each request
+                (Ollama duration such as "30m", or -1 to keep it forever)
+            timeout: Socket timeout for requests
+            rewarm_after: Seconds after a preload or message during which another
+                preload of the same model is skipped
+        """
+        self.base_url = ollama_base_url(base_url)
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.rewarm_after = rewarm_after
+        self._lock = threading.Lock()
+        self._warming = set()
+        self._last_used: Dict[str, float] = {}
+
+    @staticmethod
+    def is_local_model(model: Optional[str]) -> bool:
+        return bool(model) and model.startswith(OLLAMA_PREFIX)
+
+    @staticmethod
+    def model_name(model: str) -> str:
+        return model[len(OLLAMA_PREFIX) :] if model.startswith(OLLAMA_PREFIX) else model
+
+    def getChatHistory(self, tab_chat_history):
+        return [{"role": m["role"], "content": m["content"]} for m in tab_chat_history]
+
+    def getResponse(self, content: str, final: Dict) -> Dict:
+        """Build the mychatui response from streamed text and the final chunk."""
+        return {
+            "role": "assistant",
+            "content": content,
+            "usage": {
+                "prompt_tokens": final.get("prompt_eval_count"),
+                "completion_tokens": final.get("eval_count"),
+                "total_tokens": (final.get("prompt_eval_count") or 0)
+                + (final.get("eval_count") or 0),
+            },
+        }
+
+    def _post(self, path: str, payload: Dict):
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def _touch(self, model: str) -> None:
+        with self._lock:
+            self._last_used[model] = time.monotonic()
+
+    def preload(self, model: str) -> bool:
+        """
+        Load ``model`` into memory without generating anything.
+
+        Returns:
+            True if Ollama loaded (or already had) the model
+        """
+        name = self.model_name(model)
+        start = time.monotonic()
+        try:
+            with self._post(
+                "/api/generate", {"model": name, "keep_alive": self.keep_alive}
+            ) as response:
+                response.read()
+        except OSError as e:
+            logger.warning(f"Could not preload {name}: {e}")
+            return False
+        self._touch(model)
+        logger.info(f"Preloaded {name} in {time.monotonic() - start:.2f}s")
+        return True
+
+    def preload_async(self, model: Optional[str]) -> Optional[threading.Thread]:
+        """
+        Preload a local model on a background thread.
+
+        Skipped for non-Ollama models, models already being loaded and models
+        used within ``rewarm_after`` seconds.
+        """
+        if not self.is_local_model(model):
+            return None
+        with self._lock:
+            recent = time.monotonic() - self._last_used.get(model, -1e9)
+            if model in self._warming or recent < self.rewarm_after:
+                return None
+            self._warming.add(model)
+
+        def warm():
+            try:
+                self.preload(model)
+            finally:
+                with self._lock:
+                    self._warming.discard(model)
+
+        thread = threading.Thread(target=warm, name="ollama-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def completion(
+        self,
+        model: str,
+        messages: List[Dict],
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict:
+        """
+        Stream a chat completion, calling ``on_token`` with each piece of text.
+
+        Raises:
+            RuntimeError: if Ollama reports an error
+        """
+        payload = {
+            "model": self.model_name(model),
+            "messages": messages,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+        }
+        parts = []
+        final: Dict = {}
+        try:
+            response = self._post("/api/chat", payload)
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"Ollama error: {e.read().decode('utf-8', 'replace')}")
+        with response:
+            for line in response:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                token = chunk.get("message", {}).get("content", "")
+                if token:
+                    parts.append(token)
+                    if on_token:
+                        on_token(token)
+                if chunk.get("done"):
+                    final = chunk
+                    break
+        self._touch(model)
+        return self.getResponse("".join(parts), final)
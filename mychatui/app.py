@@ -13,6 +13,8 @@ from datetime import datetime
 import any_llm as ai
 from mychatui.adapters.aisuite import AiSuiteAdapter
 from mychatui.adapters.anyllm import AnyLlmAdapter
+from mychatui.adapters.ollama import OllamaAdapter
+from mychatui.prewarm import prewarm_in_background
 
 # Set up basic logging
 log_file = os.path.expanduser("~/mychatui_debug.log")
@@ -49,12 +51,51 @@ try:
     from mychatui.preferences import PreferencesWindow
     from mychatui.menu import HamburgerMenu
     from mychatui.voice_input import VoiceInput
+    from mychatui.listen_daemon import get_listen_daemon, shutdown_listen_daemons
+    from mychatui.conversation_store import ConversationStore, DEFAULT_STORE_PATH
+    from mychatui.search_dialog import SearchDialog
+    from mychatui.usage_dialog import UsageDialog
+    from mychatui.usage_store import DEFAULT_USAGE_PATH, UsageStore
+    from mychatui.model_router import AUTO_MODEL, ModelRouter
+    from mychatui.autosave import AutosaveService
+    from mychatui.tab_files import (
+        TAB_FILE_EXTENSIONS,
+        is_tab_archive,
+        read_newest_first,
+        tab_file_path,
+        write_tab_file,
+    )
+    from mychatui.tab_pager import TabPager
+    from mychatui.prompt_queue import PromptQueue
+    from mychatui.pending_prompts import PendingPromptsFrame
+    from mychatui.context_index import (
+        ContextIndexer,
+        TabContextIndex,
+        numpy_available,
+        select_context,
+    )
+    import itertools
     import json
     import threading
-    from markdown_it import MarkdownIt
-    from mdit_py_plugins.front_matter import front_matter_plugin
+    import time
     from tkhtmlview import HTMLScrolledText
+    from mychatui.highlight import pygments_available, shared_highlighter
+    from mychatui.markdown_render import shared_renderer
+    from mychatui.palette import Palette
+    from mychatui.render_pipeline import RenderPipeline
+    from mychatui.render_scheduler import RenderScheduler
+    from mychatui.render_processes import ProcessRenderBackend
+    from mychatui.text_renderer import TextRenderer, insert_fragments
+    from mychatui.ui_events import (
+        Delta,
+        Done,
+        Error,
+        Progress,
+        Transcription,
+        UiEventBus,
+    )
     import tkinter as tk
+    from tkinter.scrolledtext import ScrolledText
     from tkinter import filedialog
     from bs4 import BeautifulSoup
 
@@ -134,18 +175,107 @@ class App(customtkinter.CTk):
             logger.info("Window properties set")
 
             self.load_config()
+            self.palette = Palette.from_config(self.config.get("palette"))
+            self.markdown_renderer = shared_renderer()
             logger.info("Configuration loaded")
 
+            self.conversation_store = None
+            if self.config.get("conversation_store") == "sqlite":
+                self.conversation_store = ConversationStore(
+                    os.path.expanduser(
+                        self.config.get("conversation_store_path", DEFAULT_STORE_PATH)
+                    )
+                )
+                logger.info("Conversation store opened")
+
+            self.usage_store = None
+            if self.config.get("usage_stats", True):
+                try:
+                    self.usage_store = UsageStore(
+                        os.path.expanduser(
+                            self.config.get("usage_store_path", DEFAULT_USAGE_PATH)
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Error opening usage store: {str(e)}")
+
+            default_model = self.config.get("model")
+            self.model_router = ModelRouter(
+                self.config.get("auto_model"),
+                default_model if default_model != AUTO_MODEL else None,
+            )
+
+            self.autosave = None
+            if self.config.get("autosave", True):
+                self.autosave = AutosaveService(
+                    self._write_tab_data,
+                    delay=self.config.get("autosave_delay", 2.0),
+                )
+                logger.info("Autosave started")
+
+            self.context_indexer = None
+            if self.config.get("retrieval_context", False):
+                if numpy_available():
+                    self.context_indexer = ContextIndexer()
+                    logger.info("Retrieval context indexer started")
+                else:
+                    logger.warning("retrieval_context needs numpy; using full history")
+
             # Set up grid
             self.grid_columnconfigure(0, weight=1)
             self.grid_rowconfigure(1, weight=1)
             logger.info("Grid layout configured")
 
+            self.ui_events = UiEventBus(
+                self.after, interval_ms=self.config.get("ui_event_interval_ms", 16)
+            )
+            self.ui_events.subscribe(Delta, self.on_reply_delta)
+            self.ui_events.subscribe(Done, self.on_reply_done)
+            self.ui_events.subscribe(Error, self.on_reply_error)
+            self.ui_events.subscribe(Progress, self.on_request_progress)
+            self.ui_events.subscribe(Transcription, self.on_transcription)
+            self._requests_in_flight = 0
+            self.ui_events.start()
+
+            self.render_pipeline = RenderPipeline(
+                self.after,
+                workers=self.config.get("render_workers", 2),
+                post=self.ui_events.call,
+            )
+            self.render_scheduler = RenderScheduler(
+                self.after,
+                self.after_idle,
+                lambda tab: self.update_textbox_html(tab, tab.textbox),
+                self.is_current_tab,
+                frame_seconds=1 / self.config.get("render_fps", 60),
+            )
+            self.render_processes = ProcessRenderBackend(
+                threshold=self.config.get("render_process_threshold", 100_000)
+            )
+            if self.config.get("render_process_prestart", False):
+                self.after_idle(self.render_processes.start)
+            self.highlighting = (
+                self.config.get("code_highlighting", True) and pygments_available()
+            )
+            self._highlight_jobs = itertools.count()
+
             # Initialize UI components
             self.init_ui()
             self.aisuite_adapter = AiSuiteAdapter()
             self.anyllm_adapter = AnyLlmAdapter()
+            self.ollama_adapter = OllamaAdapter(
+                base_url=self.config.get("ollama_url"),
+                keep_alive=self.config.get("ollama_keep_alive", "30m"),
+            )
             logger.info("UI initialization complete")
+            self.after_idle(self.warm_current_model)
+            if self.config.get("prewarm", True):
+                self.after_idle(self.prewarm_connections)
+
+            if self.config.get("voice_daemon", False) and self.config.get(
+                "voice_daemon_prestart", False
+            ):
+                self.after_idle(self.prestart_voice_daemon)
 
         except Exception as e:
             logger.error(f"Error during App initialization: {str(e)}")
@@ -182,8 +312,54 @@ class App(customtkinter.CTk):
 
     def on_tab_change(self):
         self.menu_frame.update_model_menu()
+        self.warm_current_model()
+        current_tab = self.tab_view.get()
+        if current_tab:
+            self.render_scheduler.show(self.tab_view.tab(current_tab))
+
+    def is_current_tab(self, tab):
+        current_tab = self.tab_view.get()
+        return bool(current_tab) and self.tab_view.tab(current_tab) is tab
+
+    def request_render(self, tab):
+        """Re-render a tab's transcript in the next frame (or once it is shown)."""
+        self.update_context_index(tab)
+        self.render_scheduler.mark_dirty(tab)
+
+    def warm_model(self, model):
+        """Load a local model in the background so the next message doesn't wait."""
+        if self.config.get("ollama_native", True) and hasattr(self, "ollama_adapter"):
+            models = self.model_router.models() if model == AUTO_MODEL else [model]
+            for name in models:
+                self.ollama_adapter.preload_async(name)
+
+    def prewarm_connections(self):
+        """Connect to every provider the open tabs use, off the UI thread."""
+        models = [self.config.get("model")]
+        for tab_name in self.tab_view._name_list:
+            models.append(getattr(self.tab_view.tab(tab_name), "model", None))
+        if AUTO_MODEL in models:
+            models.extend(self.model_router.models())
+        prewarm_in_background(models, {"ollama": self.config.get("ollama_url")})
+
+    def warm_current_model(self):
+        current_tab = self.tab_view.get()
+        if current_tab:
+            self.warm_model(getattr(self.tab_view.tab(current_tab), "model", None))
 
     def on_closing(self):
+        if self.autosave is not None:
+            self.autosave.stop()
+        shutdown_listen_daemons()
+        if self.context_indexer is not None:
+            self.context_indexer.stop()
+        self.ui_events.stop()
+        self.render_pipeline.shutdown()
+        self.render_processes.shutdown()
+        if self.usage_store is not None:
+            self.usage_store.close()
+        if self.conversation_store is not None:
+            self.conversation_store.close()
         self.save_config()
         self.destroy()
 
@@ -258,6 +434,7 @@ class App(customtkinter.CTk):
                 tab_name = f"Tab {self.tab_count}"
             self.tab_view.add(tab_name)
             tab = self.tab_view.tab(tab_name)
+            tab.tab_name = tab_name
             tab.model = self.config.get("model")
             self.tab_view.set(tab_name)
             self.create_chat_widgets(tab)
@@ -277,6 +454,11 @@ class App(customtkinter.CTk):
             if new_name:
                 current_tab_name = self.tab_view.get()
                 self.tab_view.rename(current_tab_name, new_name)
+                tab = self.tab_view.tab(new_name)
+                tab.tab_name = new_name
+                # The new name may belong to another saved conversation.
+                tab.owns_save_file = False
+                self.mark_tab_dirty(tab)
                 logger.info("Tab renamed successfully")
         except Exception as e:
             logger.error(f"Error renaming tab: {str(e)}")
@@ -288,8 +470,9 @@ class App(customtkinter.CTk):
         try:
             current_tab_name = self.tab_view.get()
             tab = self.tab_view.tab(current_tab_name)
-            tab.chat_history = []
-            self.update_textbox_html(tab, tab.winfo_children()[0])
+            self.set_tab_history(tab, [])
+            self.request_render(tab)
+            self.mark_tab_dirty(tab)
             logger.info("Tab history cleared successfully")
         except Exception as e:
             logger.error(f"Error clearing tab history: {str(e)}")
@@ -301,7 +484,7 @@ class App(customtkinter.CTk):
         try:
             current_tab_name = self.tab_view.get()
             tab = self.tab_view.tab(current_tab_name)
-            self.update_textbox_html(tab, tab.winfo_children()[0])
+            self.request_render(tab)
             logger.info("Tab history refreshed successfully")
         except Exception as e:
             logger.error(f"Error refreshing tab history: {str(e)}")
@@ -312,7 +495,13 @@ class App(customtkinter.CTk):
         logger.info("Closing current tab...")
         try:
             current_tab_name = self.tab_view.get()
+            tab = self.tab_view.tab(current_tab_name)
+            self.render_scheduler.forget(tab)
+            self.render_pipeline.forget(tab)
             self.tab_view.delete(current_tab_name)
+            # Deleting selects another tab without calling on_tab_change.
+            if self.tab_view.get():
+                self.render_scheduler.show(self.tab_view.tab(self.tab_view.get()))
             logger.info("Tab closed successfully")
         except Exception as e:
             logger.error(f"Error closing tab: {str(e)}")
@@ -325,20 +514,15 @@ class App(customtkinter.CTk):
             current_tab_name = self.tab_view.get()
             tab = self.tab_view.tab(current_tab_name)
 
-            tab_data = {
-                "tab_name": current_tab_name,
-                "model_name": tab.model,
-                "chat_history": tab.chat_history,
-            }
+            def snapshot():
+                return self.get_tab_data(tab, current_tab_name)
 
-            config_dir = os.path.dirname(self.config_file)
-            if not os.path.exists(config_dir):
-                os.makedirs(config_dir)
-
-            file_path = os.path.join(config_dir, f"{current_tab_name}.json")
-
-            with open(file_path, "w") as f:
-                json.dump(tab_data, f, indent=4)
+            if self.autosave is not None:
+                # Serialized with any autosave of this tab already writing.
+                file_path = self.autosave.save_now(tab, snapshot)
+            else:
+                file_path = self._write_tab_data(snapshot())
+            tab.owns_save_file = True
             logger.info(f"Tab saved successfully to {file_path}")
             self.show_transient_message(f"Tab '{current_tab_name}' saved successfully.")
         except Exception as e:
@@ -346,6 +530,74 @@ class App(customtkinter.CTk):
             logger.error(traceback.format_exc())
             self.show_transient_message(f"Error saving tab: {e}", is_error=True)
 
+    def get_tab_data(self, tab, tab_name=None):
+        """Snapshot a tab in save file form; safe to call off the Tk thread."""
+        # The lock keeps the pager open and consistent with history_start and
+        # chat_history while the older pages are read.
+        with tab.history_lock:
+            chat_history = [m for m in list(tab.chat_history) if not m.get("partial")]
+            pager = getattr(tab, "pager", None)
+            if isinstance(pager, TabPager) and tab.history_start > 0:
+                # Older pages that were never loaded still belong in the save.
+                chat_history = pager.read_page(0, tab.history_start) + chat_history
+        return {
+            "tab_name": tab_name if tab_name is not None else tab.tab_name,
+            "model_name": tab.model,
+            "chat_history": chat_history,
+        }
+
+    def _write_tab_data(self, tab_data):
+        """Persist a tab snapshot to its save file and the conversation store."""
+        config_dir = os.path.dirname(self.config_file)
+        file_path = tab_file_path(
+            config_dir,
+            tab_data["tab_name"],
+            self.config.get("tab_archive_format", "json"),
+        )
+        write_tab_file(file_path, tab_data)
+        if self.conversation_store is not None:
+            self.conversation_store.save_tab(
+                tab_data["tab_name"], tab_data["model_name"], tab_data["chat_history"]
+            )
+        return file_path
+
+    def mark_tab_dirty(self, tab):
+        """Queue a tab for the next background autosave."""
+        if getattr(tab, "loading", False):
+            # Saving now would write a partial history; save once loading finishes.
+            tab.dirty_after_load = True
+            return
+        if self.autosave is not None and self.may_autosave(tab):
+            self.autosave.mark_dirty(tab, lambda: self.get_tab_data(tab))
+
+    def may_autosave(self, tab):
+        """
+        Whether autosave may write ``tab``'s save file: only if this session
+        opened or saved it, or there is none yet. A new tab that shares its
+        name with an earlier conversation must not overwrite it.
+        """
+        if getattr(tab, "owns_save_file", False):
+            return True
+        config_dir = os.path.dirname(self.config_file)
+        exists = any(
+            os.path.exists(tab_file_path(config_dir, tab.tab_name, save_format))
+            for save_format in TAB_FILE_EXTENSIONS
+        )
+        if not exists and self.conversation_store is not None:
+            exists = tab.tab_name in self.conversation_store.list_tabs()
+        if exists:
+            if not getattr(tab, "autosave_refused", False):
+                tab.autosave_refused = True
+                logger.warning(f"Not autosaving over saved tab '{tab.tab_name}'")
+                self.show_transient_message(
+                    f"Tab '{tab.tab_name}' is not autosaved: a saved tab has that "
+                    "name. Save it to overwrite.",
+                    is_error=True,
+                )
+            return False
+        tab.owns_save_file = True
+        return True
+
     def show_transient_message(self, message, is_error=False):
         """Displays a transient message label that fades out."""
         if is_error:
@@ -372,52 +624,306 @@ class App(customtkinter.CTk):
             file_path = filedialog.askopenfilename(
                 initialdir=config_dir,
                 defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                filetypes=[
+                    ("Tab files", "*.json *.jsonl *.jsonl.gz *.jsonl.zst"),
+                    ("JSON files", "*.json"),
+                    ("All files", "*.*"),
+                ],
             )
-            if file_path:
+            if (
+                file_path
+                and file_path.endswith(".jsonl")
+                and self.config.get("paged_load", False)
+            ):
+                self.open_tab_paged(file_path)
+            elif file_path and is_tab_archive(file_path):
+                self.open_tab_archive(file_path)
+            elif file_path:
                 with open(file_path, "r") as f:
                     tab_data = json.load(f)
 
-                tab_name = tab_data.get("tab_name", "New Tab")
-
-                # Check if tab already exists
-                if tab_name in self.tab_view._name_list:
-                    tab = self.tab_view.tab(tab_name)
-                else:
-                    self.add_new_tab(tab_name)
-                    tab = self.tab_view.tab(tab_name)
-
-                tab.model = tab_data.get("model_name")
-                tab.chat_history = tab_data.get("chat_history", [])
-
-                self.update_textbox_html(tab, tab.winfo_children()[0])
-                self.menu_frame.update_model_menu()
+                self.restore_tab(tab_data)
                 logger.info("Tab opened successfully")
         except Exception as e:
             logger.error(f"Error opening tab: {str(e)}")
             logger.error(traceback.format_exc())
             raise
 
+    def open_tab_paged(self, file_path):
+        """Open a .jsonl tab archive showing only its newest page of messages."""
+        logger.info(f"Opening tab {file_path} in paged mode...")
+        pager = TabPager(file_path)
+        count = pager.message_count
+        start = max(0, count - self.config.get("page_size", 50))
+        tab = self.restore_tab(
+            {
+                "tab_name": pager.header.get("tab_name") or "New Tab",
+                "model_name": pager.header.get("model_name"),
+                "chat_history": pager.read_page(start, count),
+            },
+            pager=pager,
+            history_start=start,
+        )
+
+        textbox = tab.winfo_children()[0]
+        if not getattr(tab, "scroll_hooked", False):
+            textbox.configure(
+                yscrollcommand=lambda first, last: self._on_textbox_scroll(
+                    tab, textbox, first, last
+                )
+            )
+            tab.scroll_hooked = True
+        logger.info(f"Loaded {count - start} of {count} messages")
+
+    def _on_textbox_scroll(self, tab, textbox, first, last):
+        textbox.vbar.set(first, last)
+        if (
+            float(first) <= 0.0
+            and getattr(tab, "pager", None) is not None
+            and tab.history_start > 0
+            and not getattr(tab, "loading_page", False)
+        ):
+            tab.loading_page = True
+            self.after_idle(self.load_older_page, tab, textbox)
+
+    def load_older_page(self, tab, textbox):
+        """Prepend the previous page of a paged tab, keeping the view in place."""
+        logger.info("Loading older page...")
+        try:
+            stop = tab.history_start
+            start = max(0, stop - self.config.get("page_size", 50))
+            older = tab.pager.read_page(start, stop)
+            old_lines = int(textbox.index("end-1c").split(".")[0])
+
+            with tab.history_lock:
+                tab.chat_history = older + tab.chat_history
+                tab.history_start = start
+
+            def keep_view():
+                new_lines = int(textbox.index("end-1c").split(".")[0])
+                textbox.yview_moveto((new_lines - old_lines) / max(new_lines, 1))
+                # Only now is the view off the top; clearing the flag earlier
+                # lets the scroll callback start the next page straight away.
+                tab.loading_page = False
+
+            self.update_textbox_html(tab, textbox, on_rendered=keep_view)
+            logger.info(f"Loaded {len(older)} older messages")
+        except Exception as e:
+            logger.error(f"Error loading older page: {str(e)}")
+            logger.error(traceback.format_exc())
+            tab.loading_page = False
+
+    def open_tab_archive(self, file_path):
+        """Open a compressed tab archive, showing the newest messages first."""
+        logger.info(f"Streaming tab archive {file_path}...")
+        thread = threading.Thread(
+            target=self._stream_tab_archive,
+            args=(file_path, self.config.get("stream_first_messages", 20)),
+            daemon=True,
+        )
+        thread.start()
+
+    def _stream_tab_archive(self, file_path, first_count):
+        try:
+            batches = read_newest_first(file_path, first_count)
+            header, newest = next(batches)
+            # Filled in on the Tk thread; the bus runs calls in posting order,
+            # so the finish below always sees it.
+            opened = {}
+
+            def begin():
+                opened["tab"] = self._begin_streamed_tab(header, newest)
+
+            self.ui_events.call(begin)
+            older = []
+            for _, older in batches:
+                pass
+            self.ui_events.call(
+                lambda: self._finish_streamed_tab(opened.get("tab"), older)
+            )
+            logger.info("Tab archive streamed successfully")
+        except Exception as e:
+            logger.error(f"Error streaming tab archive: {str(e)}")
+            logger.error(traceback.format_exc())
+            self.ui_events.call(
+                self.show_transient_message, f"Error opening tab: {e}", True
+            )
+
+    def _begin_streamed_tab(self, header, newest):
+        tab = self.restore_tab(
+            {
+                "tab_name": header.get("tab_name") or "New Tab",
+                "model_name": header.get("model_name"),
+                "chat_history": newest,
+            }
+        )
+        tab.loading = True
+        tab.dirty_after_load = False
+        return tab
+
+    def _finish_streamed_tab(self, tab, older):
+        if (
+            tab is None
+            or tab.tab_name not in self.tab_view._name_list
+            or self.tab_view.tab(tab.tab_name) is not tab
+        ):
+            # Failed to open, or closed while the rest of the archive was read.
+            return
+        with tab.history_lock:
+            tab.chat_history = older + tab.chat_history
+        tab.loading = False
+        if older:
+            self.request_render(tab)
+        if tab.dirty_after_load:
+            self.mark_tab_dirty(tab)
+
+    def restore_tab(self, tab_data, pager=None, history_start=0):
+        """
+        Show saved tab data in its tab, creating the tab if it isn't open.
+        ``pager`` holds the messages before ``history_start`` of a paged tab.
+        """
+        tab_name = tab_data.get("tab_name", "New Tab")
+
+        # Check if tab already exists
+        if tab_name in self.tab_view._name_list:
+            tab = self.tab_view.tab(tab_name)
+        else:
+            self.add_new_tab(tab_name)
+            tab = self.tab_view.tab(tab_name)
+
+        tab.model = tab_data.get("model_name")
+        tab.owns_save_file = True
+        self.set_tab_history(
+            tab, list(tab_data.get("chat_history", [])), pager, history_start
+        )
+
+        self.request_render(tab)
+        self.menu_frame.update_model_menu()
+        self.warm_model(tab.model)
+        return tab
+
+    def open_tab_from_store(self, tab_name):
+        logger.info(f"Opening tab '{tab_name}' from conversation store...")
+        try:
+            tab_data = self.conversation_store.load_tab(tab_name)
+            if tab_data is None:
+                self.show_transient_message(
+                    f"Tab '{tab_name}' not found in store.", is_error=True
+                )
+                return
+            self.restore_tab(tab_data)
+            logger.info("Tab opened from store successfully")
+        except Exception as e:
+            logger.error(f"Error opening tab from store: {str(e)}")
+            logger.error(traceback.format_exc())
+            self.show_transient_message(f"Error opening tab: {e}", is_error=True)
+
+    def open_search(self):
+        logger.info("Opening conversation search...")
+        try:
+            if self.conversation_store is None:
+                self.show_transient_message(
+                    "Conversation store is disabled; set conversation_store to "
+                    '"sqlite" in config.json.',
+                    is_error=True,
+                )
+                return
+            dialog = SearchDialog(
+                self, self.conversation_store, on_select=self.open_tab_from_store
+            )
+            dialog.grab_set()
+            logger.info("Conversation search opened successfully")
+        except Exception as e:
+            logger.error(f"Error opening search: {str(e)}")
+            logger.error(traceback.format_exc())
+            self.show_transient_message(f"Error opening search: {e}", is_error=True)
+
+    def open_usage_stats(self):
+        logger.info("Opening usage stats...")
+        try:
+            if self.usage_store is None:
+                self.show_transient_message(
+                    "Usage stats are disabled; set usage_stats to true in config.json.",
+                    is_error=True,
+                )
+                return
+            UsageDialog(self, self.usage_store, self.config.get("pricing"))
+            logger.info("Usage stats opened successfully")
+        except Exception as e:
+            logger.error(f"Error opening usage stats: {str(e)}")
+            logger.error(traceback.format_exc())
+            self.show_transient_message(
+                f"Error opening usage stats: {e}", is_error=True
+            )
+
+    def import_saved_tabs(self):
+        logger.info("Importing saved tabs into conversation store...")
+        try:
+            if self.conversation_store is None:
+                self.show_transient_message(
+                    "Conversation store is disabled; set conversation_store to "
+                    '"sqlite" in config.json.',
+                    is_error=True,
+                )
+                return
+            count = self.conversation_store.import_json_dir(
+                os.path.dirname(self.config_file)
+            )
+            self.show_transient_message(f"Imported {count} saved tabs.")
+        except Exception as e:
+            logger.error(f"Error importing saved tabs: {str(e)}")
+            logger.error(traceback.format_exc())
+            self.show_transient_message(f"Error importing tabs: {e}", is_error=True)
+
+    def set_tab_history(self, tab, chat_history, pager=None, history_start=0):
+        """
+        Replace a tab's chat_history and pager together, closing the old pager.
+
+        Done under the tab's history lock so a save running on another thread
+        never reads a closed pager or a pager that doesn't match the history.
+        """
+        with tab.history_lock:
+            old_pager = getattr(tab, "pager", None)
+            tab.chat_history = chat_history
+            tab.pager = pager
+            tab.history_start = history_start
+            if old_pager is not None and old_pager is not pager:
+                old_pager.close()
+
     def create_chat_widgets(self, tab):
         logger.info("Creating chat widgets...")
         try:
             tab.grid_rowconfigure(0, weight=1)
             tab.grid_rowconfigure(1, weight=0)
+            tab.grid_rowconfigure(2, weight=0)
             tab.grid_columnconfigure(0, weight=1)
             tab.grid_columnconfigure(1, weight=0)
             tab.grid_columnconfigure(2, weight=0)
 
+            tab.history_lock = threading.Lock()
+            # on_rendered callbacks waiting for the tab's next finished render.
+            tab.render_callbacks = []
             tab.chat_history = []
             tab.history_index = None
+            tab.pager = None
+            tab.history_start = 0
 
             font = (None, self.font_size)
 
-            textbox = HTMLScrolledText(tab, font=font)
+            dark = customtkinter.get_appearance_mode() == "Dark"
+            tab.text_renderer = None
+            if self.config.get("renderer", "html") == "native":
+                textbox = ScrolledText(tab, font=font, wrap="word")
+                tab.text_renderer = TextRenderer(
+                    textbox, self.font_size, dark, self.palette
+                )
+            else:
+                textbox = HTMLScrolledText(tab, font=font)
             textbox.grid(row=0, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
+            tab.textbox = textbox
 
-            darkback = "#002b36"
-            if customtkinter.get_appearance_mode() == "Dark":
-                textbox.configure(background=darkback)
+            if dark:
+                textbox.configure(background=self.palette.dark_background)
 
             self.create_context_menu(textbox)
 
@@ -425,16 +931,22 @@ class App(customtkinter.CTk):
                 tab, placeholder_text="Send a message", font=font
             )
             entry.grid(row=1, column=0, sticky="ew", padx=(5, 0), pady=5)
+            tab.entry = entry
             entry.bind("<Return>", lambda event: self.send_message(tab, textbox, entry))
             entry.bind("<Up>", lambda event: self.navigate_history(tab, entry, -1))
             entry.bind("<Down>", lambda event: self.navigate_history(tab, entry, 1))
 
             # 1. Load the image
             from PIL import Image
+
             mic_image = customtkinter.CTkImage(
-                light_image=Image.open("/usr/share/icons/HighContrast/24x24/devices/audio-input-microphone.png"),
-                dark_image=Image.open("/usr/share/icons/HighContrast/24x24/devices/audio-input-microphone.png"),
-                size=(24, 24)
+                light_image=Image.open(
+                    "/usr/share/icons/HighContrast/24x24/devices/audio-input-microphone.png"
+                ),
+                dark_image=Image.open(
+                    "/usr/share/icons/HighContrast/24x24/devices/audio-input-microphone.png"
+                ),
+                size=(24, 24),
             )
 
             # Microphone button for voice input
@@ -445,7 +957,7 @@ class App(customtkinter.CTk):
                 image=mic_image,
                 width=50,
                 command=lambda: self.open_voice_input(tab, entry),
-                font=("Segoe UI Emoji", 18), # Font with emoji support
+                font=("Segoe UI Emoji", 18),  # Font with emoji support
             )
             mic_button.grid(row=1, column=1, sticky="e", padx=5, pady=5)
 
@@ -456,6 +968,14 @@ class App(customtkinter.CTk):
                 command=lambda: self.send_message(tab, textbox, entry),
             )
             send_button.grid(row=1, column=2, sticky="e", padx=5, pady=5)
+
+            # Prompts sent while a reply is in flight wait here.
+            tab.prompt_queue = PromptQueue()
+            tab.pending_prompts = PendingPromptsFrame(tab, tab.prompt_queue, font)
+            tab.pending_prompts.grid(
+                row=2, column=0, columnspan=3, sticky="ew", padx=5, pady=(0, 5)
+            )
+            tab.pending_prompts.refresh()
             logger.info("Chat widgets created successfully")
         except Exception as e:
             logger.error(f"Error creating chat widgets: {str(e)}")
@@ -505,7 +1025,7 @@ class App(customtkinter.CTk):
             raise
 
     def navigate_history(self, tab, entry, direction):
-        user_messages = [msg["content"] for msg in tab.chat_history if msg["role"] == "user"]
+        user_messages = [msg for msg in tab.chat_history if msg["role"] == "user"]
         if not user_messages:
             self.flash_widget(entry)
             return
@@ -525,9 +1045,12 @@ class App(customtkinter.CTk):
             return
 
         if 0 <= tab.history_index < len(user_messages):
-            message_html = user_messages[tab.history_index]
-            soup = BeautifulSoup(message_html, "html.parser")
-            message_text = soup.get_text().replace("🧑 You: ", "")
+            message = user_messages[tab.history_index]
+            if message.get("text") is not None:
+                message_text = message["text"]
+            else:
+                soup = BeautifulSoup(message["content"], "html.parser")
+                message_text = soup.get_text().replace("🧑 You: ", "")
             entry.delete(0, "end")
             entry.insert(0, message_text)
 
@@ -542,30 +1065,79 @@ class App(customtkinter.CTk):
         try:
             message = entry.get()
             if message:
-                tab.chat_history.append(
-                    {"role": "user", "content": f"<p>🧑 You: {message}</p>"}
-                )
-                self.update_textbox_html(tab, textbox)
                 entry.delete(0, "end")
-                self.menu_frame.progress_bar.grid()
-                self.menu_frame.progress_bar.start()
-
-                # TODO: send the chat history to the AI
-                thread = threading.Thread(
-                    target=self._get_ai_response_threaded,
-                    args=(tab, textbox, message, tab.model),
-                )
-                thread.start()
-                logger.info("Message sent successfully")
+                # One request per tab at a time; later prompts wait their turn.
+                if tab.prompt_queue.submit(message) is None:
+                    tab.pending_prompts.refresh()
+                    logger.info("Message queued behind the reply in flight")
+                    return
+                self.send_prompt(tab, textbox, message)
         except Exception as e:
             logger.error(f"Error sending message: {str(e)}")
             logger.error(traceback.format_exc())
             raise
 
+    def send_prompt(self, tab, textbox, message):
+        """Append the user's message to the tab and request the reply."""
+        model = tab.model
+        route_error = None
+        if model == AUTO_MODEL:
+            try:
+                route = self.model_router.route(message)
+                model = route.model
+                logger.info(f"Auto model chose {model} ({route.reason})")
+            except ValueError as e:
+                route_error = e
+        tab.chat_history.append(
+            {
+                "role": "user",
+                "content": f"<p>🧑 You: {message}</p>",
+                "text": message,
+                "model": model,
+            }
+        )
+        self.request_render(tab)
+        self.mark_tab_dirty(tab)
+        if route_error is not None:
+            self.ui_events.post(Error(tab, textbox, route_error))
+            return
+
+        # TODO: send the chat history to the AI
+        thread = threading.Thread(
+            target=self._get_ai_response_threaded,
+            args=(tab, textbox, message, model),
+        )
+        thread.start()
+        logger.info("Message sent successfully")
+
+    def send_next_prompt(self, tab, textbox):
+        """The tab's reply arrived; send its next pending prompt, if any."""
+        message = tab.prompt_queue.finish()
+        tab.pending_prompts.refresh()
+        if message is not None:
+            self.send_prompt(tab, textbox, message)
+
+    def update_context_index(self, tab):
+        """Queue indexing of new messages; a replaced chat_history gets a new index."""
+        if self.context_indexer is None:
+            return
+        index = getattr(tab, "context_index", None)
+        if index is None or index.source is not tab.chat_history:
+            index = tab.context_index = TabContextIndex(tab.chat_history)
+        self.context_indexer.submit(index)
+
     def _get_chat_history(self, tab):
         logger.info("Getting chat history...")
         try:
             # TODO: convert the chat history to a list of messages suitable for processing by aisuite
+            if self.context_indexer is not None:
+                return select_context(
+                    tab.chat_history,
+                    getattr(tab, "context_index", None),
+                    token_budget=self.config.get("context_token_budget", 8000),
+                    recent_messages=self.config.get("context_recent_messages", 8),
+                    top_k=self.config.get("context_top_k", 4),
+                )
             return tab.chat_history
         except Exception as e:
             logger.error(f"Error getting chat history: {str(e)}")
@@ -574,25 +1146,38 @@ class App(customtkinter.CTk):
 
     def _get_ai_response_threaded(self, tab, textbox, message, model):
         logger.info("Getting AI response...")
+        self.ui_events.post(Progress(True))
+        started = time.perf_counter()
+        first_token = []
         try:
             anyllm = True
             chat_history = None
             ui_chat_history = self._get_chat_history(tab)
-            if anyllm:
-                chat_history = self.anyllm_adapter.getChatHistory(
-                    ui_chat_history
+            native_ollama = self.config.get("ollama_native", True)
+            if native_ollama and self.ollama_adapter.is_local_model(model):
+                chat_history = self.ollama_adapter.getChatHistory(ui_chat_history)
+                stream = self.config.get("stream_replies", True)
+
+                def on_token(text):
+                    if not first_token:
+                        first_token.append(time.perf_counter() - started)
+                    if stream:
+                        self.ui_events.post(Delta(tab, text))
+
+                response = self.ollama_adapter.completion(
+                    model, chat_history, on_token=on_token
                 )
+            elif anyllm:
+                chat_history = self.anyllm_adapter.getChatHistory(ui_chat_history)
                 # TODO: use anyllm adapter
                 response = self.anyllm_adapter.completion(model, chat_history)
             else:
                 # aisuite adapter
-                chat_history = self.aisuite_adapter.getChatHistory(
-                    ui_chat_history
-                )
+                chat_history = self.aisuite_adapter.getChatHistory(ui_chat_history)
                 response = self.aisuite_adapter.completion(model, chat_history)
-            #chat_history.append({"role": "user", "content": message})
+            # chat_history.append({"role": "user", "content": message})
 
-            '''
+            """
             client = ai.Client()
 
             base_url = None
@@ -611,105 +1196,288 @@ class App(customtkinter.CTk):
 
             if response is not None:
                 response = self.aisuite_adapter.getResponse(response)
-            '''
+            """
 
-            self.after(0, self.get_ai_response, tab, textbox, response["content"], None)
+            self.record_usage(
+                tab,
+                model,
+                time.perf_counter() - started,
+                response.get("usage"),
+                first_token[0] if first_token else None,
+            )
+            html = None
+            if response["content"] is not None:
+                # Parse here rather than on the Tk thread; the tokens are cached
+                # for the transcript render too.
+                html = self.render_processes.markdown_html(response["content"], None)
+            self.ui_events.post(Done(tab, textbox, response["content"], html, model))
             logger.info("AI response received successfully")
         except Exception as e:
             logger.error(f"Error getting AI response: {str(e)}")
             logger.error(traceback.format_exc())
-            self.after(0, self.get_ai_response, tab, textbox, None, e)
+            self.record_usage(tab, model, time.perf_counter() - started, ok=False)
+            self.ui_events.post(Error(tab, textbox, e, model))
+        finally:
+            self.ui_events.post(Progress(False))
+
+    def record_usage(self, tab, model, latency, usage=None, first_token=None, ok=True):
+        """
+        Log a completion call for the usage stats and the auto model's latency
+        tracking; never fails the reply.
+        """
+        self.model_router.record(model, latency, ok, first_token)
+        if self.usage_store is None:
+            return
+        try:
+            self.usage_store.record(
+                model,
+                latency,
+                usage,
+                tab_name=getattr(tab, "tab_name", None),
+                first_token=first_token,
+                ok=ok,
+            )
+        except Exception as e:
+            logger.error(f"Error recording usage: {str(e)}")
+
+    def on_reply_delta(self, event):
+        """Show streamed reply text as a partial message at the end of the tab."""
+        tab = event.tab
+        partial = getattr(tab, "partial_reply", None)
+        if partial is None:
+            partial = tab.partial_reply = {
+                "role": "assistant",
+                "content": "",
+                "markdown": "",
+                "partial": True,
+            }
+            tab.chat_history.append(partial)
+        partial["markdown"] += event.text
+        self.render_scheduler.mark_dirty(tab)
+
+    def _drop_partial_reply(self, tab):
+        """Remove the streamed text before the complete reply is appended."""
+        partial = getattr(tab, "partial_reply", None)
+        if partial is None:
+            return
+        tab.partial_reply = None
+        for i in range(len(tab.chat_history) - 1, -1, -1):
+            if tab.chat_history[i] is partial:
+                del tab.chat_history[i]
+                if i < len(tab.chat_history):
+                    # Messages came after it, so the native widget must be
+                    # re-rendered from the top rather than appended to.
+                    renderer = getattr(tab, "text_renderer", None)
+                    if renderer is not None:
+                        renderer.source = None
+                break
+
+    def on_reply_done(self, event):
+        self._drop_partial_reply(event.tab)
+        try:
+            self.get_ai_response(
+                event.tab, event.textbox, event.content, None, event.html, event.model
+            )
+        finally:
+            self.send_next_prompt(event.tab, event.textbox)
 
-    def get_ai_response(self, tab, textbox, response_text, error):
+    def on_reply_error(self, event):
+        self._drop_partial_reply(event.tab)
+        try:
+            self.get_ai_response(
+                event.tab, event.textbox, None, event.error, model=event.model
+            )
+        finally:
+            self.send_next_prompt(event.tab, event.textbox)
+
+    def on_request_progress(self, event):
+        """Show the progress bar while any request is in flight."""
+        self._requests_in_flight += 1 if event.active else -1
+        if event.active and self._requests_in_flight == 1:
+            self.menu_frame.progress_bar.grid()
+            self.menu_frame.progress_bar.start()
+        elif self._requests_in_flight == 0:
+            self.menu_frame.progress_bar.stop()
+            self.menu_frame.progress_bar.grid_remove()
+
+    def on_transcription(self, event):
+        event.entry.delete(0, "end")
+        event.entry.insert(0, event.text)
+        if event.final:
+            # Focus the entry box for user review
+            event.entry.focus_set()
+
+    def get_ai_response(
+        self, tab, textbox, response_text, error, html=None, model=None
+    ):
         logger.info("Processing AI response...")
         try:
             if error:
-                tab.chat_history.append(
-                    {"role": "assistant", "content": f"<p>Error: {error}</p>"}
-                )
+                message = {
+                    "role": "assistant",
+                    "content": f"<p>Error: {error}</p>",
+                    "text": f"Error: {error}",
+                }
             else:
-                md = MarkdownIt()
-                md.use(front_matter_plugin)
-                html = "Unexpected Response"
-                if response_text is not None:
-                    html = md.render(response_text)
+                if response_text is None:
+                    html = "Unexpected Response"
+                elif html is None:
+                    # Stored unstyled; the palette is applied when displayed.
+                    html = self.markdown_renderer.render(response_text)
 
-                tab.chat_history.append(
-                    {"role": "assistant", "content": f"🤖 AI: {html}"}
-                )
+                message = {"role": "assistant", "content": f"🤖 AI: {html}"}
+                if response_text is not None:
+                    message["markdown"] = response_text
+                else:
+                    message["text"] = "Unexpected Response"
+            if model is not None:
+                message["model"] = model
+            tab.chat_history.append(message)
 
-            self.update_textbox_html(tab, textbox)
-            self.menu_frame.progress_bar.stop()
-            self.menu_frame.progress_bar.grid_remove()
+            self.request_render(tab)
+            self.mark_tab_dirty(tab)
             logger.info("AI response processed successfully")
         except Exception as e:
             logger.error(f"Error processing AI response: {str(e)}")
             logger.error(traceback.format_exc())
             raise
 
-    def update_textbox_html(self, tab, textbox):
+    def update_textbox_html(
+        self, tab, textbox, on_rendered=None, compute_highlights=False
+    ):
+        """
+        Render the tab's transcript on the render pipeline; ``on_rendered`` runs on
+        the Tk thread once it (or a newer render of the tab) is in the widget.
+
+        Code blocks are highlighted after the plain text is shown, except with
+        ``compute_highlights``, which highlights every block in the render itself.
+        """
         logger.info("Updating textbox HTML...")
         try:
-            import pprint
-
-            pprint.pprint(tab.chat_history)
-            history_html = "".join([msg["content"] for msg in tab.chat_history])
+            self.update_context_index(tab)
+            # The worker renders a snapshot; messages appended meanwhile get
+            # their own render.
+            history = tab.chat_history
+            snapshot = list(history)
+            renderer = getattr(tab, "text_renderer", None)
+            dark = customtkinter.get_appearance_mode() == "Dark"
+            code_theme = self.palette.code_theme(dark) if self.highlighting else None
+
+            # Kept on the tab so a newer render superseding this one runs it.
+            callbacks = tab.render_callbacks
+            if on_rendered is not None:
+                callbacks.append(on_rendered)
+
+            def finish():
+                while callbacks:
+                    callbacks.pop(0)()
+
+            if renderer is not None:
+                start = 0
+                if not self.render_pipeline.pending(tab):
+                    start = renderer.append_start(history)
+
+                def finish_native():
+                    renderer.finish(history, len(snapshot))
+                    finish()
+                    self.highlight_code_blocks(renderer, code_theme)
+
+                self.render_pipeline.submit(
+                    tab,
+                    lambda: insert_fragments(
+                        snapshot, start, runs_for=self.render_processes.markdown_runs
+                    ),
+                    lambda: renderer.begin(replace=start == 0),
+                    renderer.insert,
+                    finish_native,
+                )
+                return
 
-            soup = BeautifulSoup(history_html, "html.parser")
+            palette = self.palette
+            misses = None if compute_highlights else []
 
-            base_color = (
-                "white" if customtkinter.get_appearance_mode() == "Dark" else "black"
-            )
+            def show(html):
+                textbox.set_html(html)
+                textbox.config(state=tk.NORMAL)
+                textbox.see(tk.END)
 
-            darkgold = "#c09900"
-            darkblue = "#2384c8"
-            darkgreen = "#2aa198"
-            darkred = "#a6451c"
-            style_map = {
-                "b": f"color: {darkgold}; font-weight: bold;",
-                "strong": f"color: {darkgold}; font-weight: bold;",
-                "i": f"color: {darkgreen}; font-style: italic;",
-                "em": f"color: {darkblue}; font-style: italic;",
-                "u": f"color: {darkblue}; text-decoration: underline;",
-                "s": f"color: {darkred}; text-decoration: line-through;",
-                "strike": f"color: {darkred}; text-decoration: line-through;",
-                "code": f"color: {darkgreen}; font-weight: bold;",
-                "h1": f"color: {darkred}; font-weight: bold;",
-                "h2": f"color: {darkred}; font-weight: bold;",
-                "h3": f"color: {darkred}; font-weight: bold;",
-                "h4": f"color: {darkred}; font-weight: bold;",
-                "h5": f"color: {darkred}; font-weight: bold;",
-                "h6": f"color: {darkred}; font-weight: bold;",
-            }
+            def finish_html():
+                finish()
+                if misses:
+                    self.highlight_html_misses(tab, textbox, misses, code_theme)
 
-            for tag_name, style in style_map.items():
-                for tag in soup.find_all(tag_name):
-                    if tag.has_attr("style"):
-                        tag["style"] += f" {style}"
-                    else:
-                        tag["style"] = style
-
-            body = soup.find("body")
-            if body:
-                body["style"] = f"color: {base_color};"
-            else:
-                # If no body tag, wrap in a div
-                new_soup = BeautifulSoup(
-                    f'<div style="color: {base_color};"></div>', "html.parser"
-                )
-                new_soup.div.append(soup)
-                soup = new_soup
-
-            html_to_render = str(soup)
-            textbox.set_html(html_to_render)
-            textbox.config(state=tk.NORMAL)
-            textbox.see(tk.END)
+            self.render_pipeline.submit(
+                tab,
+                lambda: [
+                    self.markdown_renderer.render_history(
+                        snapshot,
+                        palette,
+                        dark,
+                        self.render_processes.markdown_html,
+                        code_theme,
+                        misses,
+                    )
+                ],
+                lambda: None,
+                show,
+                finish_html,
+            )
             logger.info("Textbox HTML updated successfully")
         except Exception as e:
             logger.error(f"Error updating textbox HTML: {str(e)}")
             logger.error(traceback.format_exc())
             raise
 
+    def highlight_code_blocks(self, renderer, code_theme):
+        """Highlight the code blocks a native render just inserted."""
+        blocks = renderer.take_code_blocks()
+        if not blocks or not code_theme:
+            return
+        highlighter = shared_highlighter()
+        key = ("highlight", next(self._highlight_jobs))
+
+        def prepare():
+            highlighted = []
+            for start, code, language in blocks:
+                runs = highlighter.runs(code, language, code_theme)
+                if runs:
+                    highlighted.append((start, code, runs))
+            return highlighted
+
+        self.render_pipeline.submit(
+            key,
+            prepare,
+            lambda: None,
+            renderer.apply_highlight,
+            lambda: self.render_pipeline.forget(key),
+        )
+
+    def highlight_html_misses(self, tab, textbox, misses, code_theme):
+        """
+        Highlight the blocks an HTML render showed plain, then render again if
+        any of them actually changed (unknown languages stay plain).
+        """
+        highlighter = shared_highlighter()
+        highlighted = []
+
+        def prepare():
+            for code, language in misses:
+                if highlighter.html(code, language, code_theme) is not None:
+                    highlighted.append(language)
+            return []
+
+        def finish():
+            if highlighted:
+                self.update_textbox_html(tab, textbox, compute_highlights=True)
+
+        self.render_pipeline.submit(
+            ("highlight", tab),
+            prepare,
+            lambda: None,
+            lambda fragment: None,
+            finish,
+        )
+
     def open_preferences(self):
         logger.info("Opening preferences...")
         try:
@@ -721,21 +1489,55 @@ class App(customtkinter.CTk):
             logger.error(traceback.format_exc())
             raise
 
+    def prestart_voice_daemon(self):
+        """Load the listen daemon's model in the background before the first use."""
+
+        def start():
+            try:
+                get_listen_daemon(self.listen_command_path()).ensure_healthy()
+            except Exception as e:
+                logger.error(f"Error starting listen daemon: {str(e)}")
+
+        threading.Thread(target=start, daemon=True).start()
+
+    def listen_command_path(self):
+        return os.path.expanduser(
+            self.config.get("listen_command", "/home/rseward/bin/listen.sh")
+        )
+
     def open_voice_input(self, tab, entry):
         """Start voice input recording using external listen command."""
         logger.info("Starting voice input...")
         try:
+            voice_input = getattr(tab, "voice_input", None)
+            if voice_input is not None and voice_input.is_recording:
+                # A second press on the mic button stops the recording.
+                voice_input.stop_recording()
+                return
+
             def on_transcription_complete(transcribed_text):
                 """Callback when transcription is complete."""
                 logger.info(f"Voice transcription complete: {transcribed_text}")
-                # Insert transcribed text into the entry box
-                self.after(0, lambda: entry.delete(0, "end"))
-                self.after(0, lambda: entry.insert(0, transcribed_text))
-                # Focus the entry box for user review
-                self.after(0, lambda: entry.focus_set())
+                self.ui_events.post(Transcription(entry, transcribed_text))
+
+            def on_partial_transcription(partial_text):
+                """Callback with the transcript so far while the user speaks."""
+                self.ui_events.post(Transcription(entry, partial_text, final=False))
 
             # Start voice input (this will open the listen command's UI window)
-            voice_input = VoiceInput(on_complete=on_transcription_complete)
+            voice_input = VoiceInput(
+                listen_command_path=self.listen_command_path(),
+                on_complete=on_transcription_complete,
+                use_daemon=self.config.get("voice_daemon", False),
+                on_partial=(
+                    on_partial_transcription
+                    if self.config.get("voice_stream_partials", False)
+                    else None
+                ),
+                vad=self.config.get("voice_vad", False),
+                silence_seconds=self.config.get("voice_silence_seconds", 1.5),
+            )
+            tab.voice_input = voice_input
             voice_input.start_recording()
             logger.info("Voice input started successfully")
         except Exception as e:
@@ -747,6 +1549,7 @@ class App(customtkinter.CTk):
         logger.info("Applying font change...")
         try:
             self.load_config()
+            self.palette = Palette.from_config(self.config.get("palette"))
             font = (None, self.font_size)
             for tab_name in self.tab_view._name_list:
                 tab = self.tab_view.tab(tab_name)
@@ -757,7 +1560,18 @@ class App(customtkinter.CTk):
                         isinstance(widget, HTMLScrolledText)
                         and customtkinter.get_appearance_mode() == "Dark"
                     ):
-                        widget.configure(background="#2b2b2b")
+                        widget.configure(background=self.palette.dark_background)
+                renderer = getattr(tab, "text_renderer", None)
+                if renderer is not None:
+                    renderer.widget.configure(font=font)
+                    renderer.configure_tags(
+                        self.font_size,
+                        customtkinter.get_appearance_mode() == "Dark",
+                        self.palette,
+                    )
+                else:
+                    # Re-styled from the cached markdown tokens, not re-parsed.
+                    self.request_render(tab)
             logger.info("Font change applied successfully")
         except Exception as e:
             logger.error(f"Error applying font change: {str(e)}")
@@ -771,17 +1585,41 @@ class App(customtkinter.CTk):
             self.bind("<Control-Shift-T>", lambda event: self.add_new_tab())
             self.bind("<Control-Shift-R>", lambda event: self.rename_current_tab())
             self.bind("<Control-w>", lambda event: self.close_current_tab())
-            self.bind("<Control-q>", lambda event: self.destroy())
+            self.bind("<Control-q>", lambda event: self.on_closing())
             self.bind("<Control-s>", lambda event: self.save_current_tab())
             self.bind("<Control-o>", lambda event: self.open_tab())
+            self.bind("<Control-f>", lambda event: self.open_search())
             self.bind("<Control-l>", lambda event: self.refresh_current_tab_history())
-            self.bind("<Control-Shift-H>", lambda event: self.clear_current_tab_history())
+            self.bind(
+                "<Control-Shift-H>", lambda event: self.clear_current_tab_history()
+            )
             logger.info("Shortcuts bound successfully")
         except Exception as e:
             logger.error(f"Error binding shortcuts: {str(e)}")
             logger.error(traceback.format_exc())
             raise
 
+    def handle_remote_command(self, message):
+        """Act on a launch forwarded from a second mychatui process."""
+        logger.info(f"Handling forwarded launch: {message}")
+        try:
+            self.deiconify()
+            self.lift()
+            self.focus_force()
+            if message.get("action") == "new_tab":
+                self.add_new_tab()
+                tab = self.tab_view.tab(self.tab_view.get())
+                self.menu_frame.update_model_menu()
+                prompt = message.get("prompt")
+                if prompt:
+                    tab.entry.insert(0, prompt)
+                    self.send_message(tab, tab.textbox, tab.entry)
+                else:
+                    tab.entry.focus_set()
+        except Exception as e:
+            logger.error(f"Error handling forwarded launch: {str(e)}")
+            logger.error(traceback.format_exc())
+
     def show_menu_ctrl_m(self, event):
         logger.info("Showing menu...")
         try:
@@ -792,8 +1630,14 @@ class App(customtkinter.CTk):
             raise
 
 
-def main():
-    """Main entry point for the application."""
+def main(instance=None, startup_message=None):
+    """
+    Main entry point for the application.
+
+    Args:
+        instance: SingleInstance holding the lock, if running single-instance
+        startup_message: Launch command (e.g. a prompt) to apply once started
+    """
     try:
         log_environment()
 
@@ -806,6 +1650,15 @@ def main():
         logger.info("Creating application instance...")
         app = App()
 
+        if instance is not None:
+            # The socket has been listening since the lock was taken; launches
+            # queued while the app was being built are delivered now.
+            instance.set_handler(
+                lambda message: app.ui_events.call(app.handle_remote_command, message)
+            )
+        if startup_message is not None:
+            app.after_idle(app.handle_remote_command, startup_message)
+
         logger.info("Starting main event loop...")
         app.mainloop()
 
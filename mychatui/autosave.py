@@ -0,0 +1,129 @@
+"""
+Debounced background autosave of dirty tabs.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class AutosaveService:
+    """
+    Writes dirty tabs on a background thread once they have been quiet for a while.
+
+    Callers mark a tab dirty with a snapshot function instead of the data itself,
+    so a burst of changes costs nothing on the Tk thread; the snapshot is taken
+    once, on the worker, right before the write. Snapshot functions must only read
+    plain Python attributes and never call into Tk.
+    """
+
+    def __init__(
+        self,
+        save_func: Callable[[Dict], None],
+        delay: float = 2.0,
+        max_delay: float = 20.0,
+    ):
+        """
+        Initialize and start the autosave worker.
+
+        Args:
+            save_func: Called on the worker thread with each tab snapshot to persist
+            delay: Seconds without new changes before dirty tabs are written
+            max_delay: Upper bound on how long a continuously changing tab waits
+        """
+        self.save_func = save_func
+        self.delay = delay
+        self.max_delay = max_delay
+
+        self._pending: Dict[Hashable, Callable[[], Dict]] = {}
+        # Held across snapshot + write, so an explicit save and an autosave of
+        # the same tab never interleave.
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._first_mark = 0.0
+        self._last_mark = 0.0
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, key: Hashable, snapshot_func: Callable[[], Dict]) -> None:
+        """
+        Record that a tab changed; repeated marks within the quiet period coalesce.
+
+        Args:
+            key: Identifies the tab
+            snapshot_func: Returns the tab data to save when called
+        """
+        with self._cond:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_mark = now
+            self._last_mark = now
+            self._pending[key] = snapshot_func
+            self._cond.notify()
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._cond:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def save_now(self, key: Hashable, snapshot_func: Callable[[], Dict]) -> Any:
+        """
+        Write a tab immediately on the calling thread (an explicit save).
+
+        Waits for an autosave of the same tab that is already writing, so that
+        older write can't land after this one; pending changes are dropped.
+
+        Returns:
+            What ``save_func`` returned
+        """
+        with self._key_lock(key):
+            self.discard(key)
+            return self.save_func(snapshot_func())
+
+    def discard(self, key: Hashable) -> None:
+        """Forget pending changes for a tab, e.g. after it was saved explicitly."""
+        with self._cond:
+            self._pending.pop(key, None)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write everything still pending and stop the worker."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Autosave did not finish writing before the timeout")
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    if self._pending:
+                        now = time.monotonic()
+                        due = min(
+                            self._last_mark + self.delay,
+                            self._first_mark + self.max_delay,
+                        )
+                        if now >= due:
+                            break
+                        self._cond.wait(due - now)
+                    else:
+                        self._cond.wait()
+                batch = self._pending
+                self._pending = {}
+                stopping = self._stopping
+
+            for key, snapshot_func in batch.items():
+                try:
+                    with self._key_lock(key):
+                        self.save_func(snapshot_func())
+                except Exception as e:
+                    logger.error(f"Autosave failed: {e}")
+
+            if stopping:
+                with self._cond:
+                    if not self._pending:
+                        return
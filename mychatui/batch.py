@@ -0,0 +1,240 @@
+"""
+Headless batch runner: ``mychatui batch prompts.jsonl -o results.jsonl``.
+
+Each input line is a JSON object with an ``id`` and either a ``prompt`` (plus an
+optional ``system`` message) or a full ``messages`` list. Every prompt is sent to
+each selected model from the config's ``user_models`` through the same adapter
+the GUI uses, with at most ``--concurrency`` requests in flight. Results are
+appended to the output JSONL as they finish::
+
+    {"id": "q1", "model": "ollama:llama3.2", "content": "...", "latency_s": 1.42,
+     "usage": {"prompt_tokens": 12, "completion_tokens": 80, "total_tokens": 92},
+     "error": null}
+
+Re-running with the same output file skips every (id, model) pair that already
+has a successful result, so a crashed run can be resumed.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_FILE = os.path.expanduser("~/.config/mychatui/config.json")
+
+
+def load_config(config_file: str = DEFAULT_CONFIG_FILE) -> Dict:
+    with open(config_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_models(config: Dict, names: Optional[List[str]]) -> List[str]:
+    """
+    Map model display names or full names to full model names.
+
+    With no names, the config's current ``model`` is used.
+
+    Raises:
+        ValueError: if a name isn't in ``user_models`` or nothing is selected
+    """
+    if not names:
+        if not config.get("model"):
+            raise ValueError("No model selected; pass --models")
+        return [config["model"]]
+
+    user_models = config.get("user_models", [])
+    models = []
+    for name in names:
+        if name == "all":
+            models.extend(m["full_name"] for m in user_models)
+            continue
+        for model in user_models:
+            if name in (model["display_name"], model["full_name"]):
+                models.append(model["full_name"])
+                break
+        else:
+            raise ValueError(f"Unknown model {name!r}; not in user_models")
+    return models
+
+
+def read_prompts(input_file: str) -> Iterator[Dict]:
+    """Yield prompt items, giving lines without an ``id`` one from their line number."""
+    with open(input_file, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            item.setdefault("id", f"line-{line_number}")
+            yield item
+
+
+def item_messages(item: Dict) -> List[Dict]:
+    if "messages" in item:
+        return item["messages"]
+    messages = []
+    if item.get("system"):
+        messages.append({"role": "system", "content": item["system"]})
+    messages.append({"role": "user", "content": item["prompt"]})
+    return messages
+
+
+def completed_keys(output_file: str) -> Set[Tuple[str, str]]:
+    """Return the (id, model) pairs with a successful result in ``output_file``."""
+    done = set()
+    if not os.path.exists(output_file):
+        return done
+    with open(output_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # Partial line from a crash
+            if result.get("error") is None:
+                done.add((str(result.get("id")), result.get("model")))
+    return done
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def run_item(adapter, item: Dict, model: str) -> Dict:
+    """Send one prompt to one model and describe the outcome."""
+    result = {"id": item["id"], "model": model}
+    start = time.perf_counter()
+    try:
+        response = adapter.completion(model, item_messages(item))
+        result["content"] = response["content"]
+        result["usage"] = response.get("usage")
+        result["error"] = None
+    except Exception as e:
+        logger.error(f"{item['id']} on {model} failed: {e}")
+        result["content"] = None
+        result["usage"] = None
+        result["error"] = str(e)
+    result["latency_s"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def run_batch(
+    items: Iterator[Dict],
+    models: List[str],
+    output_file: str,
+    adapter,
+    concurrency: int = 4,
+) -> Dict:
+    """
+    Run every item against every model, appending results to ``output_file``.
+
+    Returns:
+        Counts of ``completed``, ``failed`` and ``skipped`` requests
+    """
+    done = completed_keys(output_file)
+    stats = {"completed": 0, "failed": 0, "skipped": 0}
+
+    def work() -> Iterator[Tuple[Dict, str]]:
+        for item in items:
+            for model in models:
+                if (str(item["id"]), model) in done:
+                    stats["skipped"] += 1
+                else:
+                    yield item, model
+
+    with (
+        open(output_file, "a", encoding="utf-8") as out,
+        ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as pool,
+    ):
+        # Terminate a line cut short by a crash so the next result isn't glued
+        # onto it.
+        if not _ends_with_newline(output_file):
+            out.write("\n")
+        pending = set()
+
+        def write_finished(finished):
+            for future in finished:
+                result = future.result()
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                stats["failed" if result["error"] else "completed"] += 1
+
+        # Only keep a bounded number of requests queued, so huge input files are
+        # streamed instead of loaded up front. Every result is written as soon
+        # as it is seen to be done, so a crash loses at most the running ones.
+        for item, model in work():
+            if len(pending) >= concurrency * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write_finished(finished)
+            pending.add(pool.submit(run_item, adapter, item, model))
+            finished = {future for future in pending if future.done()}
+            pending -= finished
+            write_finished(finished)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            write_finished(finished)
+
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mychatui batch",
+        description="Run a JSONL file of prompts through the configured models",
+    )
+    parser.add_argument("input", help="JSONL file of {id, prompt|messages[, system]}")
+    parser.add_argument(
+        "-o", "--output", required=True, help="JSONL results file (appended to)"
+    )
+    parser.add_argument(
+        "-m",
+        "--models",
+        nargs="+",
+        help="user_models display or full names, or 'all' (default: current model)",
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_FILE)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    config = load_config(args.config)
+    try:
+        models = resolve_models(config, args.models)
+    except ValueError as e:
+        print(f"mychatui batch: {e}", file=sys.stderr)
+        return 2
+
+    from mychatui.adapters.anyllm import AnyLlmAdapter
+
+    start = time.perf_counter()
+    stats = run_batch(
+        read_prompts(args.input),
+        models,
+        args.output,
+        AnyLlmAdapter(),
+        concurrency=max(1, args.concurrency),
+    )
+    print(
+        f"{stats['completed']} completed, {stats['failed']} failed, "
+        f"{stats['skipped']} already done in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr,
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Retrieval-based context selection for long tabs.
+
+Each message gets a hashed TF-IDF vector (NumPy, no network) in a per-tab
+``TabContextIndex``. A single background ``ContextIndexer`` thread keeps the
+indexes in step with the tabs' chat histories. When a tab's history no longer
+fits the token budget, ``select_context()`` sends the recent window plus the
+older turns most similar to the latest message instead of the whole history.
+"""
+
+import logging
+import queue
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+from mychatui.conversation_store import html_to_text
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9_']{2,}")
+
+
+def numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def estimate_tokens(message: Dict) -> int:
+    """Rough token count of a chat_history message (about four characters each)."""
+    return len(message.get("content") or "") // 4 + 4
+
+
+class TabContextIndex:
+    """Hashed TF-IDF vectors for one tab's messages, in chat_history order."""
+
+    def __init__(self, source: Optional[List[Dict]] = None, dim: int = 1024):
+        """
+        Args:
+            source: The chat_history list this index follows; a tab that gets a
+                new list (cleared, reopened, older page loaded) needs a new index
+            dim: Number of hash buckets per vector
+        """
+        import numpy as np
+
+        self.source = source
+        self.dim = dim
+        self._np = np
+        self._rows = np.zeros((0, dim), dtype=np.float32)
+        self._doc_freq = np.zeros(dim, dtype=np.float32)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def _vector(self, text: str):
+        vector = self._np.zeros(self.dim, dtype=self._np.float32)
+        for token in _TOKEN_RE.findall(text.lower()):
+            vector[zlib.crc32(token.encode("utf-8")) % self.dim] += 1.0
+        return self._np.log1p(vector)
+
+    def add(self, contents: List[str]) -> None:
+        """Append vectors for the next messages."""
+        if not contents:
+            return
+        vectors = self._np.stack([self._vector(html_to_text(c)) for c in contents])
+        with self._lock:
+            self._rows = self._np.concatenate([self._rows, vectors])
+            self._doc_freq += (vectors > 0).sum(axis=0)
+            self.count += len(contents)
+
+    def sync(self) -> None:
+        """
+        Index any messages appended to ``source`` since the last sync, up to a
+        reply that is still streaming in.
+        """
+        if self.source is None:
+            return
+        new = []
+        for message in list(self.source[self.count :]):
+            if message.get("partial"):
+                break
+            new.append(message.get("content") or "")
+        self.add(new)
+
+    def search(self, text: str, candidates: int, k: int) -> List[int]:
+        """
+        Return up to ``k`` positions below ``candidates`` most similar to ``text``.
+        """
+        np = self._np
+        with self._lock:
+            rows = self._rows[: min(candidates, self.count)]
+            doc_freq = self._doc_freq.copy()
+            total = self.count
+        if not len(rows):
+            return []
+        idf = np.log((total + 1) / (doc_freq + 1)) + 1
+        weighted = rows * idf
+        query = self._vector(html_to_text(text)) * idf
+        norms = np.linalg.norm(weighted, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = weighted @ query / np.where(norms == 0, 1.0, norms)
+        best = np.argsort(-scores, kind="stable")[:k]
+        return [int(i) for i in best if scores[i] > 0]
+
+
+class ContextIndexer:
+    """Single worker thread that brings tab indexes up to date off the UI thread."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[TabContextIndex]]" = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="context-indexer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, index: TabContextIndex) -> None:
+        """Queue ``index`` to be synced with its chat history."""
+        with self._lock:
+            if id(index) in self._pending:
+                return
+            self._pending.add(id(index))
+        self._queue.put(index)
+
+    def _run(self) -> None:
+        while True:
+            index = self._queue.get()
+            if index is None:
+                return
+            with self._lock:
+                self._pending.discard(id(index))
+            try:
+                index.sync()
+            except Exception as e:
+                logger.error(f"Error indexing messages: {e}")
+            finally:
+                self._queue.task_done()
+
+    def join(self) -> None:
+        """Wait until every queued index has been synced."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        self._queue.put(None)
+
+
+def _turn(history: List[Dict], position: int) -> List[int]:
+    """The message at ``position`` together with its question or answer."""
+    role = history[position].get("role")
+    if role == "user" and position + 1 < len(history):
+        if history[position + 1].get("role") == "assistant":
+            return [position, position + 1]
+    if role == "assistant" and position > 0:
+        if history[position - 1].get("role") == "user":
+            return [position - 1, position]
+    return [position]
+
+
+def select_context(
+    history: List[Dict],
+    index: Optional[TabContextIndex],
+    token_budget: int = 8000,
+    recent_messages: int = 8,
+    top_k: int = 4,
+) -> List[Dict]:
+    """
+    Choose the messages to send for ``history``.
+
+    The whole history is sent if it fits ``token_budget``. Otherwise the
+    most recent messages (at least the last one, at most ``recent_messages``)
+    are kept, and the older turns most relevant to the last message fill what
+    is left of the budget. The result stays in chronological order.
+    """
+    if not history:
+        return history
+    if sum(estimate_tokens(m) for m in history) <= token_budget:
+        return history
+
+    budget = token_budget
+    recent_start = len(history)
+    while recent_start > 0 and len(history) - recent_start < recent_messages:
+        cost = estimate_tokens(history[recent_start - 1])
+        if cost > budget and recent_start < len(history):
+            break
+        budget -= cost
+        recent_start -= 1
+
+    chosen = set(range(recent_start, len(history)))
+    if index is not None and index.source is history and recent_start > 0:
+        for position in index.search(
+            history[-1].get("content") or "", recent_start, top_k
+        ):
+            turn = [p for p in _turn(history, position) if p not in chosen]
+            cost = sum(estimate_tokens(history[p]) for p in turn)
+            if cost <= budget:
+                chosen.update(turn)
+                budget -= cost
+
+    return [history[p] for p in sorted(chosen)]
@@ -0,0 +1,300 @@
+"""
+SQLite conversation store with an FTS5 full-text index over every saved tab.
+"""
+
+import glob
+import logging
+import os
+import sqlite3
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from mychatui.tab_files import TAB_FILE_EXTENSIONS, read_tab_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.path.expanduser("~/.config/mychatui/conversations.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tabs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    model_name TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    tab_id INTEGER NOT NULL REFERENCES tabs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (tab_id, position)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    text, content='messages', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text)
+    VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the text nodes of an HTML fragment."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_to_text(content: str) -> str:
+    """Strip the markup from a chat_history message, keeping the raw text."""
+    extractor = _TextExtractor()
+    extractor.feed(content)
+    extractor.close()
+    return " ".join("".join(extractor.parts).split())
+
+
+def fts_query(query: str) -> str:
+    """
+    Turn free text typed by the user into a safe FTS5 MATCH expression.
+
+    Every term is quoted so punctuation can't be read as FTS syntax, and the
+    last term is a prefix match so results appear while the user is typing.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    if not terms:
+        return ""
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class ConversationStore:
+    """Persists tabs and their messages in SQLite (WAL mode) with FTS5 search."""
+
+    def __init__(self, db_path: str = DEFAULT_STORE_PATH):
+        """
+        Open (and create if needed) the conversation database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        # Saves may come from background threads, so serialise access ourselves.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def save_tab(
+        self, tab_name: str, model_name: Optional[str], chat_history: List[Dict]
+    ) -> None:
+        """
+        Store a tab and its chat history.
+
+        Chat history normally only grows, so when the stored messages are still a
+        prefix of ``chat_history`` only the new messages are inserted; otherwise
+        the tab's messages are replaced.
+
+        Args:
+            tab_name: Name of the tab
+            model_name: Full model name assigned to the tab
+            chat_history: The tab's list of ``{"role", "content"}`` messages
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO tabs (name, model_name, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET "
+                "model_name = excluded.model_name, updated_at = excluded.updated_at",
+                (tab_name, model_name, time.time()),
+            )
+            tab_id = self._conn.execute(
+                "SELECT id FROM tabs WHERE name = ?", (tab_name,)
+            ).fetchone()["id"]
+
+            stored = self._conn.execute(
+                "SELECT COUNT(*) AS n, MAX(position) AS last FROM messages "
+                "WHERE tab_id = ?",
+                (tab_id,),
+            ).fetchone()
+            start = 0
+            if stored["n"] and stored["n"] <= len(chat_history):
+                last = self._conn.execute(
+                    "SELECT content FROM messages WHERE tab_id = ? AND position = ?",
+                    (tab_id, stored["last"]),
+                ).fetchone()
+                if (
+                    stored["last"] == stored["n"] - 1
+                    and last is not None
+                    and last["content"] == chat_history[stored["n"] - 1]["content"]
+                ):
+                    start = stored["n"]
+            if start == 0 and stored["n"]:
+                self._conn.execute("DELETE FROM messages WHERE tab_id = ?", (tab_id,))
+
+            self._conn.executemany(
+                "INSERT INTO messages (tab_id, position, role, content, text) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        tab_id,
+                        position,
+                        msg.get("role", ""),
+                        msg.get("content", ""),
+                        html_to_text(msg.get("content", "")),
+                    )
+                    for position, msg in enumerate(chat_history)
+                    if position >= start
+                ],
+            )
+        logger.debug(
+            f"Stored tab '{tab_name}' ({len(chat_history) - start} new messages)"
+        )
+
+    def load_tab(self, tab_name: str) -> Optional[Dict]:
+        """
+        Load a tab in the same shape as a ``<tab>.json`` save file.
+
+        Returns:
+            Dict with tab_name, model_name and chat_history, or None if unknown
+        """
+        with self._lock:
+            tab = self._conn.execute(
+                "SELECT id, name, model_name FROM tabs WHERE name = ?", (tab_name,)
+            ).fetchone()
+            if tab is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE tab_id = ? ORDER BY position",
+                (tab["id"],),
+            ).fetchall()
+        return {
+            "tab_name": tab["name"],
+            "model_name": tab["model_name"],
+            "chat_history": [
+                {"role": r["role"], "content": r["content"]} for r in rows
+            ],
+        }
+
+    def list_tabs(self) -> List[str]:
+        """Return stored tab names, most recently updated first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM tabs ORDER BY updated_at DESC"
+            ).fetchall()
+        return [r["name"] for r in rows]
+
+    def delete_tab(self, tab_name: str) -> None:
+        """Remove a tab and all of its messages."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tabs WHERE name = ?", (tab_name,))
+
+    def search(self, query: str, limit: int = 50) -> List[Dict]:
+        """
+        Full-text search across the raw text of every stored message.
+
+        Args:
+            query: Free text typed by the user
+            limit: Maximum number of hits to return
+
+        Returns:
+            Best matches first, each with tab_name, position, role and snippet
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.name AS tab_name, m.position, m.role, "
+                "snippet(messages_fts, 0, '[', ']', '…', 12) AS snippet "
+                "FROM messages_fts "
+                "JOIN messages m ON m.id = messages_fts.rowid "
+                "JOIN tabs t ON t.id = m.tab_id "
+                "WHERE messages_fts MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def import_json_file(self, file_path: str) -> bool:
+        """
+        Import a tab save file (``<tab>.json`` or a compressed tab archive).
+
+        Returns:
+            True if the file was a tab save file and was imported
+        """
+        try:
+            tab_data = read_tab_file(file_path)
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Skipping {file_path}: {e}")
+            return False
+
+        if not isinstance(tab_data, dict) or "chat_history" not in tab_data:
+            return False
+
+        tab_name = tab_data.get("tab_name")
+        if not tab_name:
+            tab_name = os.path.basename(file_path)
+            for extension in TAB_FILE_EXTENSIONS.values():
+                if tab_name.endswith(extension):
+                    tab_name = tab_name[: -len(extension)]
+                    break
+        self.save_tab(tab_name, tab_data.get("model_name"), tab_data["chat_history"])
+        return True
+
+    def import_json_dir(self, config_dir: str) -> int:
+        """
+        Import every saved tab in ``config_dir`` (``config.json`` is skipped).
+
+        Returns:
+            Number of tabs imported
+        """
+        file_paths = []
+        for extension in TAB_FILE_EXTENSIONS.values():
+            file_paths.extend(glob.glob(os.path.join(config_dir, f"*{extension}")))
+
+        imported = 0
+        for file_path in sorted(file_paths):
+            if os.path.basename(file_path) == "config.json":
+                continue
+            if self.import_json_file(file_path):
+                imported += 1
+        logger.info(f"Imported {imported} saved tabs from {config_dir}")
+        return imported
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    store = ConversationStore()
+    if len(sys.argv) > 2 and sys.argv[1] == "search":
+        for hit in store.search(" ".join(sys.argv[2:])):
+            where = f"{hit['tab_name']} #{hit['position']} ({hit['role']})"
+            print(f"{where}: {hit['snippet']}")
+    else:
+        count = store.import_json_dir(os.path.dirname(DEFAULT_STORE_PATH))
+        print(f"Imported {count} tabs into {store.db_path}")
@@ -0,0 +1,540 @@
+"""
+Local OpenAI-compatible caching gateway: ``mychatui gateway``.
+
+Every GUI instance, the batch CLI and any other local script can share one set
+of upstream connections, one response cache and one rate limit by pointing the
+existing ``OPENAI_API_URL`` hook at the gateway::
+
+    mychatui gateway --upstream https://api.openai.com/v1 --port 8765 &
+    export OPENAI_API_URL=http://127.0.0.1:8765/v1
+
+The upstream defaults to ``$MYCHATUI_GATEWAY_UPSTREAM`` or the OpenAI API, never
+``$OPENAI_API_URL``, which points at the gateway itself once it is in use.
+
+Requests to ``/v1/...`` are forwarded to the upstream base URL. Deterministic
+non-streaming responses are cached (LRU with a TTL) keyed on the caller's
+credentials and the request body, so an identical request is answered
+locally; send ``Cache-Control: no-cache`` to bypass the cache. Completions are
+only deterministic with ``"temperature": 0``, so sampled ones always go
+upstream. Streaming requests are relayed as they arrive and never cached.
+``/metrics`` reports request, cache, rate-limit and latency counters in the
+Prometheus text format.
+
+Standard library only, so it starts quickly and has no SDK dependencies.
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Hop-by-hop and length headers are set by the gateway itself.
+_SKIP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "transfer-encoding",
+    "content-length",
+    "content-encoding",
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every client of the gateway."""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: Requests per second allowed on average (0 disables limiting)
+            burst: Requests allowed back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float = 0.0) -> bool:
+        """
+        Take one token, waiting up to ``max_wait`` seconds for it.
+
+        Returns:
+            False if the request should be rejected
+        """
+        if self.rate <= 0:
+            return True
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """LRU cache of upstream responses with a time to live."""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, int, List, bytes]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[int, List, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1:]
+
+    def put(self, key: str, status: int, headers: List, body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, status, headers, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class UpstreamPool:
+    """Pool of persistent HTTP(S) connections to the upstream API."""
+
+    def __init__(self, base_url: str, size: int = 8, timeout: float = 300.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._count_lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._count_lock:
+            self.connections_opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: Optional[bytes], headers: Dict):
+        """
+        Send a request upstream.
+
+        Returns:
+            (connection, response); pass the connection to ``release()`` once the
+            response has been read completely
+        """
+        self._slots.acquire()
+        try:
+            for attempt in range(2):
+                try:
+                    conn = self._idle.get_nowait()
+                    reused = True
+                except queue.Empty:
+                    conn = self._connect()
+                    reused = False
+                try:
+                    conn.request(method, self.base_path + path, body, headers)
+                    return conn, conn.getresponse()
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    # A pooled keep-alive connection may have been closed by the
+                    # server while idle; retry once on a fresh one.
+                    if not reused or attempt:
+                        raise
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool = True) -> None:
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class Metrics:
+    """Counters and a latency window exposed on ``/metrics``."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {
+            "requests_total": 0,
+            "cache_hits_total": 0,
+            "cache_misses_total": 0,
+            "rate_limited_total": 0,
+            "upstream_errors_total": 0,
+        }
+        self.in_flight = 0
+        self._latencies: List[float] = []
+        self._window = window
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            if len(self._latencies) > self._window:
+                del self._latencies[: len(self._latencies) - self._window]
+
+    def render(self, cache_entries: int, connections_opened: int) -> str:
+        with self._lock:
+            lines = [
+                f"mychatui_gateway_{name} {value}"
+                for name, value in self.counters.items()
+            ]
+            lines.append(f"mychatui_gateway_in_flight {self.in_flight}")
+            lines.append(f"mychatui_gateway_cache_entries {cache_entries}")
+            opened = "mychatui_gateway_upstream_connections_opened_total"
+            lines.append(f"{opened} {connections_opened}")
+            latencies = sorted(self._latencies)
+        for quantile in (0.5, 0.95, 0.99):
+            value = latencies[int(quantile * (len(latencies) - 1))] if latencies else 0
+            lines.append(
+                f'mychatui_gateway_upstream_latency_seconds{{quantile="{quantile}"}} '
+                f"{value:.6f}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+class Gateway:
+    """Shared state behind the HTTP handler."""
+
+    def __init__(
+        self,
+        upstream: str,
+        api_key: Optional[str] = None,
+        pool_size: int = 8,
+        cache_size: int = 512,
+        cache_ttl: float = 3600.0,
+        rate: float = 0.0,
+        burst: int = 10,
+        max_wait: float = 30.0,
+        timeout: float = 300.0,
+    ):
+        """
+        Args:
+            upstream: Upstream base URL, e.g. ``https://api.openai.com/v1``
+            api_key: Bearer token used when a client sends none
+            pool_size: Maximum concurrent upstream connections
+            cache_size: Cached responses kept (0 disables the cache)
+            cache_ttl: Seconds a cached response stays valid
+            rate: Upstream requests per second across all clients (0 = unlimited)
+            burst: Requests allowed back to back before ``rate`` applies
+            max_wait: Seconds a request may queue for the rate limit before 429
+            timeout: Upstream socket timeout
+        """
+        self.pool = UpstreamPool(upstream, pool_size, timeout)
+        self.api_key = api_key
+        self.cache = ResponseCache(cache_size, cache_ttl)
+        self.limiter = TokenBucket(rate, burst)
+        self.max_wait = max_wait
+        self.metrics = Metrics()
+
+    @staticmethod
+    def is_stream(body: bytes) -> bool:
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            return False
+        return isinstance(payload, dict) and bool(payload.get("stream"))
+
+    @staticmethod
+    def cache_key(
+        method: str, path: str, body: bytes, authorization: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Key for a cacheable request, or None (streaming, sampled completions
+        or unparseable bodies). Callers with different credentials never share
+        entries.
+        """
+        canonical = b""
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return None
+            if isinstance(payload, dict):
+                if payload.get("stream"):
+                    return None
+                if path.endswith("/completions") and payload.get("temperature") != 0:
+                    return None
+            canonical = json.dumps(payload, sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(method.encode() + b" " + path.encode() + b"\n")
+        digest.update(hashlib.sha256((authorization or "").encode("utf-8")).digest())
+        digest.update(canonical)
+        return digest.hexdigest()
+
+
+class GatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "mychatui-gateway"
+
+    @property
+    def gateway(self) -> Gateway:
+        return self.server.gateway
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = self.gateway.metrics.render(
+                len(self.gateway.cache), self.gateway.pool.connections_opened
+            ).encode("utf-8")
+            self._send(200, [("Content-Type", "text/plain; version=0.0.4")], body)
+        elif self.path == "/health":
+            self._send(200, [("Content-Type", "text/plain")], b"ok\n")
+        else:
+            self._proxy("GET")
+
+    def do_POST(self):
+        self._proxy("POST")
+
+    def _send(self, status: int, headers: List, body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        body = json.dumps({"error": {"message": message, "type": "gateway_error"}})
+        self._send(status, [("Content-Type", "application/json")], body.encode("utf-8"))
+
+    def _proxy(self, method: str) -> None:
+        gateway = self.gateway
+        gateway.metrics.incr("requests_total")
+        if not self.path.startswith("/v1/"):
+            self._error(404, f"Unknown path {self.path}")
+            return
+        path = self.path[len("/v1") :]
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        headers = {"Content-Type": self.headers.get("Content-Type", "application/json")}
+        authorization = self.headers.get("Authorization")
+        if authorization:
+            headers["Authorization"] = authorization
+        elif gateway.api_key:
+            headers["Authorization"] = f"Bearer {gateway.api_key}"
+
+        key = gateway.cache_key(method, path, body, headers.get("Authorization"))
+        no_cache = "no-cache" in (self.headers.get("Cache-Control") or "")
+        if key is not None and not no_cache:
+            cached = gateway.cache.get(key)
+            if cached is not None:
+                gateway.metrics.incr("cache_hits_total")
+                status, headers, cached_body = cached
+                self._send(status, headers + [("X-Cache", "HIT")], cached_body)
+                return
+            gateway.metrics.incr("cache_misses_total")
+
+        if not gateway.limiter.acquire(gateway.max_wait):
+            gateway.metrics.incr("rate_limited_total")
+            self._error(429, "Gateway rate limit exceeded")
+            return
+
+        start = time.monotonic()
+        gateway.metrics.started()
+        try:
+            try:
+                conn, response = gateway.pool.request(
+                    method, path, body or None, headers
+                )
+            except (http.client.HTTPException, OSError) as e:
+                gateway.metrics.incr("upstream_errors_total")
+                self._error(502, f"Upstream request failed: {e}")
+                return
+            try:
+                if gateway.is_stream(body):
+                    self._relay_stream(response)
+                else:
+                    self._relay(response, key)
+            finally:
+                # A response left half read (the client went away mid-stream)
+                # would be parsed as the next request's reply; drop the socket.
+                reusable = response.isclosed() and not response.will_close
+                gateway.pool.release(conn, reusable=reusable)
+                gateway.metrics.observe(time.monotonic() - start)
+        finally:
+            gateway.metrics.finished()
+
+    def _response_headers(self, response) -> List:
+        return [
+            (name, value)
+            for name, value in response.getheaders()
+            if name.lower() not in _SKIP_HEADERS
+        ]
+
+    def _relay(self, response, key: Optional[str]) -> None:
+        body = response.read()
+        headers = self._response_headers(response)
+        if response.status >= 500:
+            self.gateway.metrics.incr("upstream_errors_total")
+        if key is None:
+            self._send(response.status, headers + [("X-Cache", "BYPASS")], body)
+            return
+        if response.status == 200:
+            self.gateway.cache.put(key, response.status, headers, body)
+        self._send(response.status, headers + [("X-Cache", "MISS")], body)
+
+    def _relay_stream(self, response) -> None:
+        """Pass a (typically server-sent events) response on chunk by chunk."""
+        self.send_response(response.status)
+        for name, value in self._response_headers(response):
+            self.send_header(name, value)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        while True:
+            chunk = response.read1(65536)
+            if not chunk:
+                break
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class GatewayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], gateway: Gateway):
+        super().__init__(address, GatewayHandler)
+        self.gateway = gateway
+
+    def server_close(self):
+        super().server_close()
+        self.gateway.pool.close()
+
+
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0", "::"}
+
+
+def points_at_self(upstream: str, host: str, port: int) -> bool:
+    """True if ``upstream`` is the gateway's own ``host:port`` (a proxy loop)."""
+    parts = urlsplit(upstream)
+    upstream_port = parts.port or (443 if parts.scheme == "https" else 80)
+    if upstream_port != port:
+        return False
+    upstream_host = (parts.hostname or "").lower()
+    if upstream_host == host.lower():
+        return True
+    # A gateway listening on loopback or every interface answers all of these.
+    return upstream_host in _LOCAL_HOSTS and host.lower() in _LOCAL_HOSTS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mychatui gateway",
+        description="Local OpenAI-compatible caching gateway",
+    )
+    parser.add_argument(
+        "--upstream",
+        default=os.getenv("MYCHATUI_GATEWAY_UPSTREAM") or "https://api.openai.com/v1",
+        help="upstream base URL (default: $MYCHATUI_GATEWAY_UPSTREAM or "
+        "api.openai.com)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--api-key-env",
+        default="OPENAI_API_KEY",
+        help="environment variable holding the key used when clients send none",
+    )
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--cache-size", type=int, default=512)
+    parser.add_argument("--cache-ttl", type=float, default=3600.0)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="requests per second (0 = unlimited)"
+    )
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--max-wait", type=float, default=30.0)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if points_at_self(args.upstream, args.host, args.port):
+        parser.error(f"--upstream {args.upstream} is this gateway's own address")
+
+    gateway = Gateway(
+        args.upstream,
+        api_key=os.getenv(args.api_key_env),
+        pool_size=args.pool_size,
+        cache_size=args.cache_size,
+        cache_ttl=args.cache_ttl,
+        rate=args.rate,
+        burst=args.burst,
+        max_wait=args.max_wait,
+    )
+    server = GatewayServer((args.host, args.port), gateway)
+    logger.info(
+        f"Gateway on http://{args.host}:{server.server_port}/v1 -> {args.upstream}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
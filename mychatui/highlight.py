@@ -0,0 +1,167 @@
+"""
+Syntax highlighting for fenced code blocks, with pygments when it is installed.
+
+Lexers are cached by language and highlighted output is memoized by (code hash,
+language, theme), so re-rendering or refreshing a tab never lexes the same block
+twice. Highlighting runs on render workers; the transcript first shows code in
+the plain ``code`` color and the colors fill in once they are ready.
+
+For the native renderer a block is highlighted into ``(text, tag)`` runs whose
+tag names encode the style (``hl_268bd2_b`` is bold #268bd2), so the Tk thread
+can configure tags without consulting pygments. For the HTML renderer it is
+highlighted into spans with inline styles.
+"""
+
+import functools
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+def pygments_available() -> bool:
+    try:
+        import pygments  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=64)
+def lexer_for(language: str):
+    """The pygments lexer for a fence's language, or None if unknown."""
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+
+    try:
+        return get_lexer_by_name(language, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return None
+
+
+@functools.lru_cache(maxsize=16)
+def style_for(theme: str):
+    """The pygments style class for ``theme``, or None if unknown."""
+    from pygments.styles import get_style_by_name
+    from pygments.util import ClassNotFound
+
+    try:
+        return get_style_by_name(theme)
+    except ClassNotFound:
+        return None
+
+
+def fence_language(info: str) -> str:
+    """The language named in a fence's info string (``python`` in ```python x```)."""
+    return info.strip().split(maxsplit=1)[0].lower() if info.strip() else ""
+
+
+def tag_name(color: str, bold: bool, italic: bool) -> str:
+    return f"hl_{color}_{'b' if bold else ''}{'i' if italic else ''}"
+
+
+def parse_tag(tag: str) -> Tuple[str, bool, bool]:
+    """(``#color``, bold, italic) from a ``tag_name()``."""
+    _, color, flags = tag.split("_", 2)
+    return f"#{color}", "b" in flags, "i" in flags
+
+
+class CodeHighlighter:
+    def __init__(self, cache_size: int = 512):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, code: str, language: str, theme: str) -> tuple:
+        digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+        return kind, digest, language, theme
+
+    def _lookup(self, key: tuple):
+        with self._lock:
+            value = self._cache.get(key, MISSING)
+            if value is not MISSING:
+                self._cache.move_to_end(key)
+            return value
+
+    def _store(self, key: tuple, value) -> None:
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _tokens(self, code: str, language: str, theme: str):
+        if not language or not pygments_available():
+            return None, None
+        lexer, style = lexer_for(language), style_for(theme)
+        if lexer is None or style is None:
+            return None, None
+        return lexer.get_tokens(code), style
+
+    def runs(
+        self, code: str, language: str, theme: str
+    ) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """
+        ``(text, tag)`` runs covering ``code`` exactly, tag None for unstyled
+        text; None if the language or theme is unknown or pygments is missing.
+        """
+        key = self.key("runs", code, language, theme)
+        value = self._lookup(key)
+        if value is not MISSING:
+            return value
+        tokens, style = self._tokens(code, language, theme)
+        runs = None
+        if tokens is not None:
+            runs = []
+            for token_type, text in tokens:
+                token_style = style.style_for_token(token_type)
+                tag = None
+                if token_style["color"]:
+                    tag = tag_name(
+                        token_style["color"], token_style["bold"], token_style["italic"]
+                    )
+                if runs and runs[-1][1] == tag:
+                    runs[-1] = (runs[-1][0] + text, tag)
+                else:
+                    runs.append((text, tag))
+        self._store(key, runs)
+        return runs
+
+    def html(self, code: str, language: str, theme: str) -> Optional[str]:
+        """Highlighted HTML for the inside of a ``<code>`` element, or None."""
+        key = self.key("html", code, language, theme)
+        value = self._lookup(key)
+        if value is not MISSING:
+            return value
+        tokens, style = self._tokens(code, language, theme)
+        html = None
+        if tokens is not None:
+            from pygments import format
+            from pygments.formatters import HtmlFormatter
+
+            html = format(
+                tokens, HtmlFormatter(style=style, noclasses=True, nowrap=True)
+            )
+        self._store(key, html)
+        return html
+
+    def cached_html(self, code: str, language: str, theme: str):
+        """Like ``html()`` but never highlights; returns ``MISSING`` on a miss."""
+        return self._lookup(self.key("html", code, language, theme))
+
+
+_shared: Optional[CodeHighlighter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_highlighter() -> CodeHighlighter:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = CodeHighlighter()
+        return _shared
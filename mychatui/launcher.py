@@ -0,0 +1,83 @@
+"""
+Command line entry point for mychatui.
+
+Kept free of GUI and SDK imports so that a second launch can hand its request to
+the running instance and exit without paying the cold start cost.
+"""
+
+import argparse
+import importlib
+import sys
+
+from mychatui.single_instance import (
+    SingleInstance,
+    forward_to_running_instance,
+    wait_and_forward,
+)
+
+
+# Headless subcommands: ``mychatui <name> ...`` runs ``<module>.main(argv)``.
+SUBCOMMANDS = {
+    "batch": "mychatui.batch",
+    "gateway": "mychatui.gateway",
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mychatui", description="MyChatUI")
+    parser.add_argument("prompt", nargs="*", help="open a new tab and send this prompt")
+    parser.add_argument(
+        "--new-tab", action="store_true", help="open a new tab in the running app"
+    )
+    parser.add_argument(
+        "--new-instance",
+        action="store_true",
+        help="start a separate copy even if mychatui is already running",
+    )
+    return parser
+
+
+def launch_message(args) -> dict:
+    """Build the command forwarded to a running instance."""
+    prompt = " ".join(args.prompt).strip()
+    if prompt or args.new_tab:
+        return {"action": "new_tab", "prompt": prompt}
+    return {"action": "raise"}
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return importlib.import_module(SUBCOMMANDS[argv[0]]).main(argv[1:])
+
+    args = build_parser().parse_args(argv)
+    message = launch_message(args)
+
+    instance = None
+    if not args.new_instance:
+        if forward_to_running_instance(message):
+            return 0
+        instance = SingleInstance()
+        if not instance.acquire():
+            # Another copy holds the lock but isn't listening yet; it's starting up.
+            if wait_and_forward(message):
+                return 0
+            print("mychatui is already running but not responding", file=sys.stderr)
+            return 1
+        # Accept forwarded launches during our own cold start; they are queued
+        # until the UI is ready.
+        instance.start()
+
+    # Only now pay for the GUI and SDK imports.
+    from mychatui.app import main as app_main
+
+    startup_message = message if message["action"] != "raise" else None
+    try:
+        return app_main(instance=instance, startup_message=startup_message)
+    finally:
+        if instance is not None:
+            instance.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
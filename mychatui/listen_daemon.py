@@ -0,0 +1,228 @@
+"""
+Persistent 'listen' daemon that keeps the whisper model loaded between recordings.
+
+The daemon is the external listen command started with ``--daemon``. It speaks a
+line protocol of JSON objects over stdin/stdout:
+
+Commands written to the daemon's stdin::
+
+    {"cmd": "ping"}
+    {"cmd": "start"}                      begin recording from the microphone
+    {"cmd": "start", "vad": true, "silence": 1.5}
+                                          ...and stop by itself after 1.5s of
+                                          silence, trimming silent audio
+    {"cmd": "stop"}                       stop recording and transcribe it
+    {"cmd": "transcribe", "path": "..."}  transcribe a WAV file
+
+Events read from the daemon's stdout::
+
+    {"event": "ready"}                    model loaded, accepting commands
+    {"event": "pong"}
+    {"event": "partial", "text": "..."}   next segment while still recording
+    {"event": "final", "text": "..."}     transcription of the last recording
+    {"event": "error", "message": "..."}
+"""
+
+import json
+import logging
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ListenDaemonError(RuntimeError):
+    """Raised when the listen daemon can't be started or stops responding."""
+
+
+class ListenDaemon:
+    """Owns one long-lived listen process and its line protocol."""
+
+    def __init__(
+        self,
+        command: List[str],
+        startup_timeout: float = 120.0,
+        ping_timeout: float = 2.0,
+        max_restarts: int = 3,
+        restart_window: float = 300.0,
+    ):
+        """
+        Initialize without starting the process.
+
+        Args:
+            command: Command line that starts the daemon, e.g. ``[listen, "--daemon"]``
+            startup_timeout: Seconds to wait for the "ready" event (model load)
+            ping_timeout: Seconds to wait for a "pong" in the health check
+            max_restarts: Restarts allowed within ``restart_window`` before giving up
+            restart_window: Seconds over which restarts are counted
+        """
+        self.command = command
+        self.startup_timeout = startup_timeout
+        self.ping_timeout = ping_timeout
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+
+        self.process: Optional[subprocess.Popen] = None
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._pong = threading.Event()
+        self._listener: Optional[Callable[[Dict], None]] = None
+        self._restarts: List[float] = []
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """Start the daemon and wait until its model is loaded."""
+        with self._lock:
+            if self.is_running():
+                return
+            logger.info(f"Starting listen daemon: {' '.join(self.command)}")
+            ready = threading.Event()
+            try:
+                process = self.process = subprocess.Popen(
+                    self.command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                )
+            except OSError as e:
+                raise ListenDaemonError(f"Could not start listen daemon: {e}")
+            threading.Thread(
+                target=self._read_events,
+                args=(process, ready),
+                name="listen-daemon",
+                daemon=True,
+            ).start()
+
+            if not ready.wait(self.startup_timeout):
+                self._kill()
+                raise ListenDaemonError("Listen daemon did not become ready")
+            if process.poll() is not None:
+                self.process = None
+                raise ListenDaemonError(
+                    f"Listen daemon exited during startup ({process.returncode})"
+                )
+            logger.info("Listen daemon ready")
+
+    def ensure_healthy(self) -> None:
+        """
+        Make sure a responsive daemon is running, restarting it if needed.
+
+        Raises:
+            ListenDaemonError: if the daemon keeps failing
+        """
+        with self._lock:
+            if self.is_running() and self.ping():
+                return
+            if self.process is not None:
+                now = time.monotonic()
+                self._restarts = [
+                    t for t in self._restarts if now - t < self.restart_window
+                ]
+                if len(self._restarts) >= self.max_restarts:
+                    raise ListenDaemonError("Listen daemon keeps failing; giving up")
+                self._restarts.append(now)
+                logger.warning("Listen daemon unhealthy, restarting")
+                self._kill()
+            self.start()
+
+    def ping(self) -> bool:
+        """Health check: True if the daemon answered a ping in time."""
+        self._pong.clear()
+        try:
+            self.send({"cmd": "ping"})
+        except ListenDaemonError:
+            return False
+        return self._pong.wait(self.ping_timeout)
+
+    def send(self, command: Dict) -> None:
+        """Write one command line to the daemon."""
+        process = self.process
+        if process is None or process.poll() is not None:
+            raise ListenDaemonError("Listen daemon is not running")
+        try:
+            with self._write_lock:
+                process.stdin.write(json.dumps(command) + "\n")
+                process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            raise ListenDaemonError(f"Lost connection to listen daemon: {e}")
+
+    def set_listener(self, listener: Optional[Callable[[Dict], None]]) -> None:
+        """Route session events (everything but ready/pong) to ``listener``."""
+        self._listener = listener
+
+    def stop(self) -> None:
+        """Shut the daemon down."""
+        with self._lock:
+            self._kill()
+
+    def _kill(self) -> None:
+        process = self.process
+        self.process = None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        process.terminate()
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            logger.warning("Listen daemon didn't terminate, killing it")
+            process.kill()
+
+    def _read_events(self, process: subprocess.Popen, ready: threading.Event) -> None:
+        for line in process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                logger.debug(f"Listen daemon output: {line}")
+                continue
+
+            kind = event.get("event")
+            if kind == "ready":
+                ready.set()
+            elif kind == "pong":
+                self._pong.set()
+            elif self._listener is not None:
+                self._listener(event)
+
+        process.wait()
+        # Wake start() if the daemon died before it was ready.
+        ready.set()
+        # Only report crashes; a daemon we stopped or replaced ourselves is expected
+        # to exit.
+        if self.process is process and self._listener is not None:
+            logger.warning("Listen daemon exited unexpectedly")
+            self._listener({"event": "error", "message": "listen daemon exited"})
+
+
+_daemons: Dict[str, ListenDaemon] = {}
+_daemons_lock = threading.Lock()
+
+
+def get_listen_daemon(listen_command_path: str) -> ListenDaemon:
+    """Return the process-wide daemon for a listen command, creating it if needed."""
+    with _daemons_lock:
+        daemon = _daemons.get(listen_command_path)
+        if daemon is None:
+            daemon = ListenDaemon([listen_command_path, "--daemon"])
+            _daemons[listen_command_path] = daemon
+        return daemon
+
+
+def shutdown_listen_daemons() -> None:
+    """Stop every daemon started by this process."""
+    with _daemons_lock:
+        for daemon in _daemons.values():
+            daemon.stop()
+        _daemons.clear()
@@ -0,0 +1,201 @@
+"""
+Markdown to styled HTML, with the palette applied by markdown-it render rules.
+
+This replaces the BeautifulSoup pass that walked the whole transcript once per
+``style_map`` tag to add inline styles. Styled tags are emitted with their
+``style`` attribute as they are rendered, and parsed token streams are cached by
+markdown text, so re-rendering with another palette doesn't parse again.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from markdown_it import MarkdownIt
+from mdit_py_plugins.front_matter import front_matter_plugin
+
+from mychatui.highlight import MISSING, fence_language, shared_highlighter
+from mychatui.palette import TAG_STYLES, Palette
+
+ASSISTANT_PREFIX = "🤖 AI: "
+
+_STYLED_TAG_RE = re.compile(
+    r"<(" + "|".join(TAG_STYLES) + r")(?=[\s>/])([^>]*)>", re.IGNORECASE
+)
+_STYLE_ATTR_RE = re.compile(r'style="([^"]*)"', re.IGNORECASE)
+
+
+def style_html(html: str, palette: Optional[Palette]) -> str:
+    """
+    Add the palette's inline styles to the styled tags in an HTML fragment.
+
+    A single regex pass, used for raw HTML in replies and for messages saved
+    before their markdown was kept.
+    """
+    if palette is None:
+        return html
+
+    def styled(match):
+        tag, attrs = match.group(1), match.group(2)
+        css = palette.css(tag.lower())
+        if _STYLE_ATTR_RE.search(attrs):
+            attrs = _STYLE_ATTR_RE.sub(
+                lambda m: f'style="{m.group(1)} {css}"', attrs, count=1
+            )
+        else:
+            attrs += f' style="{css}"'
+        return f"<{tag}{attrs}>"
+
+    return _STYLED_TAG_RE.sub(styled, html)
+
+
+def _styled_open(renderer, tokens, idx, options, env):
+    token = tokens[idx]
+    palette = env.get("palette")
+    if palette is None:
+        return renderer.renderToken(tokens, idx, options, env)
+    return (
+        f'<{token.tag}{renderer.renderAttrs(token)} style="{palette.css(token.tag)}">'
+    )
+
+
+def _styled_code(default_name):
+    def render(renderer, tokens, idx, options, env):
+        html = getattr(type(renderer), default_name)(
+            renderer, tokens, idx, options, env
+        )
+        palette = env.get("palette")
+        if palette is None:
+            return html
+        return html.replace("<code", f'<code style="{palette.css("code")}"', 1)
+
+    return render
+
+
+def _fence(renderer, tokens, idx, options, env):
+    """
+    Highlighted fence when ``env`` has a ``code_theme``.
+
+    With a ``misses`` list in ``env`` only already-highlighted blocks are used;
+    the others are rendered plain and listed as ``(code, language)`` so they can
+    be highlighted later.
+    """
+    token = tokens[idx]
+    theme = env.get("code_theme")
+    language = fence_language(token.info)
+    html = None
+    if theme and language:
+        highlighter = shared_highlighter()
+        misses = env.get("misses")
+        if misses is None:
+            html = highlighter.html(token.content, language, theme)
+        else:
+            html = highlighter.cached_html(token.content, language, theme)
+            if html is MISSING:
+                misses.append((token.content, language))
+                html = None
+    if html is None:
+        return _styled_code("fence")(renderer, tokens, idx, options, env)
+    palette = env.get("palette")
+    style = f' style="{palette.css("code")}"' if palette is not None else ""
+    return f"<pre><code{style}>{html}</code></pre>\n"
+
+
+def _styled_html(renderer, tokens, idx, options, env):
+    return style_html(tokens[idx].content, env.get("palette"))
+
+
+class MarkdownRenderer:
+    """Parses markdown once (cached) and renders it with any palette."""
+
+    def __init__(self, cache_size: int = 256):
+        self.md = MarkdownIt().use(front_matter_plugin)
+        for name in ("strong_open", "em_open", "s_open", "link_open", "heading_open"):
+            self.md.add_render_rule(name, _styled_open)
+        for name in ("code_inline", "code_block"):
+            self.md.add_render_rule(name, _styled_code(name))
+        self.md.add_render_rule("fence", _fence)
+        for name in ("html_inline", "html_block"):
+            self.md.add_render_rule(name, _styled_html)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, text: str) -> List:
+        """Token stream for ``text``; shared, so callers must not modify it."""
+        with self._lock:
+            tokens = self._cache.get(text)
+            if tokens is not None:
+                self._cache.move_to_end(text)
+                return tokens
+        tokens = self.md.parse(text)
+        with self._lock:
+            self._cache[text] = tokens
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def render(
+        self,
+        text: str,
+        palette: Optional[Palette] = None,
+        code_theme: Optional[str] = None,
+        misses: Optional[List] = None,
+    ) -> str:
+        """
+        HTML for ``text``, with inline styles when a palette is given and fenced
+        code highlighted with the ``code_theme`` pygments style (see ``_fence``
+        for ``misses``).
+        """
+        env: Dict = {"palette": palette, "code_theme": code_theme, "misses": misses}
+        return self.md.renderer.render(self.parse(text), self.md.options, env)
+
+    def render_message(
+        self,
+        message: Dict,
+        palette: Optional[Palette],
+        render: Optional[Callable[..., str]] = None,
+        code_theme: Optional[str] = None,
+        misses: Optional[List] = None,
+    ) -> str:
+        if message.get("markdown") is not None:
+            render = render or self.render
+            return ASSISTANT_PREFIX + render(
+                message["markdown"], palette, code_theme, misses
+            )
+        return style_html(message.get("content") or "", palette)
+
+    def render_history(
+        self,
+        chat_history: List[Dict],
+        palette: Palette,
+        dark: bool,
+        render: Optional[Callable[..., str]] = None,
+        code_theme: Optional[str] = None,
+        misses: Optional[List] = None,
+    ) -> str:
+        """
+        The whole transcript as one styled HTML document for tkhtmlview.
+
+        ``render(markdown, palette, code_theme, misses)`` replaces ``self.render``
+        for replies, so large ones can be rendered elsewhere.
+        """
+        body = "".join(
+            self.render_message(m, palette, render, code_theme, misses)
+            for m in chat_history
+        )
+        return f'<div style="color: {palette.text_color(dark)};">{body}</div>'
+
+
+_shared: Optional[MarkdownRenderer] = None
+_shared_lock = threading.Lock()
+
+
+def shared_renderer() -> MarkdownRenderer:
+    """The process-wide renderer, so both transcript renderers share one token cache."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = MarkdownRenderer()
+        return _shared
@@ -1,6 +1,8 @@
 import customtkinter
 import tkinter as tk
 
+from mychatui.model_router import AUTO_DISPLAY_NAME, AUTO_MODEL
+
 
 class HamburgerMenu(customtkinter.CTkFrame):
     def __init__(self, master, app):
@@ -31,6 +33,15 @@ class HamburgerMenu(customtkinter.CTkFrame):
         self.menu.add_command(
             label="Open Tab", accelerator="Ctrl+O", command=self.app.open_tab
         )
+        self.menu.add_command(
+            label="Search Conversations",
+            accelerator="Ctrl+F",
+            command=self.app.open_search,
+        )
+        self.menu.add_command(
+            label="Import Saved Tabs", command=self.app.import_saved_tabs
+        )
+        self.menu.add_command(label="Usage Stats", command=self.app.open_usage_stats)
         self.menu.add_separator()
         self.menu.add_command(
             label="Clear History",
@@ -41,7 +52,7 @@ class HamburgerMenu(customtkinter.CTkFrame):
         self.menu.add_command(label="Preferences", command=self.app.open_preferences)
         self.menu.add_separator()
         self.menu.add_command(
-            label="Quit", accelerator="Ctrl+Q", command=self.app.destroy
+            label="Quit", accelerator="Ctrl+Q", command=self.app.on_closing
         )
 
         self.menu_button.bind("<Button-1>", self.show_menu)
@@ -57,7 +68,7 @@ class HamburgerMenu(customtkinter.CTkFrame):
 
     def on_model_select(self, model_display_name):
         # Find the full name for the selected display name
-        full_name = ""
+        full_name = AUTO_MODEL if model_display_name == AUTO_DISPLAY_NAME else ""
         for model in self.app.config.get("user_models", []):
             if model["display_name"] == model_display_name:
                 full_name = model["full_name"]
@@ -68,11 +79,13 @@ class HamburgerMenu(customtkinter.CTkFrame):
         if current_tab:
             tab = self.app.tab_view.tab(current_tab)
             tab.model = full_name
+            self.app.mark_tab_dirty(tab)
+            self.app.warm_model(full_name)
 
     def update_model_menu(self):
         # Populate the model menu with display names
         models = self.app.config.get("user_models", [])
-        display_names = [m["display_name"] for m in models]
+        display_names = [m["display_name"] for m in models] + [AUTO_DISPLAY_NAME]
         self.model_menu.configure(values=display_names)
 
         # Set the current model for the active tab
@@ -82,7 +95,7 @@ class HamburgerMenu(customtkinter.CTkFrame):
             model_full_name = tab.model
 
             # Find the display name for the current model
-            display_name = ""
+            display_name = AUTO_DISPLAY_NAME if model_full_name == AUTO_MODEL else ""
             for model in models:
                 if model["full_name"] == model_full_name:
                     display_name = model["display_name"]
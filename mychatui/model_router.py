@@ -0,0 +1,241 @@
+"""
+The ``"auto"`` model: pick a model per prompt from rules and live latency.
+
+Rules choose between a fast model for short prompts and the primary model for
+longer ones or anything containing code. A model whose rolling p95 latency
+(time to first token for streamed replies) is over the SLO, or whose recent
+error rate is too high, is skipped in favour of the next candidate (the
+fallback model). Calls older than ``max_age_seconds`` are forgotten, and every
+``probe_seconds`` a skipped model gets one real request; if it comes back
+healthy its history is cleared and it is used again. Configured with the
+``"auto_model"`` config entry::
+
+    "auto_model": {
+        "fast": "ollama:llama3.2",
+        "primary": "openai:gpt-4o",
+        "fallback": "anthropic:claude-3-5-haiku-latest",
+        "short_prompt_chars": 200,
+        "slo_seconds": 10,
+        "max_error_rate": 0.5,
+        "min_samples": 5,
+        "window": 50,
+        "max_age_seconds": 600,
+        "probe_seconds": 60
+    }
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from mychatui.usage_store import percentile
+
+logger = logging.getLogger(__name__)
+
+AUTO_MODEL = "auto"
+AUTO_DISPLAY_NAME = "Auto"
+
+# Fences, inline code, or lines that look like code.
+_CODE_RE = re.compile(
+    r"```|`[^`\n]+`|^\s*(def|class|import|from|function|const|let|var|#include|"
+    r"SELECT|public|private)\b|[;{}]\s*$",
+    re.MULTILINE,
+)
+
+
+def has_code(prompt: str) -> bool:
+    return bool(_CODE_RE.search(prompt))
+
+
+class LatencyTracker:
+    """
+    Latency and outcome of the last ``window`` calls per model, ignoring calls
+    older than ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        window: int = 50,
+        max_age: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = window
+        self.max_age = max_age
+        self.clock = clock
+        self._calls: Dict[str, Deque[Tuple[float, float, bool]]] = {}
+        # Recorded from the response threads, read when routing.
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        model: str,
+        latency: float,
+        ok: bool = True,
+        first_token: Optional[float] = None,
+    ) -> None:
+        """
+        Log a call. With ``first_token`` (seconds to the first streamed token)
+        that is the latency tracked, since it is the wait the user sees.
+        """
+        if first_token is not None:
+            latency = first_token
+        with self._lock:
+            calls = self._calls.setdefault(model, deque(maxlen=self.window))
+            calls.append((self.clock(), latency, ok))
+
+    def reset(self, model: str) -> None:
+        with self._lock:
+            self._calls.pop(model, None)
+
+    def _recent(self, model: str) -> List[Tuple[float, bool]]:
+        cutoff = self.clock() - self.max_age
+        with self._lock:
+            calls = self._calls.get(model)
+            if not calls:
+                return []
+            while calls and calls[0][0] < cutoff:
+                calls.popleft()
+            return [(latency, ok) for _, latency, ok in calls]
+
+    def samples(self, model: str) -> int:
+        return len(self._recent(model))
+
+    def last_call(self, model: str) -> Optional[float]:
+        """Clock time of the model's latest recorded call, or None."""
+        with self._lock:
+            calls = self._calls.get(model)
+            return calls[-1][0] if calls else None
+
+    def p95(self, model: str) -> Optional[float]:
+        """p95 latency of the model's recent successful calls, or None."""
+        latencies = [latency for latency, ok in self._recent(model) if ok]
+        return percentile(latencies, 95)
+
+    def error_rate(self, model: str) -> float:
+        calls = self._recent(model)
+        if not calls:
+            return 0.0
+        return sum(1 for _, ok in calls if not ok) / len(calls)
+
+
+@dataclass
+class Route:
+    model: str
+    reason: str
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        config: Optional[Dict] = None,
+        default_model: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            config: The ``"auto_model"`` config entry
+            default_model: Primary model when the config doesn't name one
+            clock: Time source for sample ages and probes
+        """
+        config = config or {}
+        self.primary = config.get("primary") or default_model
+        self.fast = config.get("fast")
+        self.fallback = config.get("fallback")
+        self.short_prompt_chars = config.get("short_prompt_chars", 200)
+        self.slo_seconds = config.get("slo_seconds", 10.0)
+        self.max_error_rate = config.get("max_error_rate", 0.5)
+        self.min_samples = config.get("min_samples", 5)
+        self.probe_seconds = config.get("probe_seconds", 60.0)
+        self.tracker = LatencyTracker(
+            config.get("window", 50), config.get("max_age_seconds", 600.0), clock
+        )
+        # Degraded models sent a probe request, and when.
+        self._probing: Set[str] = set()
+        self._probed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def models(self) -> List[str]:
+        """Every model the router may pick."""
+        return [m for m in (self.fast, self.primary, self.fallback) if m]
+
+    def health(self, model: str) -> Optional[str]:
+        """Why ``model`` should be avoided right now, or None if it is healthy."""
+        if self.tracker.samples(model) < self.min_samples:
+            return None
+        p95 = self.tracker.p95(model)
+        if p95 is not None and p95 > self.slo_seconds:
+            return f"p95 {p95:.1f}s over {self.slo_seconds:g}s SLO"
+        error_rate = self.tracker.error_rate(model)
+        if error_rate > self.max_error_rate:
+            return f"{error_rate:.0%} errors"
+        return None
+
+    def record(
+        self,
+        model: str,
+        latency: float,
+        ok: bool = True,
+        first_token: Optional[float] = None,
+    ) -> None:
+        """
+        Log a call's outcome. A probe that comes back within the SLO clears
+        the model's history, so it is used again straight away.
+        """
+        with self._lock:
+            probe = model in self._probing
+            self._probing.discard(model)
+        waited = first_token if first_token is not None else latency
+        if probe and ok and waited <= self.slo_seconds:
+            logger.info(f"Auto model probe of {model} succeeded; using it again")
+            self.tracker.reset(model)
+        self.tracker.record(model, latency, ok, first_token)
+
+    def _take_probe(self, model: str) -> bool:
+        """True if a degraded ``model`` is due a probe request (and claim it)."""
+        now = self.tracker.clock()
+        with self._lock:
+            last = max(
+                self.tracker.last_call(model) or float("-inf"),
+                self._probed_at.get(model, float("-inf")),
+            )
+            if now - last < self.probe_seconds:
+                return False
+            self._probing.add(model)
+            self._probed_at[model] = now
+            return True
+
+    def route(self, prompt: str) -> Route:
+        """
+        The model for ``prompt``.
+
+        Raises:
+            ValueError: if no model is configured
+        """
+        if has_code(prompt):
+            candidates, reason = [self.primary], "code"
+        elif self.fast and len(prompt) <= self.short_prompt_chars:
+            candidates, reason = [self.fast, self.primary], "short prompt"
+        else:
+            candidates, reason = [self.primary], "long prompt"
+        candidates = [m for m in candidates + [self.fallback] if m]
+        if not candidates:
+            raise ValueError(
+                "The auto model needs auto_model.primary or a default model"
+            )
+
+        skipped = []
+        for model in candidates:
+            problem = self.health(model)
+            if problem is None:
+                if skipped:
+                    reason += f"; skipped {', '.join(skipped)}"
+                return Route(model, reason)
+            if self._take_probe(model):
+                return Route(model, reason + f"; probing {model} ({problem})")
+            skipped.append(f"{model} ({problem})")
+        # Everything is degraded; the first choice is still the best guess.
+        return Route(candidates[0], reason + "; all candidates degraded")
@@ -0,0 +1,78 @@
+"""
+Transcript colors, shared by the HTML and native renderers.
+
+Every styled tag takes its color from one ``Palette``, so changing the theme only
+needs a re-render from the cached markdown tokens, not a re-parse.
+"""
+
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Optional, Tuple
+
+# Tag -> (palette color name, font style, decoration). The tags are the ones the
+# HTML renderer's style_map covered.
+TAG_STYLES = {
+    "b": ("gold", "bold", None),
+    "strong": ("gold", "bold", None),
+    "i": ("green", "italic", None),
+    "em": ("blue", "italic", None),
+    "u": ("blue", None, "underline"),
+    "s": ("red", None, "line-through"),
+    "strike": ("red", None, "line-through"),
+    "code": ("green", "bold", None),
+    "pre": ("green", "bold", None),
+    "a": ("blue", None, "underline"),
+    "h1": ("red", "bold", None),
+    "h2": ("red", "bold", None),
+    "h3": ("red", "bold", None),
+    "h4": ("red", "bold", None),
+    "h5": ("red", "bold", None),
+    "h6": ("red", "bold", None),
+}
+
+
+@dataclass(frozen=True)
+class Palette:
+    gold: str = "#c09900"
+    blue: str = "#2384c8"
+    green: str = "#2aa198"
+    red: str = "#a6451c"
+    dark_text: str = "white"
+    light_text: str = "black"
+    dark_background: str = "#002b36"
+    # pygments styles for fenced code
+    dark_code_theme: str = "solarized-dark"
+    light_code_theme: str = "solarized-light"
+
+    @classmethod
+    def from_config(cls, overrides: Optional[Dict[str, str]]) -> "Palette":
+        """Default palette with the config's ``"palette"`` entries applied."""
+        names = {f.name for f in fields(cls)}
+        return replace(
+            cls(), **{k: v for k, v in (overrides or {}).items() if k in names}
+        )
+
+    def text_color(self, dark: bool) -> str:
+        return self.dark_text if dark else self.light_text
+
+    def code_theme(self, dark: bool) -> str:
+        return self.dark_code_theme if dark else self.light_code_theme
+
+    def tag_style(self, tag: str) -> Tuple[str, Optional[str], Optional[str]]:
+        """(color, font style, decoration) for a styled tag."""
+        color, style, decoration = TAG_STYLES[tag]
+        return getattr(self, color), style, decoration
+
+    def css(self, tag: str) -> str:
+        """Inline CSS for a styled tag, as the HTML renderer emits it."""
+        color, style, decoration = self.tag_style(tag)
+        css = f"color: {color};"
+        if style == "bold":
+            css += " font-weight: bold;"
+        elif style == "italic":
+            css += " font-style: italic;"
+        if decoration:
+            css += f" text-decoration: {decoration};"
+        return css
+
+
+DEFAULT_PALETTE = Palette()
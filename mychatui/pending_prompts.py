@@ -0,0 +1,63 @@
+"""
+Pending-prompt list shown under a tab's message box.
+"""
+
+import logging
+from typing import Optional
+
+import customtkinter as ctk
+
+from mychatui.prompt_queue import PromptQueue
+
+logger = logging.getLogger(__name__)
+
+
+class PendingPromptsFrame(ctk.CTkFrame):
+    """One editable row per queued prompt, with a button to remove it."""
+
+    def __init__(self, parent, queue: PromptQueue, font: Optional[tuple] = None):
+        """
+        Initialize the pending prompt list.
+
+        Args:
+            parent: Parent widget (the tab)
+            queue: The tab's prompt queue
+            font: Font for the prompt rows
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.queue = queue
+        self.font = font
+        self.grid_columnconfigure(1, weight=1)
+
+    def refresh(self) -> None:
+        """Rebuild the rows from the queue; hidden while nothing is pending."""
+        for widget in self.winfo_children():
+            widget.destroy()
+        if not self.queue.pending:
+            self.grid_remove()
+            return
+        for row, prompt in enumerate(self.queue.pending):
+            label = ctk.CTkLabel(self, text=f"Pending {row + 1}:", font=self.font)
+            label.grid(row=row, column=0, sticky="w", padx=(0, 5), pady=1)
+
+            entry = ctk.CTkEntry(self, font=self.font)
+            entry.insert(0, prompt.text)
+            entry.grid(row=row, column=1, sticky="ew", pady=1)
+            entry.bind(
+                "<KeyRelease>",
+                lambda event, p=prompt.id, e=entry: self.queue.edit(p, e.get()),
+            )
+
+            remove = ctk.CTkButton(
+                self,
+                text="✕",
+                width=30,
+                command=lambda p=prompt.id: self.remove(p),
+            )
+            remove.grid(row=row, column=2, sticky="e", padx=(5, 0), pady=1)
+        self.grid()
+
+    def remove(self, prompt_id: int) -> None:
+        logger.info(f"Removing pending prompt {prompt_id}")
+        self.queue.remove(prompt_id)
+        self.refresh()
@@ -0,0 +1,175 @@
+"""
+Pre-warm providers in the background to take some of the cost off the first
+message.
+
+For every provider used by the open tabs and the default model this imports the
+provider's SDK module, which is otherwise imported lazily on the first request,
+and resolves and connects to the API host. The connection itself is thrown away
+(the adapters build their own HTTP clients per request), so that part only
+primes the system's DNS cache and logs whether the host is reachable. Nothing
+is attempted when the machine is offline.
+"""
+
+import importlib
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# API endpoints by any_llm provider prefix (``provider:model``).
+PROVIDER_URLS = {
+    "google": "https://generativelanguage.googleapis.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "openai": "https://api.openai.com",
+    "anthropic": "https://api.anthropic.com",
+    "mistral": "https://api.mistral.ai",
+    "groq": "https://api.groq.com",
+    "ollama": "http://localhost:11434",
+}
+
+# SDK modules any_llm imports on the first request to each provider.
+PROVIDER_MODULES = {
+    "google": "google.genai",
+    "gemini": "google.genai",
+    "openai": "openai",
+    "anthropic": "anthropic",
+    "mistral": "mistralai",
+    "groq": "groq",
+    "ollama": "ollama",
+}
+
+
+def model_provider(model: Optional[str]) -> Optional[str]:
+    """Return the provider prefix of ``provider:model``, or None."""
+    if not model or ":" not in model:
+        return None
+    return model.split(":", 1)[0]
+
+
+def provider_url(
+    provider: str, overrides: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """Endpoint for a provider, honouring the URL overrides the adapters use."""
+    overrides = overrides or {}
+    if provider in overrides and overrides[provider]:
+        return overrides[provider]
+    if provider == "openai" and os.getenv("OPENAI_API_URL"):
+        return os.getenv("OPENAI_API_URL")
+    if provider == "ollama" and os.getenv("OLLAMA_HOST"):
+        host = os.getenv("OLLAMA_HOST")
+        return host if "://" in host else "http://" + host
+    return PROVIDER_URLS.get(provider)
+
+
+def _endpoint(url: str) -> Tuple[str, int, bool]:
+    parts = urlsplit(url)
+    tls = parts.scheme == "https"
+    return parts.hostname, parts.port or (443 if tls else 80), tls
+
+
+def _is_loopback(host: str) -> bool:
+    return host in ("localhost", "127.0.0.1", "::1")
+
+
+def warm_endpoint(url: str, timeout: float = 3.0) -> float:
+    """
+    Resolve and connect to ``url``'s host.
+
+    Returns:
+        Seconds taken
+
+    Raises:
+        OSError: if the host can't be reached
+    """
+    host, port, _ = _endpoint(url)
+    start = time.monotonic()
+    socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    with socket.create_connection((host, port), timeout=timeout):
+        pass
+    return time.monotonic() - start
+
+
+def is_online(timeout: float = 1.5) -> bool:
+    """Cheap check for a usable non-loopback route (no packets are sent)."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(("192.0.2.1", 53))  # TEST-NET-1, never actually contacted
+            return not sock.getsockname()[0].startswith("127.")
+    except OSError:
+        return False
+
+
+def prewarm(
+    models: Iterable[Optional[str]],
+    url_overrides: Optional[Dict[str, str]] = None,
+    timeout: float = 3.0,
+    import_sdks: bool = True,
+) -> Dict[str, Optional[float]]:
+    """
+    Warm every provider used by ``models``.
+
+    Returns:
+        Seconds taken per endpoint URL, or None for ones that failed or were
+        skipped because the machine is offline
+    """
+    providers: List[str] = []
+    for model in models:
+        provider = model_provider(model)
+        if provider and provider not in providers:
+            providers.append(provider)
+
+    urls = []
+    for provider in providers:
+        url = provider_url(provider, url_overrides)
+        if url and url not in urls:
+            urls.append(url)
+
+    online = None
+    results: Dict[str, Optional[float]] = {}
+    for url in urls:
+        host, _, _ = _endpoint(url)
+        if not _is_loopback(host):
+            if online is None:
+                online = is_online()
+            if not online:
+                logger.info(f"Offline, not pre-warming {url}")
+                results[url] = None
+                continue
+        try:
+            results[url] = warm_endpoint(url, timeout)
+            logger.info(f"Pre-warmed {url} in {results[url]:.3f}s")
+        except OSError as e:
+            logger.info(f"Could not pre-warm {url}: {e}")
+            results[url] = None
+
+    if import_sdks:
+        for provider in providers:
+            module = PROVIDER_MODULES.get(provider)
+            if module:
+                try:
+                    importlib.import_module(module)
+                except Exception as e:
+                    logger.debug(f"Could not import {module}: {e}")
+    return results
+
+
+def prewarm_in_background(
+    models: Iterable[Optional[str]],
+    url_overrides: Optional[Dict[str, str]] = None,
+    timeout: float = 3.0,
+) -> threading.Thread:
+    """Run ``prewarm()`` on a daemon thread."""
+    thread = threading.Thread(
+        target=prewarm,
+        args=(list(models), url_overrides, timeout),
+        name="prewarm",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,72 @@
+"""
+Per-tab queue of prompts typed while a reply is still in flight.
+
+A tab sends one prompt at a time. ``submit()`` returns the prompt to send when
+the tab is idle and otherwise keeps it as pending; ``finish()`` is called when a
+reply (or error) arrives and returns the next pending prompt to send straight
+away. Pending prompts can be edited or removed until then.
+
+The queue is only used from the Tk thread, so it has no locking.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class PendingPrompt:
+    id: int
+    text: str
+
+
+class PromptQueue:
+    def __init__(self):
+        self.in_flight = False
+        self.pending: List[PendingPrompt] = []
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def submit(self, text: str) -> Optional[str]:
+        """The prompt to send now, or None if it was queued behind a reply."""
+        if not self.in_flight:
+            self.in_flight = True
+            return text
+        self.pending.append(PendingPrompt(next(self._ids), text))
+        return None
+
+    def finish(self) -> Optional[str]:
+        """
+        A reply arrived: the next pending prompt to send, or None if the tab is
+        now idle. Prompts edited down to blanks are dropped.
+        """
+        while self.pending:
+            text = self.pending.pop(0).text
+            if text.strip():
+                return text
+        self.in_flight = False
+        return None
+
+    def _find(self, prompt_id: int) -> Optional[PendingPrompt]:
+        for prompt in self.pending:
+            if prompt.id == prompt_id:
+                return prompt
+        return None
+
+    def edit(self, prompt_id: int, text: str) -> bool:
+        """Replace a pending prompt's text; False if it was already sent."""
+        prompt = self._find(prompt_id)
+        if prompt is None:
+            return False
+        prompt.text = text
+        return True
+
+    def remove(self, prompt_id: int) -> bool:
+        """Drop a pending prompt; False if it was already sent."""
+        prompt = self._find(prompt_id)
+        if prompt is None:
+            return False
+        self.pending.remove(prompt)
+        return True
@@ -0,0 +1,194 @@
+"""
+Render transcripts off the Tk thread.
+
+``RenderPipeline.submit()`` runs a ``prepare`` function (markdown parsing,
+styling, building tag runs) on a worker thread. Workers never touch Tk: the
+resulting fragments are handed over with a thread-safe ``post`` (the app's
+``UiEventBus.call``), or else on a queue the Tk thread polls while renders are
+outstanding, and are inserted a few at a time: each slice stops
+after ``slice_seconds`` and the rest is scheduled with ``after()``, so typing
+stays responsive while a huge reply is inserted.
+
+Every submit for a key (a tab) bumps that key's generation. Results and
+remaining slices of older generations are dropped, so only the latest render
+of a tab reaches its widget.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RenderPipeline:
+    def __init__(
+        self,
+        schedule: Callable[..., Any],
+        workers: int = 2,
+        slice_seconds: float = 0.008,
+        poll_ms: int = 16,
+        post: Optional[Callable[..., None]] = None,
+    ):
+        """
+        Args:
+            schedule: ``after``-style callable, ``schedule(delay_ms, func, *args)``,
+                that runs ``func`` on the Tk thread; only called from the Tk
+                thread
+            workers: Worker threads preparing fragments; 0 prepares them on the
+                calling thread
+            slice_seconds: Time budget of each insert slice on the Tk thread
+            poll_ms: How often the Tk thread checks for prepared renders
+            post: Thread-safe ``post(func, *args)`` that runs ``func`` on the Tk
+                thread; prepared renders are polled for when not given
+        """
+        self.schedule = schedule
+        self.slice_seconds = slice_seconds
+        self.poll_ms = poll_ms
+        self.post = post
+        # Prepared renders waiting for the Tk thread, and how many submits
+        # haven't come back yet (Tk thread only).
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._outstanding = 0
+        self._polling = False
+        self._executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+            if workers > 0
+            else None
+        )
+        self._generations: Dict[Any, int] = {}
+        self._pending: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def pending(self, key) -> bool:
+        """True while a render for ``key`` hasn't finished inserting."""
+        with self._lock:
+            return key in self._pending
+
+    def current(self, key, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def submit(
+        self,
+        key,
+        prepare: Callable[[], List],
+        begin: Callable[[], None],
+        insert: Callable[[Any], None],
+        finish: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """
+        Render for ``key``, superseding any earlier render for it.
+
+        ``prepare()`` runs on a worker and returns the fragments. Then, on the Tk
+        thread, ``begin()`` is called once, ``insert(fragment)`` for each
+        fragment across as many slices as needed, and finally ``finish()``.
+
+        Returns:
+            The render's generation
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            self._pending[key] = generation
+
+        def work():
+            try:
+                fragments = prepare()
+            except Exception as e:
+                logger.error(f"Error preparing render: {e}")
+                self._done(key, generation)
+                fragments = None
+            result = (key, generation, fragments, begin, insert, finish)
+            if self.post is not None:
+                self.post(self._deliver, *result)
+            else:
+                self._results.put(result)
+
+        if self.post is None:
+            self._outstanding += 1
+        if self._executor is None:
+            work()
+        else:
+            self._executor.submit(work)
+        if self.post is None:
+            self._arm(0)
+        return generation
+
+    def _arm(self, delay: int) -> None:
+        if not self._polling:
+            self._polling = True
+            self.schedule(delay, self._poll)
+
+    def _poll(self) -> None:
+        """Deliver prepared renders; keeps polling while any are outstanding."""
+        self._polling = False
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            self._deliver(*result)
+        if self._outstanding > 0:
+            self._arm(self.poll_ms)
+
+    def _done(self, key, generation: int) -> None:
+        with self._lock:
+            if self._pending.get(key) == generation:
+                del self._pending[key]
+
+    def _deliver(self, key, generation, fragments, begin, insert, finish) -> None:
+        if fragments is None or not self.current(key, generation):
+            return
+        try:
+            begin()
+        except Exception as e:
+            logger.error(f"Error starting render: {e}")
+            self._done(key, generation)
+            return
+        self._insert_slice(key, generation, fragments, 0, insert, finish)
+
+    def _insert_slice(
+        self, key, generation, fragments, position, insert, finish
+    ) -> None:
+        if not self.current(key, generation):
+            return
+        deadline = time.perf_counter() + self.slice_seconds
+        try:
+            while position < len(fragments):
+                insert(fragments[position])
+                position += 1
+                if time.perf_counter() >= deadline:
+                    break
+            if position < len(fragments):
+                self.schedule(
+                    1,
+                    self._insert_slice,
+                    key,
+                    generation,
+                    fragments,
+                    position,
+                    insert,
+                    finish,
+                )
+                return
+            if finish is not None:
+                finish()
+        except Exception as e:
+            # Typically the tab was closed while its render was in progress.
+            logger.error(f"Error inserting render: {e}")
+        self._done(key, generation)
+
+    def forget(self, key) -> None:
+        """Drop a key (a closed tab); its outstanding renders are discarded."""
+        with self._lock:
+            self._generations.pop(key, None)
+            self._pending.pop(key, None)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,148 @@
+"""
+Render very large replies in a separate process.
+
+Render worker threads still share the GIL with the Tk loop, so a 100 KB reply
+full of code and tables stalls input while it is parsed. Replies of at least
+``threshold`` characters are shipped as raw markdown to a spawned worker process,
+which sends back tag runs (native renderer) or styled HTML. Smaller ones are
+rendered in the calling thread, as is everything if the pool can't be used.
+
+The pool is created on the first large reply, or earlier with ``start()`` (the
+app calls it at idle time when ``render_process_prestart`` is set).
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from mychatui.markdown_render import shared_renderer
+from mychatui.palette import Palette
+
+logger = logging.getLogger(__name__)
+
+
+def _ready() -> bool:
+    """Run in a new worker so the renderer's imports are paid up front."""
+    shared_renderer()
+    return True
+
+
+def markdown_runs_job(text: str) -> List:
+    from mychatui.text_renderer import markdown_runs
+
+    return markdown_runs(text)
+
+
+def markdown_html_job(
+    text: str,
+    palette: Optional[Palette],
+    code_theme: Optional[str] = None,
+    misses: Optional[List] = None,
+) -> str:
+    return shared_renderer().render(text, palette, code_theme, misses)
+
+
+class ProcessRenderBackend:
+    def __init__(
+        self,
+        threshold: int = 100_000,
+        workers: int = 1,
+        timeout: float = 60.0,
+        cache_size: int = 16,
+    ):
+        """
+        Args:
+            threshold: Markdown length from which a worker process is used;
+                0 disables the pool
+            workers: Worker processes
+            timeout: Seconds to wait for a worker before rendering locally
+            cache_size: Large results kept, so re-rendering a tab doesn't ship
+                the same reply again
+        """
+        self.threshold = threshold
+        self.workers = workers
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._broken = False
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[tuple, object]" = OrderedDict()
+
+    def is_large(self, text: str) -> bool:
+        return self.threshold > 0 and len(text) >= self.threshold
+
+    def start(self) -> Optional[ProcessPoolExecutor]:
+        """Create the pool (if enabled) and start its workers."""
+        with self._lock:
+            if self._broken or self.threshold <= 0:
+                return None
+            if self._pool is None:
+                # Spawn, not fork: forking a process running Tk and worker
+                # threads is unsafe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                for _ in range(self.workers):
+                    self._pool.submit(_ready)
+                logger.info("Render worker processes started")
+            return self._pool
+
+    def _cached(self, key: tuple, job, *args):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        pool = self.start()
+        if pool is None:
+            return job(*args)
+        try:
+            result = pool.submit(job, *args).result(timeout=self.timeout)
+        except Exception as e:
+            logger.error(f"Render worker process failed, rendering in-process: {e}")
+            with self._lock:
+                self._broken = True
+            self.shutdown()
+            return job(*args)
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def markdown_runs(self, text: str) -> List:
+        """Tag runs for ``text``, from a worker process if it is large."""
+        if not self.is_large(text):
+            return markdown_runs_job(text)
+        return self._cached(("runs", text), markdown_runs_job, text)
+
+    def markdown_html(
+        self,
+        text: str,
+        palette: Optional[Palette],
+        code_theme: Optional[str] = None,
+        misses: Optional[List] = None,
+    ) -> str:
+        """
+        Styled HTML for ``text``, from a worker process if it is large. Large
+        replies have their code highlighted in the worker, so ``misses`` (see
+        ``MarkdownRenderer.render``) only applies to small ones.
+        """
+        if not self.is_large(text):
+            return markdown_html_job(text, palette, code_theme, misses)
+        return self._cached(
+            ("html", text, palette, code_theme),
+            markdown_html_job,
+            text,
+            palette,
+            code_theme,
+        )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
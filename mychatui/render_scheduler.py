@@ -0,0 +1,84 @@
+"""
+Coalesce transcript renders to at most one flush per frame.
+
+Code that changes a tab's chat_history marks the tab dirty instead of rendering
+it straight away. The first mark schedules a flush for the next frame, run from
+an idle callback so it waits for pending input events; every mark before then
+rides along. A flush renders the dirty tabs that are visible. Dirty tabs that
+aren't selected stay dirty until ``show()`` is called for them.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class RenderScheduler:
+    def __init__(
+        self,
+        schedule: Callable[..., Any],
+        schedule_idle: Callable[..., Any],
+        render: Callable[[Any], None],
+        is_visible: Callable[[Any], bool],
+        frame_seconds: float = 1 / 60,
+    ):
+        """
+        Args:
+            schedule: ``after``-style callable, ``schedule(delay_ms, func)``
+            schedule_idle: ``after_idle``-style callable, ``schedule_idle(func)``
+            render: Renders one tab
+            is_visible: Whether a tab is the selected one
+            frame_seconds: Minimum time between flushes
+        """
+        self.schedule = schedule
+        self.schedule_idle = schedule_idle
+        self.render = render
+        self.is_visible = is_visible
+        self.frame_seconds = frame_seconds
+        # Keyed by id() since tab widgets aren't reliably hashable; keeps order.
+        self._dirty: Dict[int, Any] = {}
+        self._scheduled = False
+        self._last_flush = float("-inf")
+
+    def is_dirty(self, tab) -> bool:
+        return id(tab) in self._dirty
+
+    def mark_dirty(self, tab) -> None:
+        """Render ``tab`` in the next flush (or when it is next shown)."""
+        self._dirty[id(tab)] = tab
+        if self.is_visible(tab):
+            self._schedule_flush()
+
+    def show(self, tab) -> None:
+        """``tab`` was selected; render it if it changed while hidden."""
+        if self.is_dirty(tab):
+            self._schedule_flush()
+
+    def forget(self, tab) -> None:
+        """Drop a closed tab."""
+        self._dirty.pop(id(tab), None)
+
+    def _schedule_flush(self) -> None:
+        if self._scheduled:
+            return
+        self._scheduled = True
+        wait = self._last_flush + self.frame_seconds - time.monotonic()
+        if wait > 0:
+            self.schedule(int(wait * 1000) + 1, lambda: self.schedule_idle(self.flush))
+        else:
+            self.schedule_idle(self.flush)
+
+    def flush(self) -> None:
+        """Render every dirty, visible tab."""
+        self._scheduled = False
+        self._last_flush = time.monotonic()
+        for key, tab in list(self._dirty.items()):
+            if not self.is_visible(tab):
+                continue
+            del self._dirty[key]
+            try:
+                self.render(tab)
+            except Exception as e:
+                logger.error(f"Error rendering tab: {e}")
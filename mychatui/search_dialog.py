@@ -0,0 +1,99 @@
+"""
+Search dialog for finding messages across every stored conversation.
+"""
+
+import logging
+from typing import Callable, Optional
+
+import customtkinter as ctk
+
+from mychatui.conversation_store import ConversationStore
+
+logger = logging.getLogger(__name__)
+
+
+class SearchDialog(ctk.CTkToplevel):
+    """Popup dialog that searches the conversation store as the user types."""
+
+    def __init__(
+        self,
+        parent,
+        store: ConversationStore,
+        on_select: Optional[Callable[[str], None]] = None,
+        debounce_ms: int = 150,
+    ):
+        """
+        Initialize the search dialog.
+
+        Args:
+            parent: Parent window
+            store: Conversation store to search
+            on_select: Callback called with the tab name of the chosen hit
+            debounce_ms: Delay after the last keystroke before searching
+        """
+        super().__init__(parent)
+
+        self.store = store
+        self.on_select = on_select
+        self.debounce_ms = debounce_ms
+        self._pending_search = None
+
+        self.title("Search Conversations")
+        self.geometry("600x400")
+
+        self.create_widgets()
+        self.query_entry.focus_set()
+
+    def create_widgets(self) -> None:
+        """Create the dialog UI components."""
+        self.query_entry = ctk.CTkEntry(
+            self, placeholder_text="Search all conversations"
+        )
+        self.query_entry.pack(fill="x", padx=10, pady=10)
+        self.query_entry.bind("<KeyRelease>", self.on_query_changed)
+        self.query_entry.bind("<Escape>", lambda event: self.destroy())
+
+        self.status_label = ctk.CTkLabel(self, text="", anchor="w")
+        self.status_label.pack(fill="x", padx=10)
+
+        self.results_frame = ctk.CTkScrollableFrame(self)
+        self.results_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+    def on_query_changed(self, event=None) -> None:
+        """Schedule a search once the user pauses typing."""
+        if self._pending_search is not None:
+            self.after_cancel(self._pending_search)
+        self._pending_search = self.after(self.debounce_ms, self.run_search)
+
+    def run_search(self) -> None:
+        """Search the store and list the hits."""
+        self._pending_search = None
+        query = self.query_entry.get()
+
+        for widget in self.results_frame.winfo_children():
+            widget.destroy()
+
+        try:
+            hits = self.store.search(query)
+        except Exception as e:
+            logger.error(f"Error searching conversations: {e}")
+            self.status_label.configure(text=f"Search error: {e}")
+            return
+
+        self.status_label.configure(text=f"{len(hits)} matches" if query else "")
+        for hit in hits:
+            button = ctk.CTkButton(
+                self.results_frame,
+                text=f"{hit['tab_name']} — {hit['snippet']}",
+                anchor="w",
+                fg_color="transparent",
+                command=lambda name=hit["tab_name"]: self.select(name),
+            )
+            button.pack(fill="x", pady=2)
+
+    def select(self, tab_name: str) -> None:
+        """Open the chosen conversation and close the dialog."""
+        logger.info(f"Search result selected: {tab_name}")
+        if self.on_select:
+            self.on_select(tab_name)
+        self.destroy()
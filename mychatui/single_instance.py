@@ -0,0 +1,207 @@
+"""
+Single-instance lock and local Unix socket used to forward launches to a running app.
+
+This module is imported before the GUI and SDK modules, so it must only use the
+standard library.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def runtime_dir() -> str:
+    """Return the per-user directory holding the lock file and socket."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base and os.path.isdir(base):
+        return base
+    return os.path.expanduser("~/.config/mychatui")
+
+
+def socket_path() -> str:
+    return os.path.join(runtime_dir(), "mychatui.sock")
+
+
+def lock_path() -> str:
+    return os.path.join(runtime_dir(), "mychatui.lock")
+
+
+def forward_to_running_instance(
+    message: Dict, path: Optional[str] = None, timeout: float = 0.5
+) -> bool:
+    """
+    Send a command to an already running instance.
+
+    Args:
+        message: Command such as ``{"action": "raise"}`` or
+            ``{"action": "new_tab", "prompt": "..."}``
+        path: Socket path, defaults to ``socket_path()``
+        timeout: Seconds to wait for the running instance to acknowledge
+
+    Returns:
+        True if a running instance accepted the command
+    """
+    path = path or socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+            reply = sock.makefile("r", encoding="utf-8").readline().strip()
+        return reply == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+class SingleInstance:
+    """Holds the single-instance lock and serves commands from later launches."""
+
+    def __init__(
+        self, lock_file: Optional[str] = None, sock_file: Optional[str] = None
+    ):
+        """
+        Initialize without acquiring anything.
+
+        Args:
+            lock_file: Lock file path, defaults to ``lock_path()``
+            sock_file: Socket path, defaults to ``socket_path()``
+        """
+        self.lock_file = lock_file or lock_path()
+        self.sock_file = sock_file or socket_path()
+        self._lock_fd: Optional[int] = None
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._handler: Optional[Callable[[Dict], None]] = None
+        # Commands received before a handler is set, in arrival order.
+        self._queued: List[Dict] = []
+        self._handler_lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """
+        Try to become the running instance.
+
+        Returns:
+            False if another process already holds the lock
+        """
+        os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._lock_fd = fd
+        return True
+
+    def start(self, handler: Optional[Callable[[Dict], None]] = None) -> None:
+        """
+        Listen for forwarded launches.
+
+        Call this as soon as the lock is held, so launches made while the app is
+        still starting are accepted; without a handler they are queued until
+        ``set_handler()``.
+
+        Args:
+            handler: Called on the listener thread with each decoded command;
+                GUI callers must hop to their own thread before touching widgets
+        """
+        if handler is not None:
+            self.set_handler(handler)
+        if self._lock_fd is None:
+            raise RuntimeError("start() called without holding the instance lock")
+
+        # We hold the lock, so any existing socket file is left over from a crash.
+        try:
+            os.unlink(self.sock_file)
+        except FileNotFoundError:
+            pass
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.sock_file)
+        os.chmod(self.sock_file, 0o600)
+        self._server.listen(8)
+        self._thread = threading.Thread(
+            target=self._serve,
+            args=(self._server,),
+            name="single-instance",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"Listening for forwarded launches on {self.sock_file}")
+
+    def set_handler(self, handler: Callable[[Dict], None]) -> None:
+        """Deliver queued and future commands to ``handler``, in order."""
+        with self._handler_lock:
+            self._handler = handler
+            queued, self._queued = self._queued, []
+            for message in queued:
+                handler(message)
+
+    def _dispatch(self, message: Dict) -> None:
+        with self._handler_lock:
+            if self._handler is None:
+                self._queued.append(message)
+            else:
+                self._handler(message)
+
+    def _serve(self, server: socket.socket) -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return  # Server socket closed
+            with conn:
+                try:
+                    conn.settimeout(2)
+                    line = conn.makefile("r", encoding="utf-8").readline()
+                    self._dispatch(json.loads(line))
+                    conn.sendall(b"ok\n")
+                except Exception as e:
+                    logger.error(f"Bad forwarded launch: {e}")
+                    try:
+                        conn.sendall(b"error\n")
+                    except OSError:
+                        pass
+
+    def close(self) -> None:
+        """Stop listening and release the lock."""
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+            try:
+                os.unlink(self.sock_file)
+            except FileNotFoundError:
+                pass
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+def wait_and_forward(
+    message: Dict, path: Optional[str] = None, wait: float = 3.0
+) -> bool:
+    """
+    Forward a command to an instance that holds the lock but may still be starting.
+
+    Returns:
+        True once the running instance accepted the command
+    """
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if forward_to_running_instance(message, path):
+            return True
+        time.sleep(0.1)
+    return False
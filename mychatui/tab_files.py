@@ -0,0 +1,326 @@
+"""
+Reading and writing of tab save files in ~/.config/mychatui/.
+
+Tabs are saved either as a plain pretty-printed ``<tab>.json`` file or as a
+tab archive (``<tab>.jsonl``, or compressed ``<tab>.jsonl.gz`` / ``<tab>.jsonl.zst``).
+An archive is line-delimited JSON: a header line with the tab name, model and
+message count, followed by one message per line, newest first, so a reader can
+start showing the most recent messages before the rest of the file has been
+decompressed. Uncompressed archives also get a ``<tab>.jsonl.idx`` offset index
+so pages of messages can be read by seeking.
+"""
+
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Callable, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MAGIC = "mychatui-tab"
+ARCHIVE_VERSION = 1
+
+TAB_FILE_EXTENSIONS = {
+    "json": ".json",
+    "jsonl": ".jsonl",
+    "gzip": ".jsonl.gz",
+    "zstd": ".jsonl.zst",
+}
+
+
+def _zstd_module():
+    """Return a zstd implementation: the 3.14 stdlib module or ``zstandard``."""
+    try:
+        from compression import zstd
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        return zstandard
+    except ImportError:
+        raise RuntimeError(
+            "zstd tab archives need Python 3.14+ or the 'zstandard' package"
+        )
+
+
+def tab_file_format(file_path: str) -> str:
+    """Return the save format ("json", "jsonl", "gzip" or "zstd") of a file name."""
+    if file_path.endswith(".jsonl"):
+        return "jsonl"
+    if file_path.endswith(".gz"):
+        return "gzip"
+    if file_path.endswith(".zst"):
+        return "zstd"
+    return "json"
+
+
+def is_tab_archive(file_path: str) -> bool:
+    """Return True if the file is a line-delimited tab archive."""
+    return tab_file_format(file_path) != "json"
+
+
+def tab_file_path(config_dir: str, tab_name: str, save_format: str = "json") -> str:
+    """Return the save file path for a tab in the given save format."""
+    if save_format not in TAB_FILE_EXTENSIONS:
+        raise ValueError(f"Unknown tab save format: {save_format}")
+    return os.path.join(config_dir, f"{tab_name}{TAB_FILE_EXTENSIONS[save_format]}")
+
+
+def _compressed_writer(raw: BinaryIO, save_format: str) -> BinaryIO:
+    if save_format == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+    zstd = _zstd_module()
+    if hasattr(zstd, "ZstdFile"):
+        return zstd.ZstdFile(raw, "wb")
+    return zstd.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+
+
+def _compressed_reader(raw: BinaryIO, save_format: str) -> BinaryIO:
+    if save_format == "jsonl":
+        return raw
+    if save_format == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    zstd = _zstd_module()
+    if hasattr(zstd, "ZstdFile"):
+        return zstd.ZstdFile(raw, "rb")
+    return zstd.ZstdDecompressor().stream_reader(raw, closefd=False)
+
+
+def _archive_lines(tab_data: Dict) -> Iterator[bytes]:
+    """Yield the encoded header line and then each message line, newest first."""
+    chat_history = tab_data.get("chat_history", [])
+    header = {
+        "format": ARCHIVE_MAGIC,
+        "version": ARCHIVE_VERSION,
+        "tab_name": tab_data.get("tab_name"),
+        "model_name": tab_data.get("model_name"),
+        "message_count": len(chat_history),
+    }
+    yield (json.dumps(header) + "\n").encode("utf-8")
+    for message in reversed(chat_history):
+        yield (json.dumps(message) + "\n").encode("utf-8")
+
+
+def _write_archive(raw: BinaryIO, tab_data: Dict, save_format: str) -> List[int]:
+    """
+    Write a tab archive.
+
+    Returns:
+        Byte offset of every message line (in file order) for uncompressed
+        archives, an empty list for compressed ones
+    """
+    offsets = []
+    if save_format == "jsonl":
+        position = 0
+        for line_number, line in enumerate(_archive_lines(tab_data)):
+            if line_number:
+                offsets.append(position)
+            raw.write(line)
+            position += len(line)
+        return offsets
+
+    writer = _compressed_writer(raw, save_format)
+    for line in _archive_lines(tab_data):
+        writer.write(line)
+    writer.close()
+    return offsets
+
+
+def _atomic_write(file_path: str, write_func: Callable[[BinaryIO], None]) -> None:
+    """Write via a temporary file in the same directory, then rename into place."""
+    dir_name = os.path.dirname(file_path) or "."
+    os.makedirs(dir_name, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            write_func(raw)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_tab_file(file_path: str, tab_data: Dict) -> None:
+    """
+    Atomically write a tab save file.
+
+    The data is written to a temporary file in the same directory, flushed to
+    disk and then renamed over ``file_path``, so a crash mid-save leaves either
+    the old file or the new one, never a truncated mix. The format follows the
+    file extension, see ``tab_file_path``.
+
+    Args:
+        file_path: Destination save file
+        tab_data: Dict with tab_name, model_name and chat_history
+    """
+    save_format = tab_file_format(file_path)
+
+    if save_format == "json":
+
+        def write_json(raw):
+            text = io.TextIOWrapper(raw, encoding="utf-8")
+            json.dump(tab_data, text, indent=4)
+            text.flush()
+            text.detach()
+
+        _atomic_write(file_path, write_json)
+    else:
+        offsets = []
+        _atomic_write(
+            file_path,
+            lambda raw: offsets.extend(_write_archive(raw, tab_data, save_format)),
+        )
+        if save_format == "jsonl":
+            write_tab_index(file_path, offsets)
+    logger.debug(f"Wrote tab file {file_path}")
+
+
+def tab_index_path(file_path: str) -> str:
+    """Return the offset index path that goes with an uncompressed tab archive."""
+    return f"{file_path}.idx"
+
+
+def write_tab_index(file_path: str, offsets: List[int]) -> None:
+    """
+    Write the offset index for an uncompressed tab archive.
+
+    The index records the archive size so a reader can tell when it is stale.
+    """
+    index = {
+        "version": ARCHIVE_VERSION,
+        "size": os.path.getsize(file_path),
+        "offsets": offsets,
+    }
+    _atomic_write(
+        tab_index_path(file_path),
+        lambda raw: raw.write(json.dumps(index).encode("utf-8")),
+    )
+
+
+def build_tab_index(file_path: str) -> List[int]:
+    """Scan an uncompressed tab archive for the offset of every message line."""
+    offsets = []
+    with open(file_path, "rb") as f:
+        f.readline()
+        position = f.tell()
+        for line in f:
+            if line.strip():
+                offsets.append(position)
+            position += len(line)
+    return offsets
+
+
+def load_tab_index(file_path: str) -> List[int]:
+    """
+    Return message offsets for an uncompressed tab archive.
+
+    Uses the saved index when it matches the archive, otherwise rebuilds it by
+    scanning the archive and saves the result for next time.
+    """
+    try:
+        with open(tab_index_path(file_path), "r") as f:
+            index = json.load(f)
+        if index.get("size") == os.path.getsize(file_path):
+            return index["offsets"]
+        logger.info(f"Offset index for {file_path} is stale, rebuilding")
+    except (OSError, ValueError, KeyError):
+        logger.info(f"No usable offset index for {file_path}, rebuilding")
+
+    offsets = build_tab_index(file_path)
+    try:
+        write_tab_index(file_path, offsets)
+    except OSError as e:
+        logger.warning(f"Could not save offset index for {file_path}: {e}")
+    return offsets
+
+
+def iter_tab_file(file_path: str) -> Tuple[Dict, Iterator[Dict]]:
+    """
+    Open a tab save file for streaming.
+
+    Archives are decoded one message at a time; plain ``.json`` files have to be
+    parsed whole and are then replayed in the same order.
+
+    Returns:
+        ``(header, messages)`` where header has tab_name, model_name and
+        message_count, and messages yields the chat history newest first
+    """
+    save_format = tab_file_format(file_path)
+    if save_format == "json":
+        tab_data = read_tab_file(file_path)
+        chat_history = tab_data.get("chat_history", [])
+        header = {
+            "tab_name": tab_data.get("tab_name"),
+            "model_name": tab_data.get("model_name"),
+            "message_count": len(chat_history),
+        }
+        return header, iter(reversed(chat_history))
+
+    raw = open(file_path, "rb")
+    try:
+        text = io.TextIOWrapper(_compressed_reader(raw, save_format), encoding="utf-8")
+        header = json.loads(text.readline())
+    except BaseException:
+        raw.close()
+        raise
+    if header.get("format") != ARCHIVE_MAGIC:
+        raw.close()
+        raise ValueError(f"{file_path} is not a mychatui tab archive")
+
+    def messages() -> Iterator[Dict]:
+        try:
+            for line in text:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            text.close()
+            raw.close()
+
+    return header, messages()
+
+
+def read_tab_file(file_path: str) -> Dict:
+    """Read a whole tab save file of any format, chat history oldest first."""
+    if not is_tab_archive(file_path):
+        with open(file_path, "r") as f:
+            return json.load(f)
+
+    header, messages = iter_tab_file(file_path)
+    chat_history = list(messages)
+    chat_history.reverse()
+    return {
+        "tab_name": header.get("tab_name"),
+        "model_name": header.get("model_name"),
+        "chat_history": chat_history,
+    }
+
+
+def read_newest_first(file_path: str, first_count: int) -> Iterator[Tuple[Dict, list]]:
+    """
+    Stream a tab file as batches, the newest ``first_count`` messages first.
+
+    Yields ``(header, batch)`` twice at most: the newest messages as soon as
+    they are decoded, then everything older once the file has been read. Each
+    batch is in chronological order.
+    """
+    header, messages = iter_tab_file(file_path)
+    newest = list(itertools.islice(messages, first_count))
+    newest.reverse()
+    yield header, newest
+    older = list(messages)
+    if older:
+        older.reverse()
+        yield header, older
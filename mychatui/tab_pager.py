@@ -0,0 +1,83 @@
+"""
+Paged access to uncompressed tab archives through their offset index.
+"""
+
+import json
+import logging
+import threading
+from typing import Dict, List
+
+from mychatui.tab_files import ARCHIVE_MAGIC, load_tab_index, tab_file_format
+
+logger = logging.getLogger(__name__)
+
+
+class TabPager:
+    """
+    Reads pages of a ``<tab>.jsonl`` archive by seeking instead of re-parsing.
+
+    Message indices are chronological (0 is the oldest message), matching
+    ``tab.chat_history``, even though the archive stores messages newest first.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Open an archive and load (or rebuild) its offset index.
+
+        Args:
+            file_path: Path to an uncompressed ``.jsonl`` tab archive
+        """
+        if tab_file_format(file_path) != "jsonl":
+            raise ValueError(f"Paged loading needs a .jsonl tab archive: {file_path}")
+
+        self.file_path = file_path
+        # Keep the archive open: if it is replaced by a later save, this handle
+        # still reads the file the offsets were computed for.
+        self._file = open(file_path, "rb")
+        self._lock = threading.Lock()
+        try:
+            self.header = json.loads(self._file.readline())
+            if self.header.get("format") != ARCHIVE_MAGIC:
+                raise ValueError(f"{file_path} is not a mychatui tab archive")
+            self._offsets = load_tab_index(file_path)
+        except BaseException:
+            self._file.close()
+            raise
+
+    @property
+    def message_count(self) -> int:
+        return len(self._offsets)
+
+    def read_page(self, start: int, stop: int) -> List[Dict]:
+        """
+        Read messages ``start`` to ``stop`` (chronological, stop exclusive).
+
+        The requested messages are contiguous in the archive, so a page costs
+        one seek and one read.
+        """
+        count = self.message_count
+        start = max(0, start)
+        stop = min(count, stop)
+        if start >= stop:
+            return []
+
+        # Chronological index i lives on archive line count - 1 - i.
+        first_line = count - stop
+        last_line = count - 1 - start
+        begin = self._offsets[first_line]
+        end = self._offsets[last_line + 1] if last_line + 1 < count else None
+
+        with self._lock:
+            self._file.seek(begin)
+            data = (
+                self._file.read(end - begin) if end is not None else self._file.read()
+            )
+
+        page = [json.loads(line) for line in data.splitlines() if line.strip()]
+        page.reverse()
+        return page
+
+    def close(self) -> None:
+        """Close the archive."""
+        with self._lock:
+            self._file.close()
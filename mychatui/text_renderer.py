@@ -0,0 +1,402 @@
+"""
+Native transcript renderer: markdown-it tokens straight into ``tk.Text`` tags.
+
+The HTML renderer goes markdown → styled HTML → tkhtmlview's HTML parser → Tk
+tags for every render. This one walks the markdown-it token stream once into
+"runs" of ``(text, tags)`` and inserts them with a single ``Text.insert`` call
+per render, using tags pre-configured with the same colors and weights as the
+HTML renderer, taken from the same ``Palette``.
+
+``markdown_runs()``, ``message_runs()`` and ``insert_fragments()`` are pure, so
+they run on the render pipeline's workers and are tested without a display.
+"""
+
+import logging
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mychatui.highlight import fence_language, parse_tag
+from mychatui.markdown_render import ASSISTANT_PREFIX, shared_renderer
+from mychatui.palette import DEFAULT_PALETTE, TAG_STYLES, Palette
+
+logger = logging.getLogger(__name__)
+
+Run = Tuple[str, Tuple[str, ...]]
+
+USER_PREFIX = "🧑 You: "
+LANGUAGE_TAG = "lang:"
+# Fragment that marks where a reply still streaming in (``"partial"``) begins.
+PARTIAL_MARK = ("partial_reply",)
+
+_INLINE_TAGS = {
+    "strong_open": "strong",
+    "em_open": "em",
+    "s_open": "s",
+    "link_open": "a",
+}
+
+# CSS decorations as Tk tag options.
+_DECORATIONS = {"underline": "underline", "line-through": "overstrike"}
+
+
+class _Runs:
+    """Collects runs, merging neighbours that share the same tags."""
+
+    def __init__(self):
+        self.runs: List[Run] = []
+
+    def add(self, text: str, tags: Tuple[str, ...] = ()) -> None:
+        if not text:
+            return
+        if self.runs and self.runs[-1][1] == tags:
+            self.runs[-1] = (self.runs[-1][0] + text, tags)
+        else:
+            self.runs.append((text, tags))
+
+    def newline(self) -> None:
+        """End the current line unless the output already ends one."""
+        if self.runs and not self.runs[-1][0].endswith("\n"):
+            self.add("\n", ())
+
+    def blank_line(self) -> None:
+        """Leave one empty line after the current block."""
+        self.newline()
+        if self.runs and not self.runs[-1][0].endswith("\n\n"):
+            self.add("\n", ())
+
+
+def _inline_runs(out: _Runs, children, tags: Tuple[str, ...]) -> None:
+    stack = list(tags)
+    for token in children or []:
+        if token.type == "text":
+            out.add(token.content, tuple(stack))
+        elif token.type == "code_inline":
+            out.add(token.content, tuple(stack) + ("code",))
+        elif token.type == "softbreak":
+            out.add(" ", tuple(stack))
+        elif token.type == "hardbreak":
+            out.add("\n", tuple(stack))
+        elif token.type in _INLINE_TAGS:
+            stack.append(_INLINE_TAGS[token.type])
+        elif (
+            token.type.endswith("_close") and token.type[:-6] + "_open" in _INLINE_TAGS
+        ):
+            if stack:
+                stack.pop()
+        elif token.type == "image":
+            out.add(token.content or "[image]", tuple(stack))
+        elif token.type == "html_inline":
+            out.add(token.content, tuple(stack))
+
+
+def markdown_runs(text: str) -> List[Run]:
+    """Walk the markdown-it tokens of ``text`` into ``(text, tags)`` runs."""
+    out = _Runs()
+    block_tags: List[str] = []
+    lists: List[Optional[int]] = []  # None for bullets, else the next number
+
+    for token in shared_renderer().parse(text):
+        kind = token.type
+        if kind == "heading_open":
+            block_tags.append(token.tag)
+        elif kind == "heading_close":
+            block_tags.pop()
+            out.blank_line()
+        elif kind == "paragraph_close":
+            if token.hidden:
+                out.newline()
+            else:
+                out.blank_line()
+        elif kind == "inline":
+            _inline_runs(out, token.children, tuple(block_tags))
+        elif kind in ("fence", "code_block"):
+            tags = tuple(block_tags) + ("pre",)
+            language = fence_language(token.info) if kind == "fence" else ""
+            if language:
+                # Marks the block for highlighting once it is in the widget.
+                tags += (LANGUAGE_TAG + language,)
+            out.add(token.content, tags)
+            out.blank_line()
+        elif kind == "bullet_list_open":
+            lists.append(None)
+        elif kind == "ordered_list_open":
+            lists.append(int(token.attrGet("start") or 1))
+        elif kind in ("bullet_list_close", "ordered_list_close"):
+            lists.pop()
+            if not lists:
+                out.blank_line()
+        elif kind == "list_item_open":
+            out.newline()
+            number = lists[-1] if lists else None
+            if number is None:
+                marker = "• "
+            else:
+                marker = f"{number}. "
+                lists[-1] = number + 1
+            out.add("    " * (len(lists) - 1) + marker, tuple(block_tags))
+        elif kind == "blockquote_open":
+            block_tags.append("blockquote")
+        elif kind == "blockquote_close":
+            block_tags.pop()
+        elif kind == "hr":
+            out.add("―" * 24, tuple(block_tags))
+            out.blank_line()
+        elif kind == "th_open":
+            block_tags.append("strong")
+        elif kind in ("th_close", "td_close"):
+            if kind == "th_close":
+                block_tags.pop()
+            out.add("\t", tuple(block_tags))
+        elif kind == "tr_close":
+            out.newline()
+        elif kind == "table_close":
+            out.blank_line()
+        elif kind == "html_block":
+            out.add(token.content, tuple(block_tags))
+    return out.runs
+
+
+class _HTMLRuns(HTMLParser):
+    """Runs for messages saved before the raw text was kept (HTML only)."""
+
+    _BLOCKS = {"p", "div", "pre", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = _Runs()
+        self.tags: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "br":
+            self.out.add("\n", tuple(self.tags))
+        elif tag == "hr":
+            self.out.newline()
+            self.out.add("―" * 24 + "\n", ())
+        elif tag == "li":
+            self.out.newline()
+            self.out.add("• ", tuple(self.tags))
+        if tag in TAG_STYLES:
+            self.tags.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in TAG_STYLES and tag in self.tags:
+            del self.tags[len(self.tags) - 1 - self.tags[::-1].index(tag)]
+        if tag in self._BLOCKS:
+            self.out.newline()
+
+    def handle_data(self, data):
+        self.out.add(data, tuple(self.tags))
+
+
+def html_runs(html: str) -> List[Run]:
+    parser = _HTMLRuns()
+    parser.feed(html)
+    parser.close()
+    return parser.out.runs
+
+
+def message_runs(
+    message: Dict, runs_for: Callable[[str], List[Run]] = markdown_runs
+) -> List[Run]:
+    """
+    Runs for one chat_history message.
+
+    Messages keep their raw ``markdown`` (assistant replies) or plain ``text``
+    (user messages and errors) next to the rendered HTML ``content``; older
+    messages that only have ``content`` are converted from the HTML.
+    ``runs_for`` turns markdown into runs (``markdown_runs()`` unless the
+    caller offloads large replies).
+    """
+    if message.get("markdown") is not None:
+        runs = [(ASSISTANT_PREFIX, ())] + list(runs_for(message["markdown"]))
+    elif message.get("text") is not None:
+        prefix = USER_PREFIX if message.get("role") == "user" else ""
+        runs = [(prefix + message["text"], ())]
+    else:
+        runs = html_runs(message.get("content") or "")
+
+    # Messages are separated by exactly one blank line.
+    while runs and runs[-1][0].endswith("\n"):
+        text, tags = runs[-1]
+        text = text.rstrip("\n")
+        runs[-1:] = [(text, tags)] if text else []
+    out = _Runs()
+    out.runs = runs
+    out.add("\n\n", ())
+    return out.runs
+
+
+def history_runs(
+    chat_history: List[Dict], runs_for: Callable[[str], List[Run]] = markdown_runs
+) -> List[Run]:
+    out = _Runs()
+    for message in chat_history:
+        for text, tags in message_runs(message, runs_for):
+            out.add(text, tags)
+    return out.runs
+
+
+def _fragments(
+    messages: List[Dict], runs_per_fragment: int, runs_for: Callable[[str], List[Run]]
+) -> List[Tuple]:
+    fragments = []
+    args: List = []
+    for text, tags in history_runs(messages, runs_for):
+        args.extend((text, tags))
+        if len(args) >= 2 * runs_per_fragment:
+            fragments.append(tuple(args))
+            args = []
+    if args:
+        fragments.append(tuple(args))
+    return fragments
+
+
+def insert_fragments(
+    chat_history: List[Dict],
+    start: int = 0,
+    runs_per_fragment: int = 64,
+    runs_for: Callable[[str], List[Run]] = markdown_runs,
+) -> List[Tuple]:
+    """
+    ``Text.insert`` arguments for ``chat_history[start:]``: tuples of
+    ``(text, tags, text, tags, ...)`` holding up to ``runs_per_fragment`` runs.
+    A trailing partial reply is preceded by ``PARTIAL_MARK``.
+    """
+    messages = chat_history[start:]
+    if not messages or not messages[-1].get("partial"):
+        return _fragments(messages, runs_per_fragment, runs_for)
+    return (
+        _fragments(messages[:-1], runs_per_fragment, runs_for)
+        + [PARTIAL_MARK]
+        + _fragments(messages[-1:], runs_per_fragment, runs_for)
+    )
+
+
+class TextRenderer:
+    """Renders a chat_history into a ``tk.Text`` (or ScrolledText) widget."""
+
+    def __init__(
+        self,
+        widget,
+        font_size: int = 12,
+        dark: bool = False,
+        palette: Palette = DEFAULT_PALETTE,
+    ):
+        self.widget = widget
+        self.source: Optional[List[Dict]] = None
+        self.count = 0
+        # Whether the text after the "partial_reply" mark is a streaming reply,
+        # replaced by the next render.
+        self.partial = False
+        # (start index, code, language) of fenced blocks inserted since the
+        # last take_code_blocks()
+        self.code_blocks: List[Tuple[str, str, str]] = []
+        self._highlight_tags = set()
+        self.configure_tags(font_size, dark, palette)
+
+    def configure_tags(
+        self, font_size: int, dark: bool, palette: Palette = DEFAULT_PALETTE
+    ) -> None:
+        """(Re)configure the style tags; existing text picks up the change."""
+        import tkinter.font
+
+        family = tkinter.font.nametofont("TkDefaultFont").actual("family")
+        self._font = (family, font_size)
+        self.widget.configure(foreground=palette.text_color(dark))
+        for name in TAG_STYLES:
+            color, style, decoration = palette.tag_style(name)
+            options = {"foreground": color}
+            if style:
+                options["font"] = (family, font_size, style)
+            if decoration:
+                options[_DECORATIONS[decoration]] = True
+            self.widget.tag_configure(name, **options)
+        self.widget.tag_configure("blockquote", lmargin1=20, lmargin2=20)
+        for tag in self._highlight_tags:
+            self._configure_highlight_tag(tag)
+
+    def _configure_highlight_tag(self, tag: str) -> None:
+        color, bold, italic = parse_tag(tag)
+        style = " ".join(s for s, on in (("bold", bold), ("italic", italic)) if on)
+        self.widget.tag_configure(
+            tag, foreground=color, font=self._font + ((style,) if style else ())
+        )
+
+    def render(self, chat_history: List[Dict]) -> None:
+        """Replace the widget's contents with ``chat_history``."""
+        self.begin(replace=True)
+        for fragment in insert_fragments(chat_history):
+            self.insert(fragment)
+        self.finish(chat_history, len(chat_history))
+
+    def begin(self, replace: bool) -> None:
+        self.widget.configure(state="normal")
+        if replace:
+            self.widget.delete("1.0", "end")
+            self.code_blocks = []
+        elif self.partial:
+            self.widget.delete("partial_reply", "end")
+        self.partial = False
+
+    def insert(self, fragment: Tuple) -> None:
+        """Insert one fragment from ``insert_fragments()`` at the end."""
+        if fragment == PARTIAL_MARK:
+            self.widget.mark_set("partial_reply", "end-1c")
+            self.widget.mark_gravity("partial_reply", "left")
+            self.partial = True
+            return
+        if not any(
+            tag.startswith(LANGUAGE_TAG) for tags in fragment[1::2] for tag in tags
+        ):
+            self.widget.insert("end", *fragment)
+            return
+        for text, tags in zip(fragment[::2], fragment[1::2]):
+            for tag in tags:
+                if tag.startswith(LANGUAGE_TAG):
+                    start = self.widget.index("end-1c")
+                    self.code_blocks.append((start, text, tag[len(LANGUAGE_TAG) :]))
+            self.widget.insert("end", text, tags)
+
+    def take_code_blocks(self) -> List[Tuple[str, str, str]]:
+        blocks, self.code_blocks = self.code_blocks, []
+        return blocks
+
+    def apply_highlight(self, block: Tuple[str, str, List]) -> None:
+        """
+        Tag a code block with ``(start, code, runs)`` from
+        ``CodeHighlighter.runs()``, unless the transcript was re-rendered and
+        the code is no longer at ``start``.
+        """
+        start, code, runs = block
+        if self.widget.get(start, f"{start}+{len(code)}c") != code:
+            return
+        offset = 0
+        for text, tag in runs:
+            if tag is not None:
+                if tag not in self._highlight_tags:
+                    self._highlight_tags.add(tag)
+                    self._configure_highlight_tag(tag)
+                self.widget.tag_add(
+                    tag, f"{start}+{offset}c", f"{start}+{offset + len(text)}c"
+                )
+            offset += len(text)
+
+    def finish(self, chat_history: List[Dict], count: int) -> None:
+        """
+        Record that the first ``count`` messages of ``chat_history`` are shown;
+        a partial reply among them doesn't count as shown.
+        """
+        # Read-only, but selection and Ctrl-C still work on a disabled Text.
+        self.widget.configure(state="disabled")
+        self.widget.see("end")
+        self.source = chat_history
+        self.count = count - 1 if self.partial else count
+
+    def append_start(self, chat_history: List[Dict]) -> int:
+        """
+        Position from which ``chat_history`` still needs rendering: the number
+        of messages already shown if the widget shows this same list, else 0.
+        """
+        if self.source is chat_history and self.count <= len(chat_history):
+            return self.count
+        return 0
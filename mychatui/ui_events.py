@@ -0,0 +1,160 @@
+"""
+Thread-safe event bus from worker threads to the Tk thread.
+
+Workers ``post()`` typed events instead of calling ``after(0, ...)`` for each UI
+change. One periodic ``drain()`` on the Tk thread applies everything queued
+since the last tick, in posting order, and merges events that would be
+overwritten anyway: consecutive deltas for a tab become one delta, and a run of
+partial transcriptions for an entry becomes the last one.
+"""
+
+import logging
+import queue
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Delta:
+    """A piece of streamed reply text for ``tab``."""
+
+    tab: Any
+    text: str
+
+
+@dataclass
+class Done:
+    """A finished reply (``html`` is its pre-rendered, unstyled HTML)."""
+
+    tab: Any
+    textbox: Any
+    content: Optional[str]
+    html: Optional[str] = None
+    model: Optional[str] = None
+
+
+@dataclass
+class Error:
+    tab: Any
+    textbox: Any
+    error: Exception
+    model: Optional[str] = None
+
+
+@dataclass
+class Progress:
+    """A background request started (``active``) or ended."""
+
+    active: bool
+
+
+@dataclass
+class Transcription:
+    """Voice input text for ``entry``; ``final`` once the recording is done."""
+
+    entry: Any
+    text: str
+    final: bool = True
+
+
+@dataclass
+class Call:
+    """Run ``func(*args)`` on the Tk thread."""
+
+    func: Callable
+    args: Tuple = field(default_factory=tuple)
+
+
+def coalesce(events: List[Any]) -> List[Any]:
+    """Merge neighbouring events whose effects add up (deltas) or replace each
+    other (partial transcriptions)."""
+    merged: List[Any] = []
+    for event in events:
+        last = merged[-1] if merged else None
+        if (
+            isinstance(event, Delta)
+            and isinstance(last, Delta)
+            and last.tab is event.tab
+        ):
+            merged[-1] = Delta(event.tab, last.text + event.text)
+        elif (
+            isinstance(event, Transcription)
+            and isinstance(last, Transcription)
+            and last.entry is event.entry
+            and not last.final
+        ):
+            merged[-1] = event
+        else:
+            merged.append(event)
+    return merged
+
+
+class UiEventBus:
+    def __init__(
+        self,
+        schedule: Callable[..., Any],
+        interval_ms: int = 16,
+        max_batch: int = 1000,
+    ):
+        """
+        Args:
+            schedule: ``after``-style callable, ``schedule(delay_ms, func)``
+            interval_ms: Time between drains
+            max_batch: Most events applied per drain; the rest wait a tick
+        """
+        self.schedule = schedule
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._handlers: Dict[type, Callable[[Any], None]] = {Call: self._call}
+        self._running = False
+
+    def subscribe(self, event_type: type, handler: Callable[[Any], None]) -> None:
+        self._handlers[event_type] = handler
+
+    def post(self, event) -> None:
+        """Queue ``event``; safe from any thread."""
+        self._queue.put(event)
+
+    def call(self, func: Callable, *args) -> None:
+        """Queue ``func(*args)`` to run on the Tk thread."""
+        self.post(Call(func, args))
+
+    @staticmethod
+    def _call(event: Call) -> None:
+        event.func(*event.args)
+
+    def drain(self) -> int:
+        """Apply up to ``max_batch`` queued events; returns how many were taken."""
+        events = []
+        while len(events) < self.max_batch:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for event in coalesce(events):
+            handler = self._handlers.get(type(event))
+            if handler is None:
+                logger.warning(f"No handler for {type(event).__name__} event")
+                continue
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Error handling {type(event).__name__} event: {e}")
+        return len(events)
+
+    def start(self) -> None:
+        """Drain every ``interval_ms`` until ``stop()``."""
+        self._running = True
+        self._tick()
+
+    def _tick(self) -> None:
+        if not self._running:
+            return
+        self.drain()
+        self.schedule(self.interval_ms, self._tick)
+
+    def stop(self) -> None:
+        self._running = False
@@ -0,0 +1,71 @@
+"""
+Dialog showing token usage, throughput, latency and cost per model and tab.
+"""
+
+import logging
+from typing import Dict, Optional
+
+import customtkinter as ctk
+
+from mychatui.usage_store import UsageStore, format_report
+
+logger = logging.getLogger(__name__)
+
+
+class UsageDialog(ctk.CTkToplevel):
+    """Popup with the usage report; Refresh re-reads the store."""
+
+    def __init__(
+        self,
+        parent,
+        store: UsageStore,
+        pricing: Optional[Dict] = None,
+        days: int = 30,
+    ):
+        """
+        Initialize the usage dialog.
+
+        Args:
+            parent: Parent window
+            store: Usage store to report on
+            pricing: The ``"pricing"`` config entry for cost estimates
+            days: How many days the tokens-per-day table covers
+        """
+        super().__init__(parent)
+
+        self.store = store
+        self.pricing = pricing
+        self.days = days
+
+        self.title("Usage Stats")
+        self.geometry("900x500")
+
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self) -> None:
+        """Create the dialog UI components."""
+        self.report = ctk.CTkTextbox(self, font=("Courier", 12), wrap="none")
+        self.report.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+        self.bind("<Escape>", lambda event: self.destroy())
+
+        button_frame = ctk.CTkFrame(self, fg_color="transparent")
+        button_frame.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(button_frame, text="Refresh", command=self.refresh).pack(
+            side="left"
+        )
+        ctk.CTkButton(button_frame, text="Close", command=self.destroy).pack(
+            side="right"
+        )
+
+    def refresh(self) -> None:
+        """Re-read the store into the report."""
+        try:
+            text = format_report(self.store, self.pricing, self.days)
+        except Exception as e:
+            logger.error(f"Error reading usage stats: {e}")
+            text = f"Error reading usage stats: {e}"
+        self.report.configure(state="normal")
+        self.report.delete("1.0", "end")
+        self.report.insert("1.0", text)
+        self.report.configure(state="disabled")
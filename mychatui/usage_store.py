@@ -0,0 +1,280 @@
+"""
+SQLite log of every completion call: tokens, latency and outcome, per tab and
+model, with the aggregates the usage stats dialog shows.
+
+Costs come from the ``"pricing"`` config entry, in dollars per million tokens,
+keyed by full model name or by provider::
+
+    "pricing": {
+        "openai:gpt-4o": {"prompt": 2.5, "completion": 10.0},
+        "ollama": {"prompt": 0, "completion": 0}
+    }
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USAGE_PATH = os.path.expanduser("~/.config/mychatui/usage.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    tab_name TEXT,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    latency REAL NOT NULL,
+    first_token REAL,
+    ok INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_started_at ON calls(started_at);
+"""
+
+GROUPS = ("model", "tab_name")
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """The ``q``-th percentile (0-100) of ``values`` by nearest rank, or None."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def price_for(model: str, pricing: Optional[Dict]) -> Optional[Dict]:
+    """The pricing entry for ``model``: its full name, else its provider."""
+    if not pricing:
+        return None
+    if model in pricing:
+        return pricing[model]
+    return pricing.get(model.split(":", 1)[0])
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int, pricing: Optional[Dict]
+) -> Optional[float]:
+    """Dollars for the given token counts, or None if the model has no price."""
+    price = price_for(model, pricing)
+    if price is None:
+        return None
+    return (
+        prompt_tokens * price.get("prompt", 0)
+        + completion_tokens * price.get("completion", 0)
+    ) / 1_000_000
+
+
+class UsageStore:
+    """Appends one row per completion call (WAL mode) and aggregates them."""
+
+    def __init__(self, db_path: str = DEFAULT_USAGE_PATH):
+        """
+        Open (and create if needed) the usage database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        # Calls are recorded from the response threads.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def record(
+        self,
+        model: str,
+        latency: float,
+        usage: Optional[Dict] = None,
+        tab_name: Optional[str] = None,
+        first_token: Optional[float] = None,
+        ok: bool = True,
+        started_at: Optional[float] = None,
+    ) -> None:
+        """
+        Log one completion call.
+
+        Args:
+            model: Full model name
+            latency: Seconds from sending the request to the complete reply
+            usage: The adapter's ``usage`` dict (prompt/completion token counts)
+            tab_name: Tab the call was made from
+            first_token: Seconds to the first streamed token, if streaming
+            ok: False if the call failed
+            started_at: Wall-clock start time (now minus ``latency`` if omitted)
+        """
+        usage = usage or {}
+        if started_at is None:
+            started_at = time.time() - latency
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO calls (started_at, tab_name, model, prompt_tokens, "
+                "completion_tokens, latency, first_token, ok) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    started_at,
+                    tab_name,
+                    model,
+                    usage.get("prompt_tokens"),
+                    usage.get("completion_tokens"),
+                    latency,
+                    first_token,
+                    int(ok),
+                ),
+            )
+
+    def stats(
+        self,
+        group_by: str = "model",
+        since: Optional[float] = None,
+        pricing: Optional[Dict] = None,
+    ) -> List[Dict]:
+        """
+        Aggregate calls per model or per tab.
+
+        Args:
+            group_by: ``"model"`` or ``"tab_name"``
+            since: Only count calls started at or after this time
+            pricing: The ``"pricing"`` config entry, for ``cost``
+
+        Returns:
+            Most used first, each with the group key, calls, errors,
+            prompt_tokens, completion_tokens, tokens_per_second (completion
+            tokens over the successful calls' latency), p50 and p95 latency in
+            seconds, and cost (None if a model has no price)
+        """
+        if group_by not in GROUPS:
+            raise ValueError(f"Unknown usage grouping: {group_by}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {group_by} AS key, model, prompt_tokens, completion_tokens, "
+                "latency, ok FROM calls WHERE started_at >= ?",
+                (since if since is not None else float("-inf"),),
+            ).fetchall()
+
+        groups: Dict = {}
+        for row in rows:
+            group = groups.setdefault(
+                row["key"],
+                {
+                    group_by: row["key"],
+                    "calls": 0,
+                    "errors": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost": 0.0,
+                    "_latencies": [],
+                    "_timed_tokens": 0,
+                    "_timed_seconds": 0.0,
+                },
+            )
+            prompt_tokens = row["prompt_tokens"] or 0
+            completion_tokens = row["completion_tokens"] or 0
+            group["calls"] += 1
+            group["prompt_tokens"] += prompt_tokens
+            group["completion_tokens"] += completion_tokens
+            if not row["ok"]:
+                group["errors"] += 1
+                continue
+            group["_latencies"].append(row["latency"])
+            if row["completion_tokens"]:
+                group["_timed_tokens"] += completion_tokens
+                group["_timed_seconds"] += row["latency"]
+            if group["cost"] is not None:
+                cost = estimate_cost(
+                    row["model"], prompt_tokens, completion_tokens, pricing
+                )
+                group["cost"] = None if cost is None else group["cost"] + cost
+
+        result = []
+        for group in groups.values():
+            latencies = group.pop("_latencies")
+            tokens, seconds = group.pop("_timed_tokens"), group.pop("_timed_seconds")
+            group["tokens_per_second"] = tokens / seconds if seconds > 0 else None
+            group["p50"] = percentile(latencies, 50)
+            group["p95"] = percentile(latencies, 95)
+            result.append(group)
+        result.sort(key=lambda g: (-g["calls"], str(g[group_by])))
+        return result
+
+    def tokens_per_day(self, days: int = 30) -> List[Dict]:
+        """
+        Total tokens per local calendar day and model over the last ``days``
+        days, oldest first.
+        """
+        since = time.time() - days * 86400
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date(started_at, 'unixepoch', 'localtime') AS day, model, "
+                "SUM(COALESCE(prompt_tokens, 0) + COALESCE(completion_tokens, 0)) "
+                "AS tokens FROM calls WHERE started_at >= ? "
+                "GROUP BY day, model ORDER BY day, model",
+                (since,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def _seconds(value: Optional[float]) -> str:
+    return f"{value:.2f}s" if value is not None else "-"
+
+
+def format_report(
+    store: UsageStore, pricing: Optional[Dict] = None, days: int = 30
+) -> str:
+    """The usage stats as plain-text tables, for the stats dialog and CLI."""
+    lines = []
+    for group_by, title in (("model", "Model"), ("tab_name", "Tab")):
+        lines.append(
+            f"{title:<32} {'calls':>6} {'errors':>6} {'tokens':>10} "
+            f"{'tok/s':>7} {'p50':>7} {'p95':>7} {'cost':>9}"
+        )
+        for s in store.stats(group_by, pricing=pricing):
+            tokens = s["prompt_tokens"] + s["completion_tokens"]
+            rate = f"{s['tokens_per_second']:.1f}" if s["tokens_per_second"] else "-"
+            cost = f"${s['cost']:.4f}" if s["cost"] is not None else "-"
+            lines.append(
+                f"{str(s[group_by] or '-')[:32]:<32} {s['calls']:>6} {s['errors']:>6} "
+                f"{tokens:>10} {rate:>7} {_seconds(s['p50']):>7} "
+                f"{_seconds(s['p95']):>7} {cost:>9}"
+            )
+        lines.append("")
+    lines.append(f"Tokens per day (last {days} days)")
+    for row in store.tokens_per_day(days):
+        lines.append(f"{row['day']}  {row['model'][:32]:<32} {row['tokens']:>10}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    config_file = os.path.expanduser("~/.config/mychatui/config.json")
+    config = {}
+    if os.path.exists(config_file):
+        with open(config_file, "r") as f:
+            config = json.load(f)
+    store = UsageStore(
+        os.path.expanduser(config.get("usage_store_path", DEFAULT_USAGE_PATH))
+    )
+    print(format_report(store, config.get("pricing")))
@@ -0,0 +1,113 @@
+"""
+Energy-based voice activity detection for 16-bit mono PCM audio.
+
+Pure Python (``array``) so it can run on the capture thread without numpy.
+"""
+
+import math
+import sys
+from array import array
+from typing import List
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+
+def frame_energy(frame: bytes) -> float:
+    """Return the RMS level of a 16-bit little-endian PCM frame, from 0.0 to 1.0."""
+    samples = array("h")
+    samples.frombytes(frame[: len(frame) - len(frame) % SAMPLE_WIDTH])
+    if not samples:
+        return 0.0
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return math.sqrt(sum(s * s for s in samples) / len(samples)) / 32768.0
+
+
+class EnergyVAD:
+    """Classifies frames as speech when their RMS level exceeds a threshold."""
+
+    def __init__(self, threshold: float = 0.01, frame_ms: int = 30):
+        """
+        Args:
+            threshold: RMS level (0.0-1.0) above which a frame counts as speech;
+                0.01 is roughly -40 dBFS
+            frame_ms: Frame length used when splitting longer buffers
+        """
+        self.threshold = threshold
+        self.frame_ms = frame_ms
+        self.frame_bytes = SAMPLE_RATE * frame_ms // 1000 * SAMPLE_WIDTH
+
+    def is_speech(self, frame: bytes) -> bool:
+        return frame_energy(frame) >= self.threshold
+
+    def speech_frames(self, pcm: bytes) -> List[bool]:
+        """Classify each ``frame_ms`` frame of ``pcm``."""
+        return [
+            self.is_speech(pcm[i : i + self.frame_bytes])
+            for i in range(0, len(pcm), self.frame_bytes)
+        ]
+
+    def trim_silence(self, pcm: bytes, padding_ms: int = 150) -> bytes:
+        """
+        Cut leading and trailing silence, keeping ``padding_ms`` around the speech.
+
+        Returns:
+            The trimmed audio, or ``b""`` if it contains no speech at all
+        """
+        flags = self.speech_frames(pcm)
+        if not any(flags):
+            return b""
+        first = flags.index(True)
+        last = len(flags) - 1 - flags[::-1].index(True)
+        pad = padding_ms // self.frame_ms
+        start = max(0, first - pad) * self.frame_bytes
+        end = min(len(flags), last + 1 + pad) * self.frame_bytes
+        return pcm[start:end]
+
+
+class SilenceDetector:
+    """
+    Decides when a recording should end: after speech, once it has been quiet
+    for ``silence_seconds``.
+    """
+
+    def __init__(
+        self,
+        vad: EnergyVAD,
+        silence_seconds: float = 1.5,
+        no_speech_timeout: float = 0.0,
+    ):
+        """
+        Args:
+            vad: Frame classifier
+            silence_seconds: Quiet time after speech that ends the recording
+            no_speech_timeout: Also end the recording if nobody has spoken after
+                this many seconds (0 waits forever)
+        """
+        self.vad = vad
+        self.silence_seconds = silence_seconds
+        self.no_speech_timeout = no_speech_timeout
+        self.heard_speech = False
+        self._silence = 0.0
+        self._elapsed = 0.0
+
+    def update(self, frame: bytes) -> bool:
+        """
+        Feed the next captured frame.
+
+        Returns:
+            True once the recording should stop
+        """
+        duration = len(frame) / (SAMPLE_RATE * SAMPLE_WIDTH)
+        self._elapsed += duration
+        if self.vad.is_speech(frame):
+            self.heard_speech = True
+            self._silence = 0.0
+            return False
+        if not self.heard_speech:
+            return (
+                bool(self.no_speech_timeout) and self._elapsed >= self.no_speech_timeout
+            )
+        self._silence += duration
+        return self._silence >= self.silence_seconds
@@ -0,0 +1,457 @@
+"""
+Benchmark voice transcription speed and accuracy on recorded WAV clips.
+
+Fixtures are a directory of ``<name>.wav`` clips (16 kHz mono 16-bit) with the
+reference transcript for each in ``<name>.txt``. Every clip is run through the
+in-process ``VoiceRecorder`` for each model size and compute type, and/or once
+through the listen daemon (the path ``VoiceInput`` uses with ``voice_daemon``),
+on the CPU. ``--generate`` synthesizes the missing clips of a directory of
+``.txt`` references with a text-to-speech command (``espeak-ng`` by default).
+
+For each combination the report gives:
+
+- model load time
+- real-time factor (processing time / audio length, lower is faster)
+- time to first partial transcript
+- word error rate against the reference
+
+Usage::
+
+    python -m mychatui.voice_bench tests/fixtures/voice --models tiny base \\
+        --compute-types int8 float32 --paths inprocess daemon
+
+The daemon is started as ``<listen_command> --daemon`` and fed clips with its
+``transcribe`` command, so it uses whichever model the listen command is set up
+with.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from array import array
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mychatui.listen_daemon import ListenDaemon
+from mychatui.voice_recorder import (
+    VoiceRecorder,
+    WavFileSource,
+    clear_model_cache,
+    get_whisper_model,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Fixture:
+    name: str
+    wav_path: str
+    reference: str
+    duration: float
+
+
+@dataclass
+class ClipResult:
+    name: str
+    duration: float
+    elapsed: float
+    first_partial: Optional[float]
+    errors: int
+    reference_words: int
+    text: str
+
+    @property
+    def wer(self) -> float:
+        if self.reference_words == 0:
+            return float(bool(self.errors))
+        return self.errors / self.reference_words
+
+
+@dataclass
+class BenchResult:
+    path: str
+    model_size: str
+    compute_type: str
+    load_time: float
+    clips: List[ClipResult] = field(default_factory=list)
+
+    @property
+    def rtf(self) -> float:
+        audio = sum(c.duration for c in self.clips)
+        return sum(c.elapsed for c in self.clips) / audio if audio else 0.0
+
+    @property
+    def first_partial(self) -> Optional[float]:
+        times = [c.first_partial for c in self.clips if c.first_partial is not None]
+        return sum(times) / len(times) if times else None
+
+    @property
+    def wer(self) -> float:
+        """Corpus WER: total edits over total reference words."""
+        words = sum(c.reference_words for c in self.clips)
+        errors = sum(c.errors for c in self.clips)
+        return errors / words if words else float(bool(errors))
+
+    def summary(self) -> Dict:
+        return {
+            "path": self.path,
+            "model_size": self.model_size,
+            "compute_type": self.compute_type,
+            "load_time": self.load_time,
+            "rtf": self.rtf,
+            "first_partial": self.first_partial,
+            "wer": self.wer,
+            "clips": [dict(asdict(c), wer=c.wer) for c in self.clips],
+        }
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase words with punctuation removed, as compared by the WER."""
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_errors(reference: str, hypothesis: str) -> Tuple[int, int]:
+    """
+    Count word-level edits between two transcripts.
+
+    Returns:
+        (substitutions + deletions + insertions, number of reference words)
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(
+                min(
+                    previous[j] + 1,  # deletion
+                    current[j - 1] + 1,  # insertion
+                    previous[j - 1] + (ref_word != hyp_word),  # substitution
+                )
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word error rate of ``hypothesis`` against ``reference``."""
+    errors, words = word_errors(reference, hypothesis)
+    if words == 0:
+        return float(bool(errors))
+    return errors / words
+
+
+def load_fixtures(directory: str) -> List[Fixture]:
+    """
+    Load every ``<name>.wav`` with a matching ``<name>.txt`` reference.
+
+    Raises:
+        FileNotFoundError: if the directory holds no usable clips
+    """
+    fixtures = []
+    for entry in sorted(os.listdir(directory)):
+        if not entry.endswith(".wav"):
+            continue
+        name = entry[: -len(".wav")]
+        wav_path = os.path.join(directory, entry)
+        ref_path = os.path.join(directory, name + ".txt")
+        if not os.path.exists(ref_path):
+            logger.warning(f"Skipping {entry}: no {name}.txt reference")
+            continue
+        with open(ref_path, "r", encoding="utf-8") as f:
+            reference = f.read().strip()
+        with wave.open(wav_path, "rb") as wav:
+            duration = wav.getnframes() / wav.getframerate()
+        fixtures.append(Fixture(name, wav_path, reference, duration))
+    if not fixtures:
+        raise FileNotFoundError(
+            f"No .wav/.txt fixture pairs in {directory} (add recordings, or run "
+            "with --generate to synthesize clips for the .txt references)"
+        )
+    return fixtures
+
+
+def to_pcm16_mono(wav_path: str, rate: int = 16000) -> bytes:
+    """
+    Read a 16-bit WAV file as 16-bit mono PCM at ``rate``, keeping the first
+    channel and resampling by linear interpolation.
+
+    Raises:
+        ValueError: for sample widths other than 16 bits
+    """
+    with wave.open(wav_path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{wav_path}: only 16-bit WAV files are supported")
+        channels = wav.getnchannels()
+        source_rate = wav.getframerate()
+        samples = array("h", wav.readframes(wav.getnframes()))
+    if sys.byteorder == "big":
+        samples.byteswap()
+    samples = samples[::channels]
+    if source_rate != rate and samples:
+        step = source_rate / rate
+        count = int(len(samples) / step)
+        resampled = array("h")
+        for i in range(count):
+            position = i * step
+            left = int(position)
+            right = min(left + 1, len(samples) - 1)
+            fraction = position - left
+            resampled.append(
+                round(samples[left] * (1 - fraction) + samples[right] * fraction)
+            )
+        samples = resampled
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def generate_fixtures(directory: str, tts_command: str = "espeak-ng") -> List[str]:
+    """
+    Synthesize ``<name>.wav`` for every ``<name>.txt`` reference that has no
+    clip yet, with ``<tts_command> -w <output.wav> <text>``.
+
+    Returns:
+        Names of the generated clips
+    """
+    generated = []
+    for entry in sorted(os.listdir(directory)):
+        if not entry.endswith(".txt"):
+            continue
+        name = entry[: -len(".txt")]
+        wav_path = os.path.join(directory, name + ".wav")
+        if os.path.exists(wav_path):
+            continue
+        with open(os.path.join(directory, entry), "r", encoding="utf-8") as f:
+            text = f.read().strip()
+        with tempfile.TemporaryDirectory() as tmp:
+            raw_path = os.path.join(tmp, "speech.wav")
+            subprocess.run(
+                shlex.split(tts_command) + ["-w", raw_path, text],
+                check=True,
+                capture_output=True,
+            )
+            pcm = to_pcm16_mono(raw_path)
+        with wave.open(wav_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(pcm)
+        generated.append(name)
+    return generated
+
+
+def bench_in_process(
+    fixtures: List[Fixture],
+    model_size: str,
+    compute_type: str,
+    realtime: bool = False,
+    chunk_seconds: float = 5.0,
+    model_loader: Callable = get_whisper_model,
+) -> BenchResult:
+    """Transcribe every clip with VoiceRecorder, loading the model from cold."""
+    clear_model_cache()
+    start = time.perf_counter()
+    model = model_loader(model_size, device="cpu", compute_type=compute_type)
+    result = BenchResult(
+        "inprocess", model_size, compute_type, time.perf_counter() - start
+    )
+
+    for fixture in fixtures:
+        first_partial: List[float] = []
+        recorder = VoiceRecorder(
+            model_size=model_size,
+            compute_type=compute_type,
+            chunk_seconds=chunk_seconds,
+            audio_source=WavFileSource(fixture.wav_path, realtime=realtime),
+            model=model,
+            on_transcription=lambda text: first_partial.append(time.perf_counter()),
+        )
+        start = time.perf_counter()
+        recorder.start_recording()
+        recorder.wait_until_finished()
+        text = recorder.stop_recording()
+        elapsed = time.perf_counter() - start
+        recorder.cleanup()
+        result.clips.append(
+            _clip_result(
+                fixture,
+                elapsed,
+                first_partial[0] - start if first_partial else None,
+                text,
+            )
+        )
+    return result
+
+
+def bench_daemon(
+    fixtures: List[Fixture], listen_command: str, timeout: float = 600.0
+) -> BenchResult:
+    """
+    Transcribe every clip through a freshly started listen daemon, with the
+    model the listen command is configured to load.
+    """
+    daemon = ListenDaemon([listen_command, "--daemon"], startup_timeout=timeout)
+    start = time.perf_counter()
+    daemon.start()
+    result = BenchResult("daemon", "listen", "default", time.perf_counter() - start)
+
+    try:
+        for fixture in fixtures:
+            done = threading.Event()
+            first_partial: List[float] = []
+            final: Dict = {}
+
+            def on_event(event: Dict) -> None:
+                if event.get("event") == "partial":
+                    first_partial.append(time.perf_counter())
+                elif event.get("event") in ("final", "error"):
+                    final.update(event)
+                    done.set()
+
+            daemon.set_listener(on_event)
+            start = time.perf_counter()
+            daemon.send(
+                {"cmd": "transcribe", "path": os.path.abspath(fixture.wav_path)}
+            )
+            if not done.wait(timeout):
+                raise TimeoutError(f"No transcription for {fixture.name}")
+            elapsed = time.perf_counter() - start
+            if final.get("event") == "error":
+                logger.error(f"{fixture.name}: {final.get('message')}")
+            result.clips.append(
+                _clip_result(
+                    fixture,
+                    elapsed,
+                    first_partial[0] - start if first_partial else None,
+                    final.get("text", ""),
+                )
+            )
+    finally:
+        daemon.set_listener(None)
+        daemon.stop()
+    return result
+
+
+def _clip_result(
+    fixture: Fixture, elapsed: float, first_partial: Optional[float], text: str
+) -> ClipResult:
+    errors, words = word_errors(fixture.reference, text)
+    return ClipResult(
+        fixture.name, fixture.duration, elapsed, first_partial, errors, words, text
+    )
+
+
+def format_report(results: List[BenchResult]) -> str:
+    """Render one table row per path / model / compute type."""
+    header = (
+        f"{'path':<10} {'model':<10} {'compute':<8} "
+        f"{'load s':>7} {'RTF':>6} {'1st partial s':>13} {'WER':>6}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        first = f"{r.first_partial:.2f}" if r.first_partial is not None else "-"
+        lines.append(
+            f"{r.path:<10} {r.model_size:<10} {r.compute_type:<8} "
+            f"{r.load_time:>7.2f} {r.rtf:>6.3f} {first:>13} {r.wer:>6.1%}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m mychatui.voice_bench",
+        description="Benchmark voice transcription on WAV fixtures (CPU only)",
+    )
+    parser.add_argument("fixtures", help="directory of <name>.wav + <name>.txt pairs")
+    parser.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+    parser.add_argument("--compute-types", nargs="+", default=["int8", "float32"])
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        choices=["inprocess", "daemon"],
+        default=["inprocess"],
+    )
+    parser.add_argument(
+        "--listen-command",
+        default=os.path.expanduser("~/bin/listen.sh"),
+        help="listen command used for the daemon path",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="feed in-process clips at speaking pace for a realistic time to first "
+        "partial (RTF then includes the playback time)",
+    )
+    parser.add_argument("--chunk-seconds", type=float, default=5.0)
+    parser.add_argument(
+        "--generate",
+        action="store_true",
+        help="synthesize missing clips for the .txt references, then exit",
+    )
+    parser.add_argument(
+        "--tts-command",
+        default="espeak-ng",
+        help="text-to-speech command for --generate, run as <cmd> -w <wav> <text>",
+    )
+    parser.add_argument("--json", help="also write the full results to this file")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    # CPU only, even on machines with a GPU.
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+    if args.generate:
+        generated = generate_fixtures(args.fixtures, args.tts_command)
+        print(f"Generated {len(generated)} clips in {args.fixtures}", file=sys.stderr)
+        return 0
+
+    fixtures = load_fixtures(args.fixtures)
+    print(
+        f"{len(fixtures)} clips, {sum(f.duration for f in fixtures):.1f}s of audio",
+        file=sys.stderr,
+    )
+
+    results = []
+    if "inprocess" in args.paths:
+        for model_size in args.models:
+            for compute_type in args.compute_types:
+                print(
+                    f"Running inprocess {model_size} {compute_type}...", file=sys.stderr
+                )
+                results.append(
+                    bench_in_process(
+                        fixtures,
+                        model_size,
+                        compute_type,
+                        realtime=args.realtime,
+                        chunk_seconds=args.chunk_seconds,
+                    )
+                )
+    if "daemon" in args.paths:
+        print("Running daemon...", file=sys.stderr)
+        results.append(bench_daemon(fixtures, args.listen_command))
+
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r.summary() for r in results], f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,7 +17,12 @@ class VoiceDialog(ctk.CTkToplevel):
     """Popup dialog for voice recording and transcription."""
 
     def __init__(
-        self, parent, on_complete: Optional[callable] = None, model_size: str = "base"
+        self,
+        parent,
+        on_complete: Optional[callable] = None,
+        model_size: str = "base",
+        vad: bool = False,
+        silence_seconds: float = 1.5,
     ):
         """
         Initialize the voice dialog.
@@ -26,6 +31,8 @@ class VoiceDialog(ctk.CTkToplevel):
             parent: Parent window
             on_complete: Callback function called with transcribed text when done
             model_size: Whisper model size to use
+            vad: Stop automatically once the speaker falls silent
+            silence_seconds: Silence that ends the recording when ``vad`` is on
         """
         super().__init__(parent)
 
@@ -33,6 +40,8 @@ class VoiceDialog(ctk.CTkToplevel):
         self.on_complete = on_complete
         self.recorder: Optional[VoiceRecorder] = None
         self.model_size = model_size
+        self.vad = vad
+        self.silence_seconds = silence_seconds
         self.transcribed_text = ""
 
         # Window configuration
@@ -111,6 +120,9 @@ class VoiceDialog(ctk.CTkToplevel):
                 model_size=self.model_size,
                 use_cuda=False,
                 on_transcription=self.on_transcription_update,
+                vad=self.vad,
+                silence_seconds=self.silence_seconds,
+                on_silence=self.on_silence_detected,
             )
             self.recorder.initialize_model()
 
@@ -166,6 +178,16 @@ class VoiceDialog(ctk.CTkToplevel):
             error_msg = f"Error: {e}"
             self.after(0, lambda msg=error_msg: self.show_error(msg))
 
+    def on_silence_detected(self) -> None:
+        """Called from the capture thread when VAD ends the recording."""
+
+        def stop_if_recording():
+            # The stop button may already have been pressed.
+            if self.stop_button.cget("state") == "normal":
+                self.stop_recording()
+
+        self.after(0, stop_if_recording)
+
     def on_transcription_update(self, text: str) -> None:
         """
         Called when new transcription text is available.
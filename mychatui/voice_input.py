@@ -1,11 +1,28 @@
 """
 Voice input module that uses the external 'listen' command for recording and transcription.
+
+When partial transcripts are requested, the listen command is started with
+``--stream`` and writes JSON lines while the user speaks::
+
+    {"event": "partial", "text": "next transcribed segment"}
+    {"event": "final", "text": "the whole utterance"}
+
+Lines that aren't JSON are treated as plain transcript text, so older listen
+commands that only print the final text keep working.
+
+With voice activity detection enabled the command also gets
+``--vad --silence <seconds>`` and is expected to stop recording by itself once
+the speaker has been quiet that long, trimming silence before transcribing.
 """
 
+import json
 import logging
 import subprocess
 import threading
-from typing import Callable, Optional
+import time
+from typing import Callable, Dict, List, Optional
+
+from mychatui.listen_daemon import ListenDaemon, ListenDaemonError, get_listen_daemon
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +34,14 @@ class VoiceInput:
         self,
         listen_command_path: str = "/home/rseward/bin/listen.sh",
         on_complete: Optional[Callable[[str], None]] = None,
+        use_daemon: bool = False,
+        daemon: Optional[ListenDaemon] = None,
+        on_partial: Optional[Callable[[str], None]] = None,
+        partial_interval: float = 0.15,
+        vad: bool = False,
+        silence_seconds: float = 1.5,
+        max_recording_seconds: float = 300.0,
+        stop_timeout: float = 15.0,
     ):
         """
         Initialize the VoiceInput.
@@ -24,11 +49,38 @@ class VoiceInput:
         Args:
             listen_command_path: Path to the listen command executable
             on_complete: Callback function called with transcribed text when done
+            use_daemon: Record through a persistent ``listen --daemon`` process
+                that keeps the model loaded, instead of one process per recording
+            daemon: Daemon to use; defaults to the shared one for the command
+            on_partial: Called with the transcript so far while the user is
+                still speaking; the final on_complete text replaces it
+            partial_interval: Minimum seconds between on_partial calls
+            vad: Ask the listen command to stop on its own after
+                ``silence_seconds`` of silence and to skip silent audio
+            silence_seconds: Silence that ends the recording when ``vad`` is on
+            max_recording_seconds: Daemon recordings are stopped after this long
+            stop_timeout: Seconds to wait for the daemon's transcription after
+                a stop before giving up on it and restarting the daemon
         """
         self.listen_command_path = listen_command_path
         self.on_complete = on_complete
+        self.use_daemon = use_daemon or daemon is not None
+        self.daemon = daemon
         self.process: Optional[subprocess.Popen] = None
         self.is_recording = False
+        self.on_partial = on_partial
+        self.partial_interval = partial_interval
+        self.vad = vad
+        self.silence_seconds = silence_seconds
+        self.max_recording_seconds = max_recording_seconds
+        self.stop_timeout = stop_timeout
+        self._session_done = threading.Event()
+        self._stop_deadline: Optional[float] = None
+        self._partial_lock = threading.Lock()
+        self._partial_segments: List[str] = []
+        self._partial_sent_at = 0.0
+        self._partial_timer: Optional[threading.Timer] = None
+        self._partials_closed = False
 
     def start_recording(self) -> None:
         """Start voice recording by launching the listen command in a background thread."""
@@ -38,19 +90,191 @@ class VoiceInput:
 
         logger.info("Starting voice recording via external listen command")
         self.is_recording = True
+        with self._partial_lock:
+            self._partial_segments = []
+            self._partial_sent_at = 0.0
+            self._partials_closed = False
 
         # Run the listen command in a separate thread
-        thread = threading.Thread(target=self._run_listen_command, daemon=True)
+        target = (
+            self._run_daemon_session if self.use_daemon else self._run_listen_command
+        )
+        thread = threading.Thread(target=target, daemon=True)
         thread.start()
 
+    def _listen_args(self) -> List[str]:
+        """Extra command line arguments for the listen command."""
+        if not self.vad:
+            return []
+        return ["--vad", "--silence", str(self.silence_seconds)]
+
+    def _add_partial(self, segment: str) -> None:
+        """Accumulate a partial segment and pass it on, throttled."""
+        if not self.on_partial or not segment.strip():
+            return
+        with self._partial_lock:
+            if self._partials_closed:
+                return
+            self._partial_segments.append(segment.strip())
+            wait = self._partial_sent_at + self.partial_interval - time.monotonic()
+            if wait > 0:
+                # Too soon: deliver the latest text when the interval is up.
+                if self._partial_timer is None:
+                    self._partial_timer = threading.Timer(wait, self._flush_partial)
+                    self._partial_timer.daemon = True
+                    self._partial_timer.start()
+                return
+        self._flush_partial()
+
+    def _flush_partial(self) -> None:
+        with self._partial_lock:
+            self._partial_timer = None
+            if self._partials_closed:
+                return
+            self._partial_sent_at = time.monotonic()
+            # Delivered under the lock so _close_partials() can't return while
+            # a partial is still on its way to overwrite the final text.
+            self.on_partial(" ".join(self._partial_segments))
+
+    def _close_partials(self) -> None:
+        """Stop partial delivery so nothing can overwrite the final text."""
+        with self._partial_lock:
+            self._partials_closed = True
+            if self._partial_timer is not None:
+                self._partial_timer.cancel()
+                self._partial_timer = None
+
+    def _run_daemon_session(self) -> None:
+        """Record one utterance through the listen daemon (runs in separate thread)."""
+        transcribed_text = ""
+        result: Dict = {}
+        self._session_done.clear()
+        self._stop_deadline = None
+
+        def on_event(event: Dict) -> None:
+            if event.get("event") == "partial":
+                self._add_partial(event.get("text", ""))
+            elif event.get("event") in ("final", "error"):
+                result.update(event)
+                self._session_done.set()
+
+        daemon = self.daemon or get_listen_daemon(self.listen_command_path)
+        try:
+            daemon.ensure_healthy()
+            daemon.set_listener(on_event)
+            command = {"cmd": "start"}
+            if self.vad:
+                command.update(vad=True, silence=self.silence_seconds)
+            daemon.send(command)
+
+            if not self._wait_for_session(daemon):
+                logger.error("Listen daemon did not answer; restarting it")
+                # ensure_healthy() starts a fresh one for the next recording.
+                daemon.stop()
+            elif result.get("event") == "final":
+                transcribed_text = result.get("text", "").strip()
+                logger.info(f"Transcription received: {transcribed_text}")
+            else:
+                logger.error(f"Listen daemon error: {result.get('message')}")
+
+        except Exception as e:
+            logger.error(f"Error using listen daemon: {e}")
+
+        finally:
+            daemon.set_listener(None)
+            self._close_partials()
+            self.is_recording = False
+
+        if self.on_complete:
+            self.on_complete(transcribed_text)
+
+    def _wait_for_session(self, daemon: ListenDaemon) -> bool:
+        """
+        Wait for the daemon's final or error event, stopping over-long
+        recordings. False if the daemon never answered.
+        """
+        recording_deadline = time.monotonic() + self.max_recording_seconds
+        while not self._session_done.wait(0.1):
+            now = time.monotonic()
+            if self._stop_deadline is None and now >= recording_deadline:
+                logger.warning("Recording hit the time limit; stopping it")
+                self._stop_deadline = now + self.stop_timeout
+                try:
+                    daemon.send({"cmd": "stop"})
+                except ListenDaemonError as e:
+                    logger.error(f"Error stopping daemon recording: {e}")
+                    return False
+            if self._stop_deadline is not None and now >= self._stop_deadline:
+                return False
+        return True
+
+    def _run_streaming_listen_command(self, command: List[str]) -> str:
+        """Run ``listen --stream``, passing partial segments on as they arrive."""
+        self.process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+        def drain_stderr(stream):
+            for line in stream:
+                logger.debug(f"Listen command stderr: {line.rstrip()}")
+
+        threading.Thread(
+            target=drain_stderr, args=(self.process.stderr,), daemon=True
+        ).start()
+
+        final_text = None
+        plain_lines = []
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                event = None
+            if not isinstance(event, dict):
+                plain_lines.append(line)
+            elif event.get("event") == "partial":
+                self._add_partial(event.get("text", ""))
+            elif event.get("event") == "final":
+                final_text = event.get("text", "")
+        self.process.wait()
+
+        if final_text is None:
+            final_text = " ".join(plain_lines)
+        return final_text.strip()
+
     def _run_listen_command(self) -> None:
         """Run the listen command and capture its output (runs in separate thread)."""
+        if self.on_partial:
+            try:
+                command = [self.listen_command_path, "--stream", *self._listen_args()]
+                logger.info(f"Executing: {' '.join(command)}")
+                transcribed_text = self._run_streaming_listen_command(command)
+                logger.info(f"Transcription received: {transcribed_text}")
+            except Exception as e:
+                logger.error(f"Error running listen command: {e}")
+                transcribed_text = ""
+            finally:
+                self._close_partials()
+                self.is_recording = False
+                self.process = None
+
+            if self.on_complete:
+                self.on_complete(transcribed_text)
+            return
+
         try:
-            logger.info(f"Executing: {self.listen_command_path}")
+            command = [self.listen_command_path, *self._listen_args()]
+            logger.info(f"Executing: {' '.join(command)}")
 
             # Run the listen command and capture stdout
             self.process = subprocess.Popen(
-                [self.listen_command_path],
+                command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
@@ -80,6 +304,18 @@ class VoiceInput:
 
     def stop_recording(self) -> None:
         """Stop the recording process if it's running."""
+        if self.use_daemon:
+            if self.is_recording:
+                # The daemon answers with the transcription of what was recorded.
+                daemon = self.daemon or get_listen_daemon(self.listen_command_path)
+                self._stop_deadline = time.monotonic() + self.stop_timeout
+                try:
+                    daemon.send({"cmd": "stop"})
+                except ListenDaemonError as e:
+                    logger.error(f"Error stopping daemon recording: {e}")
+                    self._session_done.set()
+            return
+
         if self.process and self.process.poll() is None:
             logger.info("Terminating listen command process")
             try:
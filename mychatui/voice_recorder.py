@@ -0,0 +1,446 @@
+"""
+In-process voice recorder with chunked faster-whisper transcription on the CPU.
+
+Audio is captured on a background thread into a ring buffer. A dispatcher cuts
+the buffer into fixed-size, slightly overlapping chunks and hands them to a
+worker pool; each chunk's text is reported through ``on_transcription`` in order
+as soon as it (and every chunk before it) is done. The whisper model is loaded
+once per process and shared by every recorder.
+
+With ``vad=True`` the recorder stops by itself once the speaker has been quiet
+for ``silence_seconds``, and silence is trimmed from chunks (silent chunks are
+skipped) before they reach whisper.
+"""
+
+import logging
+import re
+import threading
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from mychatui.vad import SAMPLE_RATE, SAMPLE_WIDTH, EnergyVAD, SilenceDetector
+
+logger = logging.getLogger(__name__)
+
+_model_cache: Dict[Tuple[str, str, str], object] = {}
+_model_cache_lock = threading.Lock()
+
+
+def get_whisper_model(
+    model_size: str = "base",
+    device: str = "cpu",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+):
+    """
+    Return a process-wide cached faster-whisper model, loading it on first use.
+
+    Args:
+        model_size: Whisper model size or path, e.g. "tiny", "base", "small"
+        device: "cpu" or "cuda"
+        compute_type: CTranslate2 compute type, "int8" for fast CPU inference
+        cpu_threads: Threads per transcription (0 lets CTranslate2 decide)
+        num_workers: Concurrent transcribe() calls the model should allow
+    """
+    key = (model_size, device, compute_type)
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is None:
+            from faster_whisper import WhisperModel
+
+            logger.info(f"Loading whisper model {key}")
+            model = WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+            )
+            _model_cache[key] = model
+        return model
+
+
+def clear_model_cache() -> None:
+    """Drop every cached model (mainly for tests and benchmarks)."""
+    with _model_cache_lock:
+        _model_cache.clear()
+
+
+def pcm_to_float32(pcm: bytes):
+    """Convert 16-bit little-endian PCM to the float32 array whisper expects."""
+    import numpy as np
+
+    return np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity byte ring addressed by absolute byte position.
+
+    The capture thread appends; the dispatcher reads ranges by their position in
+    the whole recording. Data older than the capacity is overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self.total_written = 0
+        self._lock = threading.Lock()
+
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            if len(data) > self.capacity:
+                self.total_written += len(data) - self.capacity
+                data = data[-self.capacity :]
+            start = self.total_written % self.capacity
+            first = min(len(data), self.capacity - start)
+            self._buffer[start : start + first] = data[:first]
+            self._buffer[: len(data) - first] = data[first:]
+            self.total_written += len(data)
+
+    def read(self, start: int, end: int) -> bytes:
+        """
+        Return bytes ``start`` to ``end`` of the recording.
+
+        Raises:
+            ValueError: if part of the range has already been overwritten
+        """
+        with self._lock:
+            end = min(end, self.total_written)
+            if start < self.total_written - self.capacity:
+                raise ValueError("Audio range has been overwritten")
+            if start >= end:
+                return b""
+            first = start % self.capacity
+            length = end - start
+            if first + length <= self.capacity:
+                return bytes(self._buffer[first : first + length])
+            head = self._buffer[first:]
+            return bytes(head + self._buffer[: length - len(head)])
+
+
+class WavFileSource:
+    """Audio source that plays a WAV file instead of the microphone."""
+
+    def __init__(self, path: str, frame_ms: int = 30, realtime: bool = False):
+        """
+        Args:
+            path: 16 kHz mono 16-bit WAV file
+            frame_ms: Size of the frames handed to the recorder
+            realtime: Pace frames like a live microphone instead of reading at
+                full speed
+        """
+        self.path = path
+        self.frame_ms = frame_ms
+        self.realtime = realtime
+        self._closed = threading.Event()
+
+    def frames(self) -> Iterator[bytes]:
+        with wave.open(self.path, "rb") as wav:
+            if (
+                wav.getframerate() != SAMPLE_RATE
+                or wav.getnchannels() != 1
+                or wav.getsampwidth() != SAMPLE_WIDTH
+            ):
+                raise ValueError(f"{self.path} must be 16 kHz mono 16-bit PCM")
+            frame_samples = SAMPLE_RATE * self.frame_ms // 1000
+            while not self._closed.is_set():
+                data = wav.readframes(frame_samples)
+                if not data:
+                    return
+                yield data
+                if self.realtime:
+                    self._closed.wait(self.frame_ms / 1000)
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+class MicrophoneSource:
+    """Audio source that reads 16 kHz mono frames from the default microphone."""
+
+    def __init__(self, frame_ms: int = 30, device_index: Optional[int] = None):
+        self.frame_ms = frame_ms
+        self.device_index = device_index
+        self._closed = threading.Event()
+
+    def frames(self) -> Iterator[bytes]:
+        try:
+            import pyaudio
+        except ImportError as e:
+            raise RuntimeError(
+                "Microphone recording needs the 'pyaudio' package"
+            ) from e
+
+        frame_samples = SAMPLE_RATE * self.frame_ms // 1000
+        audio = pyaudio.PyAudio()
+        stream = audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=SAMPLE_RATE,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=frame_samples,
+        )
+        try:
+            while not self._closed.is_set():
+                yield stream.read(frame_samples, exception_on_overflow=False)
+        finally:
+            stream.stop_stream()
+            stream.close()
+            audio.terminate()
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+_WORD_RE = re.compile(r"[\w']+")
+
+
+def merge_overlap(previous: str, current: str, max_words: int = 8) -> str:
+    """
+    Drop words at the start of ``current`` that repeat the end of ``previous``.
+
+    Neighbouring chunks overlap in time, so whisper often transcribes the same
+    words at the end of one chunk and the start of the next.
+    """
+    prev_words = [w.lower() for w in _WORD_RE.findall(previous)]
+    cur_tokens = current.split()
+    cur_words = [" ".join(_WORD_RE.findall(t)).lower() for t in cur_tokens]
+    for size in range(min(max_words, len(prev_words), len(cur_words)), 0, -1):
+        if prev_words[-size:] == cur_words[:size]:
+            return " ".join(cur_tokens[size:])
+    return current
+
+
+class VoiceRecorder:
+    """Records audio and transcribes it chunk by chunk while recording continues."""
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        use_cuda: bool = False,
+        on_transcription: Optional[Callable[[str], None]] = None,
+        compute_type: str = "int8",
+        chunk_seconds: float = 5.0,
+        overlap_seconds: float = 0.5,
+        workers: int = 2,
+        buffer_seconds: float = 60.0,
+        language: Optional[str] = None,
+        audio_source=None,
+        model=None,
+        vad: bool = False,
+        silence_seconds: float = 1.5,
+        vad_threshold: float = 0.01,
+        on_silence: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            model_size: Whisper model size to use
+            use_cuda: Run on the GPU instead of the CPU
+            on_transcription: Called with each chunk's new text, in order
+            compute_type: CTranslate2 compute type for the CPU model
+            chunk_seconds: Length of each chunk handed to whisper
+            overlap_seconds: Audio repeated at the start of each following chunk
+                so words cut at a boundary are still recognised
+            workers: Chunks transcribed concurrently
+            buffer_seconds: Capacity of the capture ring buffer
+            language: Language code, or None to let whisper detect it
+            audio_source: Source of PCM frames; defaults to the microphone
+            model: Preloaded model (skips the shared cache)
+            vad: Stop after ``silence_seconds`` of quiet following speech, and
+                drop silence before transcription
+            silence_seconds: Quiet time that ends the recording when ``vad`` is on
+            vad_threshold: RMS level (0.0-1.0) that counts as speech
+            on_silence: Called from the capture thread when VAD ends the
+                recording; call stop_recording() to collect the text
+        """
+        self.model_size = model_size
+        self.device = "cuda" if use_cuda else "cpu"
+        self.compute_type = compute_type if not use_cuda else "float16"
+        self.on_transcription = on_transcription
+        self.chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+        self.overlap_bytes = int(overlap_seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+        self.workers = workers
+        self.language = language
+        self.audio_source = audio_source
+        self.model = model
+        self.vad = EnergyVAD(vad_threshold) if vad else None
+        self.silence_seconds = silence_seconds
+        self.on_silence = on_silence
+
+        self._ring = AudioRingBuffer(int(buffer_seconds * SAMPLE_RATE) * SAMPLE_WIDTH)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+        self._capturing = False
+        self._next_chunk_start = 0
+        self._futures: List[Future] = []
+        self._results: Dict[int, str] = {}
+        self._next_result = 0
+        self._texts: List[str] = []
+        self.error: Optional[Exception] = None
+
+    def initialize_model(self) -> None:
+        """Load (or fetch the cached) whisper model."""
+        if self.model is None:
+            self.model = get_whisper_model(
+                self.model_size,
+                device=self.device,
+                compute_type=self.compute_type,
+                num_workers=self.workers,
+            )
+
+    def start_recording(self) -> None:
+        """Start capturing and transcribing audio."""
+        if self._capturing:
+            logger.warning("Recording already in progress")
+            return
+        self.initialize_model()
+
+        if self.audio_source is None:
+            self.audio_source = MicrophoneSource()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="whisper"
+        )
+        self._ring = AudioRingBuffer(self._ring.capacity)
+        self._next_chunk_start = 0
+        self._futures = []
+        self._results = {}
+        self._next_result = 0
+        self._texts = []
+        self.error = None
+
+        self._capturing = True
+        self._capture_thread = threading.Thread(
+            target=self._capture, name="voice-capture", daemon=True
+        )
+        self._capture_thread.start()
+        logger.info("Voice recording started")
+
+    def _capture(self) -> None:
+        detector = SilenceDetector(self.vad, self.silence_seconds) if self.vad else None
+        try:
+            for frame in self.audio_source.frames():
+                self._ring.write(frame)
+                self._dispatch_ready_chunks()
+                if not self._capturing:
+                    break
+                if detector is not None and detector.update(frame):
+                    logger.info("Silence detected, ending recording")
+                    self.audio_source.close()
+                    if self.on_silence:
+                        self.on_silence()
+                    break
+        except Exception as e:
+            logger.error(f"Audio capture failed: {e}")
+            self.error = e
+        finally:
+            with self._cond:
+                self._capturing = False
+                self._cond.notify_all()
+
+    def _dispatch_ready_chunks(self, final: bool = False) -> None:
+        """Submit every full chunk (and the remainder when ``final``)."""
+        while True:
+            start = self._next_chunk_start
+            end = start + self.chunk_bytes
+            available = self._ring.total_written
+            if available < end:
+                if not final or available <= start:
+                    return
+                end = available
+            read_from = max(0, start - self.overlap_bytes)
+            try:
+                pcm = self._ring.read(read_from, end)
+            except ValueError:
+                logger.warning("Transcription fell behind; dropping audio")
+                self._next_chunk_start = end
+                continue
+            index = len(self._futures)
+            self._futures.append(self._pool.submit(self._transcribe_chunk, index, pcm))
+            self._next_chunk_start = end
+
+    def _transcribe_chunk(self, index: int, pcm: bytes) -> str:
+        text = ""
+        if self.vad is not None:
+            pcm = self.vad.trim_silence(pcm)
+            if not pcm:
+                self._deliver(index, text)
+                return text
+        try:
+            segments, _ = self.model.transcribe(
+                pcm_to_float32(pcm),
+                language=self.language,
+                beam_size=1,
+                condition_on_previous_text=False,
+            )
+            text = " ".join(segment.text.strip() for segment in segments).strip()
+        except Exception as e:
+            logger.error(f"Transcription of chunk {index} failed: {e}")
+            self.error = e
+        self._deliver(index, text)
+        return text
+
+    def _deliver(self, index: int, text: str) -> None:
+        """Report finished chunks in order, trimming words repeated by the overlap."""
+        ready = []
+        with self._cond:
+            self._results[index] = text
+            while self._next_result in self._results:
+                chunk_text = self._results.pop(self._next_result)
+                if self._texts and self.overlap_bytes:
+                    chunk_text = merge_overlap(self._texts[-1], chunk_text)
+                if chunk_text:
+                    self._texts.append(chunk_text)
+                    ready.append(chunk_text)
+                self._next_result += 1
+        for chunk_text in ready:
+            if self.on_transcription:
+                self.on_transcription(chunk_text)
+
+    def wait_until_finished(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the audio source to run out (e.g. the end of a WAV file)."""
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout)
+            return not self._capture_thread.is_alive()
+        return True
+
+    def stop_recording(self) -> str:
+        """
+        Stop capturing, transcribe what is left and return the full transcription.
+        """
+        logger.info("Stopping voice recording")
+        self._capturing = False
+        if self.audio_source is not None:
+            self.audio_source.close()
+        if self._capture_thread is not None:
+            self._capture_thread.join()
+            self._capture_thread = None
+
+        if self._pool is not None:
+            self._dispatch_ready_chunks(final=True)
+            for future in list(self._futures):
+                future.result()
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+        return self.get_transcription()
+
+    def get_transcription(self) -> str:
+        """Return the text transcribed so far."""
+        with self._cond:
+            return " ".join(self._texts)
+
+    def cleanup(self) -> None:
+        """Release the capture thread and worker pool; the model stays cached."""
+        self._capturing = False
+        if self.audio_source is not None:
+            self.audio_source.close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -12,7 +12,7 @@ setup(
     ],
     entry_points={
         "gui_scripts": [
-            "mychatui = mychatui.app:main",
+            "mychatui = mychatui.launcher:main",
         ],
     },
 )
@@ -137,19 +137,18 @@ class TestApp(unittest.TestCase):
             {"role": "assistant", "content": "message2"},
         ]
         self.app.tab_view.tab.return_value = tab
-        mock_open = unittest.mock.mock_open()
-        with patch("builtins.open", mock_open):
+        with patch("mychatui.app.write_tab_file") as mock_write:
             # When
             self.app.save_current_tab()
 
             # Then
             config_dir = os.path.dirname(self.app.config_file)
             file_path = os.path.join(config_dir, "Test Tab.json")
-            mock_open.assert_called_once_with(file_path, "w")
-            handle = mock_open()
-            written_data = "".join(call.args[0] for call in handle.write.call_args_list)
+            mock_write.assert_called_once()
+            written_path, written_data = mock_write.call_args.args
+            self.assertEqual(written_path, file_path)
             self.assertEqual(
-                json.loads(written_data),
+                written_data,
                 {
                     "tab_name": "Test Tab",
                     "model_name": "test_model",
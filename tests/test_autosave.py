@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""
+Tests for background autosave and atomic tab file writes.
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.autosave import AutosaveService
+from mychatui.tab_files import read_tab_file, write_tab_file
+
+
+class TestWriteTabFile:
+    """Tests for the atomic tab file writer."""
+
+    def test_write_and_read(self, tmp_path):
+        """Test that a written tab file reads back and no temp file remains."""
+        path = str(tmp_path / "Tab 1.json")
+        data = {"tab_name": "Tab 1", "model_name": "m", "chat_history": []}
+
+        write_tab_file(path, data)
+
+        assert read_tab_file(path) == data
+        assert os.listdir(tmp_path) == ["Tab 1.json"]
+
+    def test_failed_write_keeps_old_file(self, tmp_path):
+        """Test that a crash during the write leaves the previous save intact."""
+        path = str(tmp_path / "Tab 1.json")
+        old = {"tab_name": "Tab 1", "model_name": "m", "chat_history": []}
+        write_tab_file(path, old)
+
+        with patch("mychatui.tab_files.json.dump", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                write_tab_file(path, {"tab_name": "Tab 1"})
+
+        assert read_tab_file(path) == old
+        assert os.listdir(tmp_path) == ["Tab 1.json"]
+
+
+class TestAutosaveService:
+    """Tests for AutosaveService."""
+
+    def test_burst_is_coalesced(self):
+        """Test that many marks within the quiet period produce one write."""
+        saved = []
+        service = AutosaveService(saved.append, delay=0.2)
+        try:
+            for i in range(20):
+                service.mark_dirty("tab", lambda i=i: {"n": i})
+            time.sleep(0.5)
+            assert saved == [{"n": 19}]
+        finally:
+            service.stop()
+
+    def test_writes_run_off_the_calling_thread(self):
+        """Test that snapshots and writes happen on the worker thread."""
+        threads = []
+        service = AutosaveService(lambda data: threads.append(data), delay=0.05)
+        try:
+            service.mark_dirty("tab", lambda: threading.current_thread().name)
+            time.sleep(0.3)
+            assert threads == ["autosave"]
+        finally:
+            service.stop()
+
+    def test_stop_flushes_pending(self):
+        """Test that pending tabs are written on exit without waiting."""
+        saved = []
+        service = AutosaveService(saved.append, delay=60)
+        service.mark_dirty("a", lambda: "a")
+        service.mark_dirty("b", lambda: "b")
+
+        start = time.monotonic()
+        service.stop()
+
+        assert sorted(saved) == ["a", "b"]
+        assert time.monotonic() - start < 5
+
+    def test_discard(self):
+        """Test that discarded tabs are not written."""
+        saved = []
+        service = AutosaveService(saved.append, delay=60)
+        service.mark_dirty("a", lambda: "a")
+        service.discard("a")
+        service.stop()
+
+        assert saved == []
+
+    def test_save_now_waits_for_running_autosave(self):
+        """Test that an autosave already writing can't overwrite an explicit save."""
+        saved = []
+        writing = threading.Event()
+
+        def save(data):
+            if data == "old":
+                writing.set()
+                time.sleep(0.2)
+            saved.append(data)
+            return data
+
+        service = AutosaveService(save, delay=0.01)
+        try:
+            service.mark_dirty("a", lambda: "old")
+            assert writing.wait(2)
+            assert service.save_now("a", lambda: "new") == "new"
+            assert saved == ["old", "new"]
+        finally:
+            service.stop()
+
+    def test_save_now_drops_pending(self):
+        """Test that an explicit save replaces the pending autosave."""
+        saved = []
+        service = AutosaveService(saved.append, delay=60)
+        service.mark_dirty("a", lambda: "pending")
+        service.save_now("a", lambda: "explicit")
+        service.stop()
+
+        assert saved == ["explicit"]
+
+    def test_save_errors_do_not_kill_worker(self):
+        """Test that a failing save doesn't stop later saves."""
+        saved = []
+
+        def save(data):
+            if data == "bad":
+                raise OSError("disk full")
+            saved.append(data)
+
+        service = AutosaveService(save, delay=0.05)
+        try:
+            service.mark_dirty("a", lambda: "bad")
+            time.sleep(0.2)
+            service.mark_dirty("a", lambda: "good")
+            time.sleep(0.2)
+            assert saved == ["good"]
+        finally:
+            service.stop()
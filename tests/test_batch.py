@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+
+"""
+Tests for the headless batch runner.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui import launcher
+from mychatui.batch import (
+    completed_keys,
+    read_prompts,
+    resolve_models,
+    run_batch,
+)
+
+CONFIG = {
+    "model": "ollama:llama3.2",
+    "user_models": [
+        {"display_name": "Llama", "full_name": "ollama:llama3.2"},
+        {"display_name": "Gemini", "full_name": "google:gemini-2.0-flash"},
+    ],
+}
+
+
+class FakeAdapter:
+    """Echoes the prompt back, failing on request, and tracks concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+
+    def completion(self, model, messages):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append((model, messages[-1]["content"]))
+        try:
+            time.sleep(self.delay)
+            if messages[-1]["content"] == "fail":
+                raise RuntimeError("model exploded")
+            return {
+                "role": "assistant",
+                "content": f"{model}: {messages[-1]['content']}",
+                "usage": {"prompt_tokens": 3, "completion_tokens": 5, "total_tokens": 8},
+            }
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def write_prompts(path, prompts):
+    path.write_text("".join(json.dumps(p) + "\n" for p in prompts))
+
+
+def read_results(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestBatch:
+    """Tests for running prompt files."""
+
+    def test_resolve_models(self):
+        assert resolve_models(CONFIG, None) == ["ollama:llama3.2"]
+        assert resolve_models(CONFIG, ["Gemini", "ollama:llama3.2"]) == [
+            "google:gemini-2.0-flash",
+            "ollama:llama3.2",
+        ]
+        assert len(resolve_models(CONFIG, ["all"])) == 2
+        with pytest.raises(ValueError):
+            resolve_models(CONFIG, ["gpt-9"])
+
+    def test_runs_all_pairs_with_bounded_concurrency(self, tmp_path):
+        prompts = tmp_path / "prompts.jsonl"
+        write_prompts(
+            prompts,
+            [{"id": str(i), "prompt": f"question {i}"} for i in range(6)]
+            + [{"messages": [{"role": "user", "content": "no id"}]}],
+        )
+        output = tmp_path / "results.jsonl"
+        adapter = FakeAdapter()
+
+        stats = run_batch(
+            read_prompts(str(prompts)),
+            ["a", "b"],
+            str(output),
+            adapter,
+            concurrency=3,
+        )
+
+        results = read_results(output)
+        assert stats == {"completed": 14, "failed": 0, "skipped": 0}
+        assert len(results) == 14
+        assert 1 < adapter.max_active <= 3
+        by_key = {(r["id"], r["model"]): r for r in results}
+        assert by_key[("3", "b")]["content"] == "b: question 3"
+        assert by_key[("line-7", "a")]["content"] == "a: no id"
+        assert by_key[("0", "a")]["usage"]["total_tokens"] == 8
+        assert by_key[("0", "a")]["latency_s"] >= 0.05
+
+    def test_results_are_written_as_they_finish(self, tmp_path):
+        """A small job streams its results instead of writing them at the end."""
+        prompts = tmp_path / "prompts.jsonl"
+        write_prompts(
+            prompts, [{"id": "fast", "prompt": "fast"}, {"id": "slow", "prompt": "slow"}]
+        )
+        output = tmp_path / "results.jsonl"
+        adapter = FakeAdapter(delay=0)
+        original = adapter.completion
+        seen = []
+
+        def completion(model, messages):
+            if messages[-1]["content"] == "slow":
+                deadline = time.monotonic() + 2
+                while '"fast"' not in output.read_text():
+                    if time.monotonic() > deadline:
+                        break
+                    time.sleep(0.01)
+                seen.append('"fast"' in output.read_text())
+            return original(model, messages)
+
+        adapter.completion = completion
+        run_batch(read_prompts(str(prompts)), ["a"], str(output), adapter)
+
+        assert seen == [True]
+        assert [r["id"] for r in read_results(output)] == ["fast", "slow"]
+
+    def test_system_message(self, tmp_path):
+        prompts = tmp_path / "prompts.jsonl"
+        write_prompts(prompts, [{"id": "s", "system": "Be brief.", "prompt": "hi"}])
+        adapter = FakeAdapter(delay=0)
+        captured = []
+        original = adapter.completion
+        adapter.completion = lambda model, messages: (
+            captured.append(messages) or original(model, messages)
+        )
+
+        run_batch(read_prompts(str(prompts)), ["a"], str(tmp_path / "out.jsonl"), adapter)
+
+        assert captured[0] == [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "hi"},
+        ]
+
+    def test_resume_skips_completed(self, tmp_path):
+        prompts = tmp_path / "prompts.jsonl"
+        write_prompts(
+            prompts,
+            [
+                {"id": "1", "prompt": "one"},
+                {"id": "2", "prompt": "fail"},
+                {"id": "3", "prompt": "three"},
+            ],
+        )
+        output = tmp_path / "results.jsonl"
+        # A previous run finished "1" and crashed mid-way through writing a line.
+        output.write_text(
+            json.dumps({"id": "1", "model": "a", "content": "old", "error": None})
+            + '\n{"id": "3", "mod'
+        )
+        adapter = FakeAdapter(delay=0)
+
+        stats = run_batch(read_prompts(str(prompts)), ["a"], str(output), adapter)
+
+        assert stats == {"completed": 1, "failed": 1, "skipped": 1}
+        assert sorted(prompt for _, prompt in adapter.calls) == ["fail", "three"]
+        # Failures are retried next time; successes are not
+        assert completed_keys(str(output)) == {("1", "a"), ("3", "a")}
+        lines = output.read_text().splitlines()
+        assert [json.loads(line)["id"] for line in lines[2:]] in (["2", "3"], ["3", "2"])
+
+
+class TestBatchSubcommand:
+    """Tests for dispatching ``mychatui batch`` from the launcher."""
+
+    def test_launcher_dispatches_batch(self):
+        with patch("mychatui.batch.main", return_value=0) as batch_main:
+            assert launcher.main(["batch", "in.jsonl", "-o", "out.jsonl"]) == 0
+        batch_main.assert_called_once_with(["in.jsonl", "-o", "out.jsonl"])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+"""
+Tests for retrieval-based context selection.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("numpy")
+
+from mychatui.context_index import (
+    ContextIndexer,
+    TabContextIndex,
+    estimate_tokens,
+    select_context,
+)
+
+TOPICS = [
+    "How do I bake sourdough bread with a starter?",
+    "What is the capital city of Australia?",
+    "Explain how a python generator yields values lazily",
+    "Recommend hiking trails near the Rocky Mountains",
+    "Why does my espresso taste sour and thin?",
+]
+
+
+def conversation(turns):
+    history = []
+    for question in turns:
+        history.append({"role": "user", "content": f"<p>🧑 You: {question}</p>"})
+        history.append({"role": "assistant", "content": f"<p>Answer about {question}</p>"})
+    return history
+
+
+class TestTabContextIndex:
+    """Tests for the hashed TF-IDF index."""
+
+    def test_search_finds_relevant_message(self):
+        history = conversation(TOPICS)
+        index = TabContextIndex(history)
+        index.sync()
+
+        best = index.search("any tips for sourdough starter feeding?", len(history), 1)
+
+        assert index.count == len(history)
+        assert best[0] in (0, 1)
+
+    def test_search_only_looks_below_candidates(self):
+        history = conversation(TOPICS)
+        index = TabContextIndex(history)
+        index.sync()
+
+        assert all(p < 4 for p in index.search("espresso sour", 4, 3))
+
+    def test_sync_is_incremental(self):
+        history = conversation(TOPICS[:2])
+        index = TabContextIndex(history)
+        index.sync()
+        history.extend(conversation(TOPICS[2:3]))
+        index.sync()
+
+        assert index.count == 6
+        assert index.search("python generator", 6, 1)[0] in (4, 5)
+
+    def test_sync_stops_at_partial_reply(self):
+        history = conversation(TOPICS[:1])
+        history.append({"role": "assistant", "content": "", "partial": True})
+        index = TabContextIndex(history)
+        index.sync()
+
+        assert index.count == 2
+
+    def test_indexer_runs_in_background(self):
+        history = conversation(TOPICS)
+        index = TabContextIndex(history)
+        indexer = ContextIndexer()
+        try:
+            indexer.submit(index)
+            indexer.submit(index)
+            indexer.join()
+        finally:
+            indexer.stop()
+
+        assert index.count == len(history)
+
+
+class TestSelectContext:
+    """Tests for choosing what to send within the token budget."""
+
+    def test_small_history_sent_whole(self):
+        history = conversation(TOPICS[:2])
+        assert select_context(history, None, token_budget=10_000) is history
+
+    def test_recent_window_plus_relevant_turn(self):
+        filler = [f"unrelated small talk number {i} " * 8 for i in range(20)]
+        history = conversation(TOPICS[:1] + filler)
+        history.append(
+            {"role": "user", "content": "<p>🧑 You: back to the sourdough starter</p>"}
+        )
+        index = TabContextIndex(history)
+        index.sync()
+        budget = sum(estimate_tokens(m) for m in history[-4:]) + 100
+
+        selected = select_context(
+            history, index, token_budget=budget, recent_messages=4, top_k=1
+        )
+
+        # The sourdough question and its answer, then the recent window
+        assert selected[:2] == history[:2]
+        assert selected[2:] == history[-4:]
+        assert sum(estimate_tokens(m) for m in selected) <= budget
+
+    def test_stale_index_is_ignored(self):
+        history = conversation(TOPICS * 10)
+        index = TabContextIndex(list(history))
+        index.sync()
+
+        selected = select_context(history, index, token_budget=200, recent_messages=4)
+
+        assert selected == history[-len(selected) :]
+        assert len(selected) <= 4
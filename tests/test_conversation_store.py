@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+"""
+Tests for the SQLite conversation store.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.conversation_store import ConversationStore, fts_query, html_to_text
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ConversationStore(str(tmp_path / "conversations.db"))
+    yield store
+    store.close()
+
+
+HISTORY = [
+    {"role": "user", "content": "<p>🧑 You: Why is the sky blue?</p>"},
+    {"role": "assistant", "content": "🤖 AI: <p>Rayleigh <strong>scattering</strong>.</p>"},
+]
+
+
+class TestHelpers:
+    """Tests for the text helpers."""
+
+    def test_html_to_text_strips_markup(self):
+        """Test that message markup is removed before indexing."""
+        assert html_to_text(HISTORY[1]["content"]) == "🤖 AI: Rayleigh scattering."
+
+    def test_fts_query_quotes_terms(self):
+        """Test that user input can't inject FTS syntax."""
+        assert fts_query('sky "blue" OR') == '"sky" """blue""" "OR"*'
+        assert fts_query("   ") == ""
+
+
+class TestConversationStore:
+    """Tests for ConversationStore."""
+
+    def test_uses_wal_journal(self, store):
+        """Test that the database is opened in WAL mode."""
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_save_and_load_round_trip(self, store):
+        """Test that a saved tab loads back unchanged."""
+        store.save_tab("Sky", "google:gemini", HISTORY)
+
+        assert store.load_tab("Sky") == {
+            "tab_name": "Sky",
+            "model_name": "google:gemini",
+            "chat_history": HISTORY,
+        }
+        assert store.load_tab("Missing") is None
+
+    def test_save_appends_and_replaces(self, store):
+        """Test that growing histories append and rewritten ones replace."""
+        store.save_tab("Sky", "m", HISTORY[:1])
+        store.save_tab("Sky", "m", HISTORY)
+        assert store.load_tab("Sky")["chat_history"] == HISTORY
+
+        rewritten = [{"role": "user", "content": "<p>🧑 You: Something else</p>"}]
+        store.save_tab("Sky", "m", rewritten)
+        assert store.load_tab("Sky")["chat_history"] == rewritten
+        assert store.search("Rayleigh") == []
+
+    def test_search_finds_raw_text(self, store):
+        """Test full-text search across tabs."""
+        store.save_tab("Sky", "m", HISTORY)
+        store.save_tab("Other", "m", [{"role": "user", "content": "<p>scatter plots</p>"}])
+
+        hits = store.search("scattering")
+        assert [(h["tab_name"], h["position"], h["role"]) for h in hits] == [
+            ("Sky", 1, "assistant")
+        ]
+        assert "[scattering]" in hits[0]["snippet"]
+
+        # Prefix matching on the last term
+        assert {h["tab_name"] for h in store.search("scat")} == {"Sky", "Other"}
+        # Markup is not indexed
+        assert store.search("strong") == []
+
+    def test_delete_tab_removes_from_index(self, store):
+        """Test that deleting a tab removes its messages from search."""
+        store.save_tab("Sky", "m", HISTORY)
+        store.delete_tab("Sky")
+
+        assert store.list_tabs() == []
+        assert store.search("Rayleigh") == []
+
+    def test_import_json_dir(self, store, tmp_path):
+        """Test importing existing <tab>.json save files."""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        (config_dir / "config.json").write_text(json.dumps({"active_tabs": ["Sky"]}))
+        (config_dir / "Sky.json").write_text(
+            json.dumps({"tab_name": "Sky", "model_name": "m", "chat_history": HISTORY})
+        )
+        (config_dir / "broken.json").write_text("{not json")
+
+        assert store.import_json_dir(str(config_dir)) == 1
+        assert store.list_tabs() == ["Sky"]
+        assert store.search("Rayleigh")[0]["tab_name"] == "Sky"
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+
+"""
+End-to-end tests for the local caching gateway against a mock upstream.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui import gateway as gateway_module
+from mychatui.gateway import (
+    Gateway,
+    GatewayServer,
+    ResponseCache,
+    TokenBucket,
+    points_at_self,
+)
+
+
+class MockUpstream(BaseHTTPRequestHandler):
+    """OpenAI-style upstream that echoes the last message and counts requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(
+                {
+                    "path": self.path,
+                    "auth": self.headers.get("Authorization"),
+                    "client_port": self.client_address[1],
+                }
+            )
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        content = body["messages"][-1]["content"]
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for word in content.split():
+                if content.startswith("slow"):
+                    time.sleep(0.05)
+                event = f"data: {json.dumps({'delta': word})}\n\n".encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        reply = json.dumps(
+            {"choices": [{"message": {"role": "assistant", "content": content}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+
+def serve(server):
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockUpstream)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    serve(server)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def start_gateway(upstream, **kwargs):
+    gateway = Gateway(
+        f"http://127.0.0.1:{upstream.server_port}/v1", api_key="secret", **kwargs
+    )
+    return serve(GatewayServer(("127.0.0.1", 0), gateway))
+
+
+@pytest.fixture
+def gateway(upstream):
+    server = start_gateway(upstream, pool_size=2)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, content, stream=False, headers=None, temperature=0):
+    body = {"model": "gpt-test", "messages": [{"role": "user", "content": content}]}
+    if temperature is not None:
+        body["temperature"] = temperature
+    if stream:
+        body["stream"] = True
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port}/v1/chat/completions",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.headers.get("X-Cache"), response.read()
+
+
+def metrics(server):
+    url = f"http://127.0.0.1:{server.server_port}/metrics"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        text = response.read().decode()
+    return {
+        line.split()[0]: float(line.split()[1])
+        for line in text.splitlines()
+        if "{" not in line
+    }
+
+
+class TestGateway:
+    """Tests for proxying, caching, rate limiting and metrics."""
+
+    def test_identical_requests_are_cached(self, gateway, upstream):
+        first = post(gateway, "hello")
+        second = post(gateway, "hello")
+        third = post(gateway, "different")
+
+        assert first[0] == "MISS" and second[0] == "HIT" and third[0] == "MISS"
+        assert first[1] == second[1]
+        assert json.loads(first[1])["choices"][0]["message"]["content"] == "hello"
+        assert len(upstream.requests) == 2
+        assert upstream.requests[0]["path"] == "/v1/chat/completions"
+        assert upstream.requests[0]["auth"] == "Bearer secret"
+
+        counts = metrics(gateway)
+        assert counts["mychatui_gateway_requests_total"] == 3
+        assert counts["mychatui_gateway_cache_hits_total"] == 1
+        assert counts["mychatui_gateway_cache_misses_total"] == 2
+
+    def test_no_cache_header_bypasses_cache(self, gateway, upstream):
+        post(gateway, "hello")
+        cache, _ = post(gateway, "hello", headers={"Cache-Control": "no-cache"})
+
+        assert cache == "MISS"
+        assert len(upstream.requests) == 2
+
+    def test_sampled_requests_are_not_cached(self, gateway, upstream):
+        first = post(gateway, "hello", temperature=None)
+        second = post(gateway, "hello", temperature=0.7)
+
+        assert first[0] == "BYPASS" and second[0] == "BYPASS"
+        assert len(upstream.requests) == 2
+
+    def test_cache_is_per_api_key(self, gateway, upstream):
+        post(gateway, "hello", headers={"Authorization": "Bearer alice"})
+        cache, _ = post(gateway, "hello", headers={"Authorization": "Bearer bob"})
+
+        assert cache == "MISS"
+        assert [r["auth"] for r in upstream.requests] == ["Bearer alice", "Bearer bob"]
+
+    def test_half_read_stream_is_not_reused(self, gateway, upstream):
+        words = " ".join(["slow"] * 40)
+        request = json.dumps(
+            {"model": "gpt-test", "stream": True,
+             "messages": [{"role": "user", "content": words}]}
+        ).encode()
+        client = socket.create_connection(("127.0.0.1", gateway.server_port))
+        client.sendall(
+            b"POST /v1/chat/completions HTTP/1.1\r\nHost: test\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Content-Length: %d\r\n\r\n%s" % (len(request), request)
+        )
+        client.recv(100)
+        client.close()
+        time.sleep(2.5)
+
+        _, body = post(gateway, "after")
+        time.sleep(0.2)
+        assert json.loads(body)["choices"][0]["message"]["content"] == "after"
+        # Sent once, on a fresh connection rather than behind the old stream.
+        assert len(upstream.requests) == 2
+        assert metrics(gateway)[
+            "mychatui_gateway_upstream_connections_opened_total"
+        ] == 2
+
+    def test_client_authorization_is_forwarded(self, gateway, upstream):
+        post(gateway, "hello", headers={"Authorization": "Bearer client"})
+        assert upstream.requests[0]["auth"] == "Bearer client"
+
+    def test_upstream_connections_are_pooled(self, gateway, upstream):
+        for i in range(5):
+            post(gateway, f"message {i}")
+
+        assert len(upstream.requests) == 5
+        assert len({r["client_port"] for r in upstream.requests}) == 1
+        assert metrics(gateway)[
+            "mychatui_gateway_upstream_connections_opened_total"
+        ] == 1
+
+    def test_streaming_is_relayed_and_not_cached(self, gateway, upstream):
+        first = post(gateway, "one two three", stream=True)
+        second = post(gateway, "one two three", stream=True)
+
+        assert first[0] is None
+        events = [line for line in first[1].decode().splitlines() if line]
+        assert [json.loads(e[len("data: ") :])["delta"] for e in events] == [
+            "one",
+            "two",
+            "three",
+        ]
+        assert second[1] == first[1]
+        assert len(upstream.requests) == 2
+
+    def test_shared_rate_limit(self, upstream):
+        server = start_gateway(upstream, rate=0.01, burst=2, max_wait=0)
+        try:
+            post(server, "a")
+            post(server, "b")
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                post(server, "c")
+            assert excinfo.value.code == 429
+            # Cached answers don't use up the rate limit
+            assert post(server, "a")[0] == "HIT"
+            assert metrics(server)["mychatui_gateway_rate_limited_total"] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_upstream_down(self):
+        gateway = Gateway("http://127.0.0.1:1/v1")
+        server = serve(GatewayServer(("127.0.0.1", 0), gateway))
+        try:
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                post(server, "hello")
+            assert excinfo.value.code == 502
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestGatewayParts:
+    """Tests for the cache and rate limiter on their own."""
+
+    def test_cache_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", 200, [], b"a")
+        cache.put("b", 200, [], b"b")
+        cache.get("a")
+        cache.put("c", 200, [], b"c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == (200, [], b"a")
+
+    def test_cache_ttl(self):
+        cache = ResponseCache(ttl=-1)
+        cache.put("a", 200, [], b"a")
+        assert cache.get("a") is None
+
+    def test_token_bucket_waits(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        assert bucket.acquire()
+        assert not bucket.acquire(max_wait=0)
+        assert bucket.acquire(max_wait=1)
+
+
+class TestUpstream:
+    """Tests for choosing the upstream."""
+
+    def test_ignores_openai_api_url(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_URL", "http://127.0.0.1:8765/v1")
+        monkeypatch.delenv("MYCHATUI_GATEWAY_UPSTREAM", raising=False)
+        args = gateway_module.build_parser().parse_args([])
+        assert args.upstream == "https://api.openai.com/v1"
+
+        monkeypatch.setenv("MYCHATUI_GATEWAY_UPSTREAM", "http://proxy:9000/v1")
+        assert gateway_module.build_parser().parse_args([]).upstream == (
+            "http://proxy:9000/v1"
+        )
+
+    def test_refuses_own_address(self):
+        assert points_at_self("http://127.0.0.1:8765/v1", "127.0.0.1", 8765)
+        assert points_at_self("http://localhost:8765/v1", "0.0.0.0", 8765)
+        assert not points_at_self("http://127.0.0.1:8766/v1", "127.0.0.1", 8765)
+        assert not points_at_self("https://api.openai.com/v1", "127.0.0.1", 443)
+        with pytest.raises(SystemExit):
+            gateway_module.main(["--upstream", "http://localhost:8765/v1"])
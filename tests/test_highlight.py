@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Tests for cached syntax highlighting of fenced code blocks.
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("pygments")
+
+from mychatui.highlight import (
+    MISSING,
+    CodeHighlighter,
+    fence_language,
+    lexer_for,
+    parse_tag,
+    tag_name,
+)
+
+CODE = "def f(x):\n    return x + 1  # add\n"
+
+
+class TestHighlightHelpers:
+    def test_fence_language(self):
+        assert fence_language("Python title=x") == "python"
+        assert fence_language("  ") == ""
+
+    def test_lexers_are_cached_by_language(self):
+        assert lexer_for("python") is lexer_for("python")
+        assert lexer_for("no-such-language") is None
+
+    def test_tag_names_round_trip(self):
+        assert parse_tag(tag_name("268bd2", True, False)) == ("#268bd2", True, False)
+        assert parse_tag(tag_name("859900", False, True)) == ("#859900", False, True)
+
+
+class TestCodeHighlighter:
+    def setup_method(self):
+        self.highlighter = CodeHighlighter()
+
+    def test_runs_cover_the_code_exactly(self):
+        runs = self.highlighter.runs(CODE, "python", "solarized-dark")
+        assert "".join(text for text, _ in runs) == CODE
+        assert any(tag is not None for _, tag in runs)
+        for _, tag in runs:
+            if tag is not None:
+                assert parse_tag(tag)[0].startswith("#")
+
+    def test_unknown_language_or_theme(self):
+        assert self.highlighter.runs(CODE, "no-such-language", "solarized-dark") is None
+        assert self.highlighter.runs(CODE, "python", "no-such-theme") is None
+        assert self.highlighter.html(CODE, "", "solarized-dark") is None
+
+    def test_results_are_memoized(self):
+        """The same block is never lexed twice for a theme."""
+        lexer = lexer_for("python")
+        with patch.object(lexer, "get_tokens", wraps=lexer.get_tokens) as get_tokens:
+            first = self.highlighter.runs(CODE, "python", "solarized-dark")
+            assert self.highlighter.runs(CODE, "python", "solarized-dark") is first
+            assert get_tokens.call_count == 1
+            self.highlighter.runs(CODE, "python", "solarized-light")
+            assert get_tokens.call_count == 2
+
+    def test_cached_html_only_reports_hits(self):
+        assert self.highlighter.cached_html(CODE, "python", "solarized-dark") is MISSING
+        html = self.highlighter.html(CODE, "python", "solarized-dark")
+        assert '<span style="color:' in html
+        assert self.highlighter.cached_html(CODE, "python", "solarized-dark") == html
+
+    def test_cache_is_bounded(self):
+        highlighter = CodeHighlighter(cache_size=2)
+        for n in range(3):
+            highlighter.html(f"x = {n}\n", "python", "solarized-dark")
+        assert highlighter.cached_html("x = 0\n", "python", "solarized-dark") is MISSING
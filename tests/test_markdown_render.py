@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+"""
+Tests for palette-styled markdown rendering.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("markdown_it")
+
+from mychatui.markdown_render import MarkdownRenderer, style_html
+from mychatui.palette import DEFAULT_PALETTE, Palette
+
+
+class TestPalette:
+    def test_css_matches_the_old_style_map(self):
+        assert DEFAULT_PALETTE.css("strong") == "color: #c09900; font-weight: bold;"
+        assert DEFAULT_PALETTE.css("em") == "color: #2384c8; font-style: italic;"
+        assert (
+            DEFAULT_PALETTE.css("s")
+            == "color: #a6451c; text-decoration: line-through;"
+        )
+
+    def test_from_config_ignores_unknown_keys(self):
+        palette = Palette.from_config({"gold": "#ffd700", "nope": "x"})
+        assert palette.gold == "#ffd700"
+        assert palette.red == DEFAULT_PALETTE.red
+        assert Palette.from_config(None) == DEFAULT_PALETTE
+
+
+class TestMarkdownRenderer:
+    def setup_method(self):
+        self.renderer = MarkdownRenderer()
+
+    def test_unstyled_render_is_plain_markdown_it(self):
+        assert self.renderer.render("**b**") == "<p><strong>b</strong></p>\n"
+
+    def test_styles_are_emitted_inline(self):
+        html = self.renderer.render("# T\n\n**b** *e* `c`", DEFAULT_PALETTE)
+        assert f'<h1 style="{DEFAULT_PALETTE.css("h1")}">T</h1>' in html
+        assert f'<strong style="{DEFAULT_PALETTE.css("strong")}">b</strong>' in html
+        assert f'<em style="{DEFAULT_PALETTE.css("em")}">e</em>' in html
+        assert f'<code style="{DEFAULT_PALETTE.css("code")}">c</code>' in html
+
+    def test_fenced_code_is_styled_and_escaped(self):
+        html = self.renderer.render("```py\nx < y\n```", DEFAULT_PALETTE)
+        assert "x &lt; y" in html
+        assert f'<code style="{DEFAULT_PALETTE.css("code")}" class="language-py">' in html
+
+    def test_raw_html_is_styled(self):
+        html = self.renderer.render("a <b>raw</b>", DEFAULT_PALETTE)
+        assert f'<b style="{DEFAULT_PALETTE.css("b")}">raw</b>' in html
+
+    def test_palette_change_reuses_tokens(self):
+        """A theme change re-renders from the cached tokens."""
+        tokens = self.renderer.parse("**x**")
+        dark_red = Palette(gold="#880000")
+        html = self.renderer.render("**x**", dark_red)
+        assert self.renderer.parse("**x**") is tokens
+        assert "#880000" in html
+
+    def test_cache_is_bounded(self):
+        renderer = MarkdownRenderer(cache_size=2)
+        first = renderer.parse("one")
+        renderer.parse("two")
+        renderer.parse("three")
+        assert renderer.parse("one") is not first
+
+    def test_render_history(self):
+        history = [
+            {"role": "user", "content": "<p>🧑 You: hi <b>x</b></p>", "text": "hi <b>x</b>"},
+            {"role": "assistant", "content": "", "markdown": "**ok**"},
+        ]
+        html = self.renderer.render_history(history, DEFAULT_PALETTE, dark=True)
+        assert html.startswith('<div style="color: white;">')
+        assert f'<b style="{DEFAULT_PALETTE.css("b")}">x</b>' in html
+        assert "🤖 AI: <p><strong style=" in html
+
+
+class TestStyleHtml:
+    def test_existing_style_is_extended(self):
+        html = style_html('<strong style="x: y;">a</strong>', DEFAULT_PALETTE)
+        assert html == f'<strong style="x: y; {DEFAULT_PALETTE.css("strong")}">a</strong>'
+
+    def test_other_tags_are_untouched(self):
+        html = '<p>a<br/><span>b</span><body>c</body></p>'
+        assert style_html(html, DEFAULT_PALETTE) == html
+
+    def test_no_palette(self):
+        assert style_html("<b>a</b>", None) == "<b>a</b>"
+
+
+class TestFenceHighlighting:
+    def setup_method(self):
+        pytest.importorskip("pygments")
+        self.renderer = MarkdownRenderer()
+        self.text = "```python\nx = 1  # one\n```\n"
+
+    def test_misses_are_rendered_plain_and_reported(self):
+        # Highlights are shared process-wide, so use code no other test renders.
+        text = "```python\nmissed = 2\n```\n```\nno language\n```\n"
+        misses = []
+        html = self.renderer.render(text, DEFAULT_PALETTE, "solarized-dark", misses)
+        assert "<span" not in html
+        assert misses == [("missed = 2\n", "python")]
+
+    def test_highlighted_when_computed(self):
+        html = self.renderer.render(self.text, DEFAULT_PALETTE, "solarized-dark")
+        assert '<span style="color:' in html
+        misses = []
+        again = self.renderer.render(self.text, DEFAULT_PALETTE, "solarized-dark", misses)
+        assert again == html
+        assert misses == []
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""
+Tests for the "auto" model router.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.model_router import LatencyTracker, ModelRouter, has_code
+
+CONFIG = {
+    "fast": "ollama:small",
+    "primary": "openai:big",
+    "fallback": "anthropic:backup",
+    "short_prompt_chars": 40,
+    "slo_seconds": 5,
+    "min_samples": 3,
+}
+
+
+class TestRules:
+    def setup_method(self):
+        self.router = ModelRouter(CONFIG)
+
+    def test_short_prompt_goes_to_fast_model(self):
+        assert self.router.route("capital of France?").model == "ollama:small"
+
+    def test_long_prompt_goes_to_primary(self):
+        route = self.router.route("explain " * 20)
+        assert route.model == "openai:big"
+        assert route.reason == "long prompt"
+
+    def test_code_goes_to_primary(self):
+        assert self.router.route("fix `x = y +`").model == "openai:big"
+        assert has_code("def f():\n    return 1")
+        assert has_code("int main() {")
+        assert not has_code("what is a closure?")
+
+    def test_default_model_is_primary(self):
+        router = ModelRouter(None, default_model="openai:default")
+        assert router.route("hi").model == "openai:default"
+        assert router.models() == ["openai:default"]
+
+    def test_no_model_configured(self):
+        with pytest.raises(ValueError):
+            ModelRouter().route("hi")
+
+
+class TestLatencyFallback:
+    def setup_method(self):
+        self.router = ModelRouter(CONFIG)
+
+    def record(self, model, latency, ok=True, times=3):
+        for _ in range(times):
+            self.router.tracker.record(model, latency, ok)
+
+    def test_slow_primary_falls_back(self):
+        self.record("openai:big", 9.0)
+        route = self.router.route("explain " * 20)
+        assert route.model == "anthropic:backup"
+        assert "p95 9.0s over 5s SLO" in route.reason
+
+    def test_too_few_samples_are_ignored(self):
+        self.record("openai:big", 9.0, times=2)
+        assert self.router.route("explain " * 20).model == "openai:big"
+
+    def test_failing_fast_model_moves_to_primary(self):
+        self.record("ollama:small", 0.1, ok=False)
+        assert self.router.route("hi").model == "openai:big"
+
+    def test_recovers_as_window_rolls(self):
+        router = ModelRouter(dict(CONFIG, window=3))
+        for latency in (9.0, 9.0, 9.0, 1.0, 1.0, 1.0):
+            router.tracker.record("openai:big", latency)
+        assert router.route("explain " * 20).model == "openai:big"
+
+    def test_all_degraded_keeps_first_choice(self):
+        self.record("openai:big", 9.0)
+        self.record("anthropic:backup", 9.0)
+        route = self.router.route("explain " * 20)
+        assert route.model == "openai:big"
+        assert "all candidates degraded" in route.reason
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRecovery:
+    def setup_method(self):
+        self.clock = Clock()
+        self.router = ModelRouter(
+            dict(CONFIG, max_age_seconds=300, probe_seconds=30), clock=self.clock
+        )
+        for _ in range(3):
+            self.router.record("openai:big", 9.0)
+
+    def route(self):
+        return self.router.route("explain " * 20)
+
+    def test_old_samples_expire(self):
+        self.clock.now += 301
+        assert self.route().model == "openai:big"
+
+    def test_degraded_model_is_probed_and_recovers(self):
+        assert self.route().model == "anthropic:backup"
+        self.clock.now += 31
+        route = self.route()
+        assert route.model == "openai:big"
+        assert "probing openai:big" in route.reason
+        # One probe at a time; other messages keep using the fallback.
+        assert self.route().model == "anthropic:backup"
+
+        self.router.record("openai:big", 2.0)
+        assert self.route().model == "openai:big"
+
+    def test_failed_probe_stays_degraded(self):
+        self.clock.now += 31
+        assert self.route().model == "openai:big"
+        self.router.record("openai:big", 9.0)
+        assert self.route().model == "anthropic:backup"
+
+    def test_slo_uses_time_to_first_token(self):
+        router = ModelRouter(CONFIG)
+        for _ in range(3):
+            router.record("openai:big", 30.0, first_token=0.5)
+        assert router.route("explain " * 20).model == "openai:big"
+
+
+class TestLatencyTracker:
+    def test_p95_and_error_rate(self):
+        tracker = LatencyTracker(window=10)
+        for latency in range(1, 11):
+            tracker.record("m", float(latency))
+        tracker.record("m", 100.0, ok=False)
+        assert tracker.samples("m") == 10
+        assert tracker.p95("m") == 10.0
+        assert tracker.error_rate("m") == pytest.approx(0.1)
+        assert tracker.p95("other") is None
+        assert tracker.error_rate("other") == 0.0
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+"""
+Tests for the native Ollama adapter against a local stub server.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.adapters.ollama import OllamaAdapter, ollama_base_url
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Speaks enough of the Ollama API: preload via /api/generate, /api/chat."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, payload))
+        if payload["model"] == "missing":
+            body = json.dumps({"error": "model 'missing' not found"}).encode()
+            self.send_response(404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        if self.path == "/api/generate":
+            time.sleep(self.server.load_delay)
+            self.wfile.write(
+                json.dumps({"model": payload["model"], "done": True}).encode() + b"\n"
+            )
+            return
+        last = payload["messages"][-1]["content"]
+        for word in ["You", " said", f" {last}"]:
+            chunk = {"message": {"role": "assistant", "content": word}, "done": False}
+            self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            self.wfile.flush()
+        final = {"done": True, "prompt_eval_count": 7, "eval_count": 3}
+        self.wfile.write(json.dumps(final).encode() + b"\n")
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    server.daemon_threads = True
+    server.requests = []
+    server.load_delay = 0
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def adapter(stub):
+    return OllamaAdapter(f"http://127.0.0.1:{stub.server_port}", keep_alive="45m")
+
+
+class TestOllamaAdapter:
+    """Tests for preloading and streaming chat."""
+
+    def test_local_model_names(self):
+        assert OllamaAdapter.is_local_model("ollama:llama3.2:1b")
+        assert not OllamaAdapter.is_local_model("google:models/gemini-2.0-flash")
+        assert not OllamaAdapter.is_local_model(None)
+        assert OllamaAdapter.model_name("ollama:llama3.2:1b") == "llama3.2:1b"
+
+    def test_base_url(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_HOST", "10.0.0.2:11434")
+        assert ollama_base_url() == "http://10.0.0.2:11434"
+        assert ollama_base_url("http://box:1/") == "http://box:1"
+
+    def test_streaming_completion(self, adapter, stub):
+        tokens = []
+        response = adapter.completion(
+            "ollama:llama3.2",
+            [{"role": "user", "content": "hi", "html": "<p>hi</p>"}],
+            on_token=tokens.append,
+        )
+
+        assert tokens == ["You", " said", " hi"]
+        assert response["content"] == "You said hi"
+        assert response["usage"] == {
+            "prompt_tokens": 7,
+            "completion_tokens": 3,
+            "total_tokens": 10,
+        }
+        path, payload = stub.requests[0]
+        assert path == "/api/chat"
+        assert payload["model"] == "llama3.2"
+        assert payload["stream"] is True
+        assert payload["keep_alive"] == "45m"
+
+    def test_chat_history_keeps_role_and_content(self, adapter):
+        history = [{"role": "user", "content": "hi", "model": "x"}]
+        assert adapter.getChatHistory(history) == [{"role": "user", "content": "hi"}]
+
+    def test_preload_sets_keep_alive(self, adapter, stub):
+        assert adapter.preload("ollama:llama3.2") is True
+        assert stub.requests == [
+            ("/api/generate", {"model": "llama3.2", "keep_alive": "45m"})
+        ]
+
+    def test_preload_async_dedupes(self, adapter, stub):
+        stub.load_delay = 0.2
+        first = adapter.preload_async("ollama:llama3.2")
+        # Still loading, then recently loaded: no more requests either way
+        assert adapter.preload_async("ollama:llama3.2") is None
+        first.join(timeout=5)
+        assert adapter.preload_async("ollama:llama3.2") is None
+        # Non-local models are never preloaded
+        assert adapter.preload_async("google:gemini") is None
+
+        assert len(stub.requests) == 1
+
+    def test_errors(self, adapter):
+        assert adapter.preload("ollama:missing") is False
+        with pytest.raises(RuntimeError, match="not found"):
+            adapter.completion("ollama:missing", [{"role": "user", "content": "hi"}])
+
+    def test_server_down(self):
+        adapter = OllamaAdapter("http://127.0.0.1:1", timeout=1)
+        assert adapter.preload("ollama:llama3.2") is False
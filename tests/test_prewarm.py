@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+"""
+Tests for background connection pre-warming.
+"""
+
+import os
+import socket
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui import prewarm as prewarm_module
+from mychatui.prewarm import model_provider, prewarm, provider_url
+
+
+def listening_socket():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    accepted = []
+
+    def accept():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            accepted.append(conn)
+            conn.close()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return server, accepted
+
+
+class TestPrewarm:
+    """Tests for choosing and warming provider endpoints."""
+
+    def test_model_provider(self):
+        assert model_provider("google:models/gemini-2.0-flash") == "google"
+        assert model_provider("ollama:llama3.2:1b") == "ollama"
+        assert model_provider("models/gemini-1.5-pro") is None
+        assert model_provider(None) is None
+
+    def test_provider_url_overrides(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_URL", "http://127.0.0.1:8765/v1")
+        monkeypatch.delenv("OLLAMA_HOST", raising=False)
+
+        assert provider_url("openai") == "http://127.0.0.1:8765/v1"
+        assert provider_url("ollama", {"ollama": "http://box:11434"}) == "http://box:11434"
+        assert provider_url("ollama", {"ollama": None}) == "http://localhost:11434"
+        assert provider_url("unknown") is None
+
+    def test_each_endpoint_warmed_once(self, monkeypatch):
+        server, accepted = listening_socket()
+        url = f"http://127.0.0.1:{server.getsockname()[1]}"
+        imported = []
+        monkeypatch.setattr(
+            prewarm_module.importlib, "import_module", lambda name: imported.append(name)
+        )
+        try:
+            results = prewarm(
+                ["ollama:a", "ollama:b", None, "plain-model"], {"ollama": url}
+            )
+        finally:
+            server.close()
+
+        assert list(results) == [url]
+        assert results[url] is not None
+        assert imported == ["ollama"]
+
+    def test_offline_skips_remote_hosts(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_URL", raising=False)
+        monkeypatch.setattr(prewarm_module, "is_online", lambda: False)
+
+        def no_network(*args, **kwargs):
+            raise AssertionError("network used while offline")
+
+        monkeypatch.setattr(prewarm_module.socket, "create_connection", no_network)
+        monkeypatch.setattr(prewarm_module.socket, "getaddrinfo", no_network)
+
+        results = prewarm(["openai:gpt-4o", "google:gemini"], import_sdks=False)
+
+        assert results == {
+            "https://api.openai.com": None,
+            "https://generativelanguage.googleapis.com": None,
+        }
+
+    def test_unreachable_endpoint(self):
+        # Bound but not listening: connections are refused, and the port can't
+        # be reused (or self-connected to) while the test runs.
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            port = closed.getsockname()[1]
+            results = prewarm(
+                ["ollama:a"], {"ollama": f"http://127.0.0.1:{port}"}, import_sdks=False
+            )
+
+        assert results == {f"http://127.0.0.1:{port}": None}
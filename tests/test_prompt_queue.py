@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+"""
+Tests for the per-tab prompt queue.
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.prompt_queue import PromptQueue
+
+
+class TestPromptQueue:
+    def setup_method(self):
+        self.queue = PromptQueue()
+
+    def test_idle_tab_sends_at_once(self):
+        assert self.queue.submit("first") == "first"
+        assert self.queue.in_flight
+        assert len(self.queue) == 0
+
+    def test_prompts_wait_for_the_reply_in_order(self):
+        self.queue.submit("first")
+        assert self.queue.submit("second") is None
+        assert self.queue.submit("third") is None
+        assert [p.text for p in self.queue.pending] == ["second", "third"]
+
+        assert self.queue.finish() == "second"
+        assert self.queue.in_flight
+        assert self.queue.finish() == "third"
+        assert self.queue.finish() is None
+        assert not self.queue.in_flight
+        assert self.queue.submit("fourth") == "fourth"
+
+    def test_edit_and_remove_pending(self):
+        self.queue.submit("first")
+        self.queue.submit("second")
+        self.queue.submit("third")
+        second, third = self.queue.pending
+
+        assert self.queue.edit(second.id, "second, edited")
+        assert self.queue.remove(third.id)
+        assert self.queue.finish() == "second, edited"
+        assert not self.queue.edit(second.id, "too late")
+        assert not self.queue.remove(third.id)
+
+    def test_blank_edits_are_skipped(self):
+        self.queue.submit("first")
+        self.queue.submit("second")
+        self.queue.submit("third")
+        self.queue.edit(self.queue.pending[0].id, "  ")
+        assert self.queue.finish() == "third"
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+
+"""
+Tests for the off-Tk-thread render pipeline.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.render_pipeline import RenderPipeline
+from mychatui.ui_events import UiEventBus
+
+
+class FakeTk:
+    """Stands in for ``after``: callbacks queue up until ``pump()`` runs them."""
+
+    def __init__(self):
+        self.calls = queue.Queue()
+        self.delays = []
+        self.thread = threading.current_thread()
+
+    def after(self, delay, func, *args):
+        # Tk may only be used from its own thread.
+        assert threading.current_thread() is self.thread
+        self.delays.append(delay)
+        self.calls.put((func, args))
+
+    def pump(self, timeout=2.0):
+        """Run callbacks until none arrive within ``timeout``."""
+        while True:
+            try:
+                func, args = self.calls.get(timeout=timeout)
+            except queue.Empty:
+                return
+            func(*args)
+            timeout = 0.2
+
+
+class Widget:
+    def __init__(self):
+        self.events = []
+
+    def begin(self):
+        self.events.append("begin")
+
+    def insert(self, fragment):
+        self.events.append(fragment)
+
+    def finish(self):
+        self.events.append("finish")
+
+
+class TestRenderPipeline:
+    def setup_method(self):
+        self.tk = FakeTk()
+        self.pipeline = RenderPipeline(self.tk.after, workers=2)
+
+    def teardown_method(self):
+        self.pipeline.shutdown()
+
+    def test_fragments_are_inserted_in_order(self):
+        widget = Widget()
+        self.pipeline.submit("tab", lambda: ["a", "b", "c"], widget.begin, widget.insert, widget.finish)
+        self.tk.pump()
+        assert widget.events == ["begin", "a", "b", "c", "finish"]
+        assert not self.pipeline.pending("tab")
+
+    def test_prepare_runs_off_the_calling_thread(self):
+        threads = []
+
+        def prepare():
+            threads.append(threading.current_thread())
+            return []
+
+        widget = Widget()
+        self.pipeline.submit("tab", prepare, widget.begin, widget.insert)
+        self.tk.pump()
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_results_are_polled_on_the_tk_thread(self):
+        """Workers hand results over a queue; only the Tk thread calls after()."""
+        gate = threading.Event()
+        widget = Widget()
+
+        def slow():
+            gate.wait(2)
+            return ["a"]
+
+        self.pipeline.submit("tab", slow, widget.begin, widget.insert)
+        func, args = self.tk.calls.get(timeout=1)
+        func(*args)  # nothing prepared yet, so the poll re-arms itself
+        assert widget.events == []
+        gate.set()
+        self.tk.pump()
+        assert widget.events == ["begin", "a"]
+        assert self.tk.delays[:2] == [0, self.pipeline.poll_ms]
+        assert self.tk.calls.empty()
+
+    def test_inserts_are_time_sliced(self):
+        """With no time budget each fragment gets its own slice."""
+        pipeline = RenderPipeline(self.tk.after, workers=0, slice_seconds=0)
+        widget = Widget()
+        pipeline.submit("tab", lambda: ["a", "b", "c"], widget.begin, widget.insert, widget.finish)
+        self.tk.pump()
+        assert widget.events == ["begin", "a", "b", "c", "finish"]
+        assert self.tk.delays == [0, 1, 1]
+
+    def test_results_can_go_through_the_event_bus(self):
+        bus = UiEventBus(self.tk.after)
+        pipeline = RenderPipeline(self.tk.after, workers=2, post=bus.call)
+        widget = Widget()
+        try:
+            pipeline.submit("tab", lambda: ["a", "b"], widget.begin, widget.insert, widget.finish)
+            assert self.tk.calls.empty()  # no poll is armed
+            deadline = time.monotonic() + 2
+            while "finish" not in widget.events and time.monotonic() < deadline:
+                bus.drain()
+                self.tk.pump(timeout=0.05)
+        finally:
+            pipeline.shutdown()
+        assert widget.events == ["begin", "a", "b", "finish"]
+        assert not pipeline.pending("tab")
+
+    def test_newer_render_supersedes_older(self):
+        gate = threading.Event()
+        old, new = Widget(), Widget()
+
+        def slow():
+            gate.wait(2)
+            return ["old"]
+
+        first = self.pipeline.submit("tab", slow, old.begin, old.insert)
+        second = self.pipeline.submit("tab", lambda: ["new"], new.begin, new.insert)
+        gate.set()
+        self.tk.pump()
+
+        assert second == first + 1
+        assert old.events == []
+        assert new.events == ["begin", "new"]
+
+    def test_stale_slices_stop(self):
+        pipeline = RenderPipeline(self.tk.after, workers=0, slice_seconds=0)
+        widget = Widget()
+        pipeline.submit("tab", lambda: ["a", "b", "c"], widget.begin, widget.insert, widget.finish)
+        func, args = self.tk.calls.get()
+        func(*args)  # begin and the first slice
+        pipeline.submit("tab", lambda: [], lambda: None, widget.insert)
+        self.tk.pump()
+        assert widget.events == ["begin", "a"]
+
+    def test_keys_are_independent(self):
+        one, two = Widget(), Widget()
+        self.pipeline.submit("one", lambda: ["1"], one.begin, one.insert)
+        self.pipeline.submit("two", lambda: ["2"], two.begin, two.insert)
+        self.tk.pump()
+        assert one.events == ["begin", "1"]
+        assert two.events == ["begin", "2"]
+
+    def test_forgotten_key_is_dropped(self):
+        widget = Widget()
+        pipeline = RenderPipeline(self.tk.after, workers=0)
+        pipeline.submit("tab", lambda: ["a"], widget.begin, widget.insert)
+        pipeline.forget("tab")
+        self.tk.pump()
+        assert widget.events == []
+
+    def test_prepare_error_clears_pending(self):
+        def fail():
+            raise ValueError("bad markdown")
+
+        pipeline = RenderPipeline(self.tk.after, workers=0)
+        pipeline.submit("tab", fail, lambda: None, lambda f: None)
+        assert not pipeline.pending("tab")
+
+    def test_insert_error_is_contained(self):
+        """A tab closed mid-render doesn't break later renders."""
+
+        def insert(fragment):
+            raise RuntimeError("invalid command name")
+
+        pipeline = RenderPipeline(self.tk.after, workers=0)
+        pipeline.submit("tab", lambda: ["a"], lambda: None, insert)
+        self.tk.pump()
+        assert not pipeline.pending("tab")
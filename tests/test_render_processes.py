@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""
+Tests for rendering large replies in a worker process.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("markdown_it")
+
+from mychatui.markdown_render import shared_renderer
+from mychatui.palette import DEFAULT_PALETTE
+from mychatui.render_processes import ProcessRenderBackend
+from mychatui.text_renderer import markdown_runs
+
+LARGE = "# Big\n\n" + "Some **bold** text and `code`.\n\n" * 20
+
+
+class TestProcessRenderBackend:
+    def test_small_replies_stay_in_process(self):
+        backend = ProcessRenderBackend(threshold=len(LARGE) + 1)
+        assert backend.markdown_runs(LARGE) == markdown_runs(LARGE)
+        assert backend._pool is None
+
+    def test_disabled_with_zero_threshold(self):
+        backend = ProcessRenderBackend(threshold=0)
+        assert backend.start() is None
+        assert backend.markdown_html(LARGE, None) == shared_renderer().render(LARGE)
+
+    def test_large_replies_use_the_pool(self):
+        backend = ProcessRenderBackend(threshold=100)
+        try:
+            runs = backend.markdown_runs(LARGE)
+            html = backend.markdown_html(LARGE, DEFAULT_PALETTE)
+            assert backend._pool is not None
+            assert runs == markdown_runs(LARGE)
+            assert html == shared_renderer().render(LARGE, DEFAULT_PALETTE)
+        finally:
+            backend.shutdown()
+
+    def test_results_are_cached(self):
+        backend = ProcessRenderBackend(threshold=100)
+        try:
+            first = backend.markdown_runs(LARGE)
+            assert backend.markdown_runs(LARGE) is first
+        finally:
+            backend.shutdown()
+
+    def test_broken_pool_falls_back(self):
+        backend = ProcessRenderBackend(threshold=100)
+        backend.start()
+        backend._pool.shutdown()
+        assert backend.markdown_runs(LARGE) == markdown_runs(LARGE)
+        assert backend.start() is None
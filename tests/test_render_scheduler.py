@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+"""
+Tests for the frame-coalescing render scheduler.
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.render_scheduler import RenderScheduler
+
+
+class FakeTk:
+    """Collects ``after``/``after_idle`` callbacks until ``run()`` is called."""
+
+    def __init__(self):
+        self.timers = []
+        self.idle = []
+
+    def after(self, delay, func):
+        self.timers.append((delay, func))
+
+    def after_idle(self, func):
+        self.idle.append(func)
+
+    def run(self):
+        while self.timers or self.idle:
+            if self.idle:
+                self.idle.pop(0)()
+            else:
+                self.timers.pop(0)[1]()
+
+
+class Tab:
+    def __init__(self, name):
+        self.name = name
+
+
+class TestRenderScheduler:
+    def setup_method(self):
+        self.tk = FakeTk()
+        self.rendered = []
+        self.current = None
+        self.scheduler = RenderScheduler(
+            self.tk.after,
+            self.tk.after_idle,
+            self.rendered.append,
+            lambda tab: tab is self.current,
+            frame_seconds=0.05,
+        )
+
+    def test_marks_coalesce_into_one_render(self):
+        tab = self.current = Tab("a")
+        for _ in range(5):
+            self.scheduler.mark_dirty(tab)
+        assert len(self.tk.idle) == 1
+        self.tk.run()
+        assert self.rendered == [tab]
+        assert not self.scheduler.is_dirty(tab)
+
+    def test_flushes_wait_for_the_next_frame(self):
+        tab = self.current = Tab("a")
+        self.scheduler.mark_dirty(tab)
+        self.tk.run()
+        self.scheduler.mark_dirty(tab)
+        # Within the frame the flush goes through a timer first.
+        assert self.tk.idle == []
+        assert len(self.tk.timers) == 1 and self.tk.timers[0][0] > 0
+        self.tk.run()
+        assert self.rendered == [tab, tab]
+
+    def test_next_flush_after_the_frame_is_immediate(self):
+        tab = self.current = Tab("a")
+        self.scheduler.mark_dirty(tab)
+        self.tk.run()
+        time.sleep(0.06)
+        self.scheduler.mark_dirty(tab)
+        assert self.tk.timers == [] and len(self.tk.idle) == 1
+
+    def test_hidden_tabs_wait_until_shown(self):
+        shown, hidden = Tab("shown"), Tab("hidden")
+        self.current = shown
+        self.scheduler.mark_dirty(hidden)
+        self.scheduler.mark_dirty(shown)
+        self.tk.run()
+        assert self.rendered == [shown]
+        assert self.scheduler.is_dirty(hidden)
+
+        self.current = hidden
+        self.scheduler.show(hidden)
+        self.tk.run()
+        assert self.rendered == [shown, hidden]
+
+    def test_showing_a_clean_tab_does_nothing(self):
+        tab = self.current = Tab("a")
+        self.scheduler.show(tab)
+        assert self.tk.idle == [] and self.tk.timers == []
+
+    def test_forget(self):
+        tab = Tab("a")
+        self.scheduler.mark_dirty(tab)
+        self.scheduler.forget(tab)
+        self.current = tab
+        self.scheduler.show(tab)
+        self.tk.run()
+        assert self.rendered == []
+
+    def test_render_errors_do_not_stop_the_flush(self):
+        a, b = Tab("a"), Tab("b")
+        rendered = []
+
+        def render(tab):
+            if tab is a:
+                raise RuntimeError("boom")
+            rendered.append(tab)
+
+        scheduler = RenderScheduler(
+            self.tk.after, self.tk.after_idle, render, lambda tab: True
+        )
+        scheduler.mark_dirty(a)
+        scheduler.mark_dirty(b)
+        self.tk.run()
+        assert rendered == [b]
+        assert not scheduler.is_dirty(a)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""
+Tests for single-instance mode and launch forwarding.
+"""
+
+import os
+import socket
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.launcher import build_parser, launch_message
+from mychatui.single_instance import SingleInstance, forward_to_running_instance
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "mychatui.lock"), str(tmp_path / "mychatui.sock")
+
+
+class TestSingleInstance:
+    """Tests for SingleInstance."""
+
+    def test_second_acquire_fails(self, paths):
+        """Test that only one holder of the lock is allowed."""
+        first = SingleInstance(*paths)
+        second = SingleInstance(*paths)
+        try:
+            assert first.acquire() is True
+            assert second.acquire() is False
+        finally:
+            first.close()
+
+        # Released locks can be taken again
+        assert second.acquire() is True
+        second.close()
+
+    def test_forward_reaches_handler(self, paths):
+        """Test that a forwarded launch is delivered to the running instance."""
+        received = []
+        instance = SingleInstance(*paths)
+        assert instance.acquire()
+        instance.start(received.append)
+        try:
+            start = time.monotonic()
+            ok = forward_to_running_instance(
+                {"action": "new_tab", "prompt": "hi"}, paths[1]
+            )
+            elapsed = time.monotonic() - start
+
+            assert ok is True
+            assert received == [{"action": "new_tab", "prompt": "hi"}]
+            assert elapsed < 0.1
+        finally:
+            instance.close()
+
+        assert not os.path.exists(paths[1])
+
+    def test_launches_before_handler_are_queued(self, paths):
+        """Test that launches during a cold start are delivered once ready."""
+        received = []
+        instance = SingleInstance(*paths)
+        assert instance.acquire()
+        instance.start()
+        try:
+            assert forward_to_running_instance({"action": "new_tab", "prompt": "a"}, paths[1])
+            assert forward_to_running_instance({"action": "raise"}, paths[1])
+            assert received == []
+
+            instance.set_handler(received.append)
+            assert forward_to_running_instance({"action": "new_tab", "prompt": "b"}, paths[1])
+            assert received == [
+                {"action": "new_tab", "prompt": "a"},
+                {"action": "raise"},
+                {"action": "new_tab", "prompt": "b"},
+            ]
+        finally:
+            instance.close()
+
+    def test_forward_without_instance(self, paths):
+        """Test that forwarding fails fast when nothing is running."""
+        assert forward_to_running_instance({"action": "raise"}, paths[1]) is False
+
+    def test_stale_socket_is_replaced(self, paths):
+        """Test that a socket file left by a crashed instance doesn't block startup."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(paths[1])
+        stale.close()
+        assert forward_to_running_instance({"action": "raise"}, paths[1]) is False
+
+        received = []
+        instance = SingleInstance(*paths)
+        assert instance.acquire()
+        instance.start(received.append)
+        try:
+            assert forward_to_running_instance({"action": "raise"}, paths[1]) is True
+            assert received == [{"action": "raise"}]
+        finally:
+            instance.close()
+
+
+class TestLaunchMessage:
+    """Tests for turning command line arguments into forwarded commands."""
+
+    def test_plain_launch_raises_window(self):
+        assert launch_message(build_parser().parse_args([])) == {"action": "raise"}
+
+    def test_prompt_opens_new_tab(self):
+        args = build_parser().parse_args(["why", "is", "the", "sky", "blue"])
+        assert launch_message(args) == {
+            "action": "new_tab",
+            "prompt": "why is the sky blue",
+        }
+
+    def test_new_tab_without_prompt(self):
+        args = build_parser().parse_args(["--new-tab"])
+        assert launch_message(args) == {"action": "new_tab", "prompt": ""}
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+
+"""
+Tests for tab save files and compressed tab archives.
+"""
+
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.tab_files import (
+    _zstd_module,
+    build_tab_index,
+    iter_tab_file,
+    load_tab_index,
+    read_newest_first,
+    read_tab_file,
+    tab_file_path,
+    tab_index_path,
+    write_tab_file,
+)
+from mychatui.tab_pager import TabPager
+
+
+def make_tab(count):
+    return {
+        "tab_name": "Big Tab",
+        "model_name": "ollama:qwen2.5:latest",
+        "chat_history": [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"<p>msg {i}</p>"}
+            for i in range(count)
+        ],
+    }
+
+
+def zstd_available():
+    try:
+        _zstd_module()
+        return True
+    except RuntimeError:
+        return False
+
+
+FORMATS = ["json", "jsonl", "gzip"] + (["zstd"] if zstd_available() else [])
+
+
+class TestTabFilePath:
+    """Tests for tab_file_path."""
+
+    def test_extensions(self):
+        """Test that each save format gets its own extension."""
+        assert tab_file_path("/c", "Tab 1") == "/c/Tab 1.json"
+        assert tab_file_path("/c", "Tab 1", "gzip") == "/c/Tab 1.jsonl.gz"
+        assert tab_file_path("/c", "Tab 1", "zstd") == "/c/Tab 1.jsonl.zst"
+
+    def test_unknown_format(self):
+        """Test that an unknown format setting is rejected."""
+        with pytest.raises(ValueError):
+            tab_file_path("/c", "Tab 1", "rar")
+
+
+@pytest.mark.parametrize("save_format", FORMATS)
+class TestTabArchive:
+    """Round trip tests for every available save format."""
+
+    def test_round_trip(self, tmp_path, save_format):
+        """Test that a saved tab reads back unchanged."""
+        path = tab_file_path(str(tmp_path), "Big Tab", save_format)
+        tab = make_tab(101)
+
+        write_tab_file(path, tab)
+
+        assert read_tab_file(path) == tab
+
+    def test_streams_newest_first(self, tmp_path, save_format):
+        """Test that messages are yielded newest first with a header up front."""
+        path = tab_file_path(str(tmp_path), "Big Tab", save_format)
+        tab = make_tab(5)
+        write_tab_file(path, tab)
+
+        header, messages = iter_tab_file(path)
+
+        assert header["tab_name"] == "Big Tab"
+        assert header["message_count"] == 5
+        assert next(messages) == tab["chat_history"][-1]
+        assert list(messages) == tab["chat_history"][-2::-1]
+
+    def test_read_newest_first_batches(self, tmp_path, save_format):
+        """Test the newest batch comes first and both batches are chronological."""
+        path = tab_file_path(str(tmp_path), "Big Tab", save_format)
+        tab = make_tab(50)
+        write_tab_file(path, tab)
+
+        batches = [batch for _, batch in read_newest_first(path, 10)]
+
+        assert batches == [tab["chat_history"][40:], tab["chat_history"][:40]]
+
+
+class TestGzipArchive:
+    """Format details of the gzip archive."""
+
+    def test_is_line_delimited_json(self, tmp_path):
+        """Test that the archive is compressed JSON lines with a header."""
+        path = tab_file_path(str(tmp_path), "Big Tab", "gzip")
+        write_tab_file(path, make_tab(3))
+
+        with gzip.open(path, "rt") as f:
+            lines = [json.loads(line) for line in f]
+
+        assert lines[0]["format"] == "mychatui-tab"
+        assert [m["content"] for m in lines[1:]] == [
+            "<p>msg 2</p>",
+            "<p>msg 1</p>",
+            "<p>msg 0</p>",
+        ]
+
+    def test_rejects_foreign_archive(self, tmp_path):
+        """Test that a gzip file that isn't a tab archive is refused."""
+        path = str(tmp_path / "other.jsonl.gz")
+        with gzip.open(path, "wt") as f:
+            f.write('{"hello": "world"}\n')
+
+        with pytest.raises(ValueError):
+            iter_tab_file(path)
+
+
+class TestTabPager:
+    """Tests for paged reads of .jsonl archives."""
+
+    def test_jsonl_writes_offset_index(self, tmp_path):
+        """Test that uncompressed archives get an index next to them."""
+        path = tab_file_path(str(tmp_path), "Big Tab", "jsonl")
+        write_tab_file(path, make_tab(10))
+
+        assert sorted(os.listdir(tmp_path)) == ["Big Tab.jsonl", "Big Tab.jsonl.idx"]
+        assert load_tab_index(path) == build_tab_index(path)
+
+    def test_read_pages(self, tmp_path):
+        """Test reading chronological pages by seeking."""
+        path = tab_file_path(str(tmp_path), "Big Tab", "jsonl")
+        tab = make_tab(120)
+        write_tab_file(path, tab)
+
+        pager = TabPager(path)
+        try:
+            assert pager.message_count == 120
+            assert pager.header["tab_name"] == "Big Tab"
+            assert pager.read_page(70, 120) == tab["chat_history"][70:]
+            assert pager.read_page(20, 70) == tab["chat_history"][20:70]
+            assert pager.read_page(-5, 20) == tab["chat_history"][:20]
+            assert pager.read_page(5, 5) == []
+        finally:
+            pager.close()
+
+    def test_stale_index_is_rebuilt(self, tmp_path):
+        """Test that a missing or stale index is rebuilt from the archive."""
+        path = tab_file_path(str(tmp_path), "Big Tab", "jsonl")
+        tab = make_tab(30)
+        write_tab_file(path, tab)
+        with open(tab_index_path(path), "w") as f:
+            json.dump({"size": 1, "offsets": [0]}, f)
+
+        pager = TabPager(path)
+        try:
+            assert pager.read_page(0, 30) == tab["chat_history"]
+        finally:
+            pager.close()
+
+        os.unlink(tab_index_path(path))
+        assert load_tab_index(path) == build_tab_index(path)
+        assert os.path.exists(tab_index_path(path))
+
+    def test_requires_jsonl(self, tmp_path):
+        """Test that compressed archives can't be paged."""
+        path = tab_file_path(str(tmp_path), "Big Tab", "gzip")
+        write_tab_file(path, make_tab(3))
+
+        with pytest.raises(ValueError):
+            TabPager(path)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+"""
+Tests for the native tk.Text transcript renderer's token walking.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("markdown_it")
+
+from mychatui.palette import TAG_STYLES
+from mychatui.text_renderer import (
+    ASSISTANT_PREFIX,
+    PARTIAL_MARK,
+    USER_PREFIX,
+    history_runs,
+    insert_fragments,
+    html_runs,
+    markdown_runs,
+    message_runs,
+)
+
+
+def tagged(runs, tag):
+    return [text for text, tags in runs if tag in tags]
+
+
+def plain(runs):
+    return "".join(text for text, _ in runs)
+
+
+class TestMarkdownRuns:
+    def test_inline_styles_become_tags(self):
+        """Bold, emphasis and inline code map to the style_map tag names."""
+        runs = markdown_runs("Some **bold**, *em* and `code` here")
+        assert tagged(runs, "strong") == ["bold"]
+        assert tagged(runs, "em") == ["em"]
+        assert tagged(runs, "code") == ["code"]
+        assert plain(runs) == "Some bold, em and code here\n\n"
+
+    def test_nested_inline_tags(self):
+        runs = markdown_runs("**bold *both***")
+        assert ("both", ("strong", "em")) in runs
+
+    def test_headings_and_paragraphs(self):
+        runs = markdown_runs("# Title\n\nFirst\n\nSecond")
+        assert tagged(runs, "h1") == ["Title"]
+        assert plain(runs) == "Title\n\nFirst\n\nSecond\n\n"
+
+    def test_lists(self):
+        text = plain(markdown_runs("- a\n- b\n\n1. x\n2. y\n"))
+        assert text == "• a\n• b\n\n1. x\n2. y\n\n"
+
+    def test_nested_lists_are_indented(self):
+        assert plain(markdown_runs("- a\n  - b\n- c")) == "• a\n    • b\n• c\n\n"
+
+    def test_fenced_code_keeps_its_text(self):
+        runs = markdown_runs("```python\nprint('<hi>')\n```\n")
+        assert tagged(runs, "pre") == ["print('<hi>')\n"]
+
+    def test_adjacent_runs_are_merged(self):
+        runs = markdown_runs("one\ntwo")
+        assert runs == [("one two\n\n", ())]
+
+    def test_front_matter_is_not_shown(self):
+        assert plain(markdown_runs("---\ntitle: x\n---\nBody")) == "Body\n\n"
+
+    def test_every_tag_is_styled(self):
+        runs = markdown_runs("# h\n\n**b** *i* `c` [link](http://x)\n\n```\nx\n```")
+        for _, tags in runs:
+            assert set(tags) <= set(TAG_STYLES)
+
+
+class TestMessageRuns:
+    def test_assistant_markdown_gets_prefix(self):
+        runs = message_runs({"role": "assistant", "content": "", "markdown": "**hi**"})
+        assert runs[0] == (ASSISTANT_PREFIX, ())
+        assert plain(runs) == ASSISTANT_PREFIX + "hi\n\n"
+
+    def test_user_text_is_not_parsed(self):
+        runs = message_runs({"role": "user", "content": "", "text": "a <b> *c*"})
+        assert plain(runs) == USER_PREFIX + "a <b> *c*\n\n"
+
+    def test_html_only_messages_fall_back(self):
+        """Messages saved before the raw text was kept still render."""
+        message = {"role": "assistant", "content": "🤖 AI: <p>x <strong>y</strong></p>"}
+        runs = message_runs(message)
+        assert plain(runs) == "🤖 AI: x y\n\n"
+        assert tagged(runs, "strong") == ["y"]
+
+    def test_history_runs(self):
+        history = [
+            {"role": "user", "content": "<p>🧑 You: hi</p>", "text": "hi"},
+            {"role": "assistant", "content": "", "markdown": "Hello"},
+        ]
+        assert plain(history_runs(history)) == (
+            USER_PREFIX + "hi\n\n" + ASSISTANT_PREFIX + "Hello\n\n"
+        )
+
+    def test_html_runs_entities_and_breaks(self):
+        assert plain(html_runs("<p>a &amp; b<br>c</p>")) == "a & b\nc\n"
+
+
+class TestInsertFragments:
+    def test_fragments_hold_text_and_tags(self):
+        history = [{"role": "assistant", "content": "", "markdown": "**a** b"}]
+        fragments = insert_fragments(history)
+        assert fragments == [(ASSISTANT_PREFIX, (), "a", ("strong",), " b\n\n", ())]
+
+    def test_fragments_are_bounded(self):
+        history = [{"role": "assistant", "content": "", "markdown": "**a** b"}] * 3
+        fragments = insert_fragments(history, runs_per_fragment=4)
+        # Seven runs: untagged text between messages merges into one run.
+        assert [len(f) for f in fragments] == [8, 6]
+
+    def test_start_skips_rendered_messages(self):
+        history = [
+            {"role": "user", "content": "", "text": "old"},
+            {"role": "user", "content": "", "text": "new"},
+        ]
+        assert insert_fragments(history, start=1) == [(USER_PREFIX + "new\n\n", ())]
+
+    def test_partial_reply_is_marked(self):
+        history = [
+            {"role": "user", "content": "", "text": "q"},
+            {"role": "assistant", "content": "", "markdown": "so far", "partial": True},
+        ]
+        assert insert_fragments(history) == [
+            (USER_PREFIX + "q\n\n", ()),
+            PARTIAL_MARK,
+            (ASSISTANT_PREFIX + "so far\n\n", ()),
+        ]
+        assert insert_fragments(history, start=1)[0] == PARTIAL_MARK
+
+
+class TestCodeBlockRuns:
+    def test_fence_language_is_tagged(self):
+        runs = markdown_runs("```python\nx = 1\n```\n")
+        assert runs[0] == ("x = 1\n", ("pre", "lang:python"))
+
+    def test_fence_without_language(self):
+        assert markdown_runs("```\nx\n```\n")[0] == ("x\n", ("pre",))
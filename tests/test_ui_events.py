@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""
+Tests for the worker-to-Tk UI event bus.
+"""
+
+import os
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.ui_events import (
+    Delta,
+    Done,
+    Progress,
+    Transcription,
+    UiEventBus,
+    coalesce,
+)
+
+
+class FakeTk:
+    """Collects ``after`` callbacks; ``tick()`` runs the ones due now."""
+
+    def __init__(self):
+        self.timers = []
+
+    def after(self, delay, func):
+        self.timers.append((delay, func))
+
+    def tick(self):
+        timers, self.timers = self.timers, []
+        for _, func in timers:
+            func()
+
+
+class TestCoalesce:
+    def test_deltas_for_a_tab_are_joined(self):
+        a, b = object(), object()
+        events = [Delta(a, "he"), Delta(a, "llo"), Delta(b, "x"), Delta(a, "!")]
+        assert coalesce(events) == [Delta(a, "hello"), Delta(b, "x"), Delta(a, "!")]
+
+    def test_partial_transcriptions_keep_the_latest(self):
+        entry = object()
+        events = [
+            Transcription(entry, "a", final=False),
+            Transcription(entry, "a b", final=False),
+            Transcription(entry, "a b c"),
+            Transcription(entry, "next", final=False),
+        ]
+        assert coalesce(events) == [
+            Transcription(entry, "a b c"),
+            Transcription(entry, "next", final=False),
+        ]
+
+    def test_other_events_are_kept(self):
+        events = [Progress(True), Progress(False)]
+        assert coalesce(events) == events
+
+
+class TestUiEventBus:
+    def setup_method(self):
+        self.tk = FakeTk()
+        self.bus = UiEventBus(self.tk.after, max_batch=3)
+        self.seen = []
+        self.bus.subscribe(Progress, lambda e: self.seen.append(e.active))
+        self.bus.subscribe(Done, lambda e: self.seen.append(e.content))
+
+    def test_events_are_applied_in_order(self):
+        self.bus.post(Progress(True))
+        self.bus.post(Done(None, None, "reply"))
+        self.bus.post(Progress(False))
+        self.bus.drain()
+        assert self.seen == [True, "reply", False]
+
+    def test_drain_is_batched(self):
+        for i in range(5):
+            self.bus.post(Done(None, None, i))
+        assert self.bus.drain() == 3
+        assert self.seen == [0, 1, 2]
+        assert self.bus.drain() == 2
+        assert self.seen == [0, 1, 2, 3, 4]
+
+    def test_call_runs_function(self):
+        self.bus.call(self.seen.append, "called")
+        self.bus.drain()
+        assert self.seen == ["called"]
+
+    def test_handler_errors_do_not_stop_the_batch(self):
+        self.bus.subscribe(Progress, lambda e: 1 / 0)
+        self.bus.post(Progress(True))
+        self.bus.post(Done(None, None, "after"))
+        self.bus.drain()
+        assert self.seen == ["after"]
+
+    def test_periodic_drain_until_stopped(self):
+        self.bus.start()
+        self.bus.post(Progress(True))
+        self.tk.tick()
+        assert self.seen == [True]
+        assert len(self.tk.timers) == 1
+        self.bus.stop()
+        self.bus.post(Progress(False))
+        self.tk.tick()
+        assert self.seen == [True]
+        assert self.tk.timers == []
+
+    def test_posting_from_threads(self):
+        threads = [
+            threading.Thread(
+                target=lambda n=n: [self.bus.post(Done(None, None, n)) for _ in range(50)]
+            )
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        while self.bus.drain():
+            pass
+        assert sorted(self.seen) == sorted(n for n in range(4) for _ in range(50))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+Tests for the usage, throughput and cost store.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.usage_store import (
+    UsageStore,
+    estimate_cost,
+    format_report,
+    percentile,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = UsageStore(str(tmp_path / "usage.db"))
+    yield store
+    store.close()
+
+
+PRICING = {
+    "openai:gpt-4o": {"prompt": 2.5, "completion": 10.0},
+    "ollama": {"prompt": 0, "completion": 0},
+}
+
+
+def usage(prompt, completion):
+    return {"prompt_tokens": prompt, "completion_tokens": completion}
+
+
+class TestHelpers:
+    def test_percentile_nearest_rank(self):
+        values = [5, 1, 4, 2, 3]
+        assert percentile(values, 50) == 3
+        assert percentile(values, 95) == 5
+        assert percentile(values, 0) == 1
+        assert percentile([], 50) is None
+
+    def test_cost_by_model_then_provider(self):
+        assert estimate_cost("openai:gpt-4o", 1_000_000, 100_000, PRICING) == 3.5
+        assert estimate_cost("ollama:llama3", 500, 500, PRICING) == 0
+        assert estimate_cost("anthropic:x", 1, 1, PRICING) is None
+        assert estimate_cost("openai:gpt-4o", 1, 1, None) is None
+
+
+class TestUsageStore:
+    """Tests for recording and aggregating calls."""
+
+    def test_stats_per_model(self, store):
+        store.record("openai:gpt-4o", 2.0, usage(100, 40), tab_name="Tab 1")
+        store.record("openai:gpt-4o", 1.0, usage(100, 20), tab_name="Tab 2")
+        store.record("openai:gpt-4o", 9.0, tab_name="Tab 1", ok=False)
+        store.record("ollama:llama3", 0.5, usage(10, 5), tab_name="Tab 1")
+
+        by_model = {s["model"]: s for s in store.stats("model", pricing=PRICING)}
+        gpt = by_model["openai:gpt-4o"]
+        assert gpt["calls"] == 3
+        assert gpt["errors"] == 1
+        assert gpt["completion_tokens"] == 60
+        assert gpt["tokens_per_second"] == pytest.approx(20.0)
+        # Failed calls don't count towards latency.
+        assert gpt["p50"] == 1.0
+        assert gpt["p95"] == 2.0
+        assert gpt["cost"] == pytest.approx((200 * 2.5 + 60 * 10.0) / 1_000_000)
+        assert by_model["ollama:llama3"]["cost"] == 0
+
+    def test_stats_per_tab(self, store):
+        store.record("openai:gpt-4o", 2.0, usage(100, 40), tab_name="Tab 1")
+        store.record("anthropic:x", 1.0, usage(1, 1), tab_name="Tab 1")
+        store.record("openai:gpt-4o", 1.0, usage(100, 20), tab_name="Tab 2")
+
+        tabs = store.stats("tab_name", pricing=PRICING)
+        assert [s["tab_name"] for s in tabs] == ["Tab 1", "Tab 2"]
+        # One call without a price makes the tab's cost unknown.
+        assert tabs[0]["cost"] is None
+
+    def test_since_filters_old_calls(self, store):
+        store.record("m:a", 1.0, usage(1, 1), started_at=time.time() - 3600)
+        store.record("m:a", 1.0, usage(1, 1))
+        assert store.stats(since=time.time() - 60)[0]["calls"] == 1
+
+    def test_unknown_grouping(self, store):
+        with pytest.raises(ValueError):
+            store.stats("content")
+
+    def test_tokens_per_day(self, store):
+        store.record("m:a", 1.0, usage(3, 4))
+        store.record("m:a", 1.0, usage(1, 2))
+        store.record("m:a", 1.0, usage(5, 5), started_at=time.time() - 90 * 86400)
+        rows = store.tokens_per_day(days=30)
+        assert len(rows) == 1
+        assert rows[0]["tokens"] == 10
+
+    def test_report(self, store):
+        store.record("openai:gpt-4o", 2.0, usage(1000, 100), tab_name="Tab 1")
+        report = format_report(store, PRICING)
+        assert "openai:gpt-4o" in report
+        assert "Tab 1" in report
+        assert "$0.0035" in report
+        assert "50.0" in report
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Tests for energy-based voice activity detection.
+"""
+
+import os
+import struct
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.vad import EnergyVAD, SilenceDetector, frame_energy
+
+FRAME = 480  # samples in 30 ms at 16 kHz
+
+
+def pcm(*levels, frames=1):
+    """Build audio with ``frames`` constant frames per level."""
+    samples = []
+    for level in levels:
+        samples.extend([level] * FRAME * frames)
+    return struct.pack(f"<{len(samples)}h", *samples)
+
+
+class TestEnergyVAD:
+    """Tests for frame classification and trimming."""
+
+    def test_frame_energy(self):
+        assert frame_energy(b"") == 0.0
+        assert frame_energy(pcm(0)) == 0.0
+        assert abs(frame_energy(pcm(-16384)) - 0.5) < 1e-6
+
+    def test_is_speech(self):
+        vad = EnergyVAD(threshold=0.05)
+        assert vad.is_speech(pcm(3000))
+        assert not vad.is_speech(pcm(100))
+
+    def test_trim_silence_keeps_padding(self):
+        vad = EnergyVAD(threshold=0.05)
+        audio = pcm(0, 3000, 0, frames=10)
+
+        trimmed = vad.trim_silence(audio, padding_ms=60)
+
+        # Ten speech frames plus two frames of padding on either side
+        assert trimmed == pcm(0, frames=2) + pcm(3000, frames=10) + pcm(0, frames=2)
+
+    def test_trim_silence_without_speech(self):
+        assert EnergyVAD().trim_silence(pcm(0, frames=20)) == b""
+
+
+class TestSilenceDetector:
+    """Tests for deciding when a recording is over."""
+
+    def feed(self, detector, level, frames):
+        return [detector.update(pcm(level)) for _ in range(frames)]
+
+    def test_stops_after_silence_following_speech(self):
+        detector = SilenceDetector(EnergyVAD(threshold=0.05), silence_seconds=0.3)
+
+        # Leading silence never ends the recording
+        assert not any(self.feed(detector, 0, 50))
+        assert not any(self.feed(detector, 3000, 5))
+        # 0.3 s is ten 30 ms frames
+        assert self.feed(detector, 0, 10) == [False] * 9 + [True]
+
+    def test_speech_resets_silence(self):
+        detector = SilenceDetector(EnergyVAD(threshold=0.05), silence_seconds=0.3)
+        self.feed(detector, 3000, 1)
+        self.feed(detector, 0, 9)
+        self.feed(detector, 3000, 1)
+
+        assert not any(self.feed(detector, 0, 9))
+
+    def test_no_speech_timeout(self):
+        detector = SilenceDetector(
+            EnergyVAD(threshold=0.05), silence_seconds=0.3, no_speech_timeout=0.9
+        )
+
+        assert self.feed(detector, 0, 30) == [False] * 29 + [True]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+
+"""
+Tests for the voice transcription benchmark harness.
+"""
+
+import os
+import struct
+import sys
+import types
+import wave
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.voice_bench import (
+    bench_daemon,
+    bench_in_process,
+    format_report,
+    generate_fixtures,
+    load_fixtures,
+    word_error_rate,
+)
+
+
+def write_clip(directory, name, seconds, reference=None):
+    samples = [1000] * int(16000 * seconds)
+    with wave.open(str(directory / f"{name}.wav"), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    if reference is not None:
+        (directory / f"{name}.txt").write_text(reference + "\n")
+
+
+class FakeModel:
+    def transcribe(self, audio, **kwargs):
+        return [types.SimpleNamespace(text="hello world")], None
+
+
+FAKE_DAEMON = """
+import json, sys
+print(json.dumps({"event": "ready"}), flush=True)
+for line in sys.stdin:
+    cmd = json.loads(line)
+    if cmd["cmd"] == "ping":
+        print(json.dumps({"event": "pong"}), flush=True)
+    elif cmd["cmd"] == "transcribe":
+        print(json.dumps({"event": "partial", "text": "hello"}), flush=True)
+        print(json.dumps({"event": "final", "text": "hello there"}), flush=True)
+"""
+
+
+class TestWordErrorRate:
+    """Tests for the WER calculation."""
+
+    def test_identical(self):
+        assert word_error_rate("Hello, world!", "hello world") == 0.0
+
+    def test_substitution_deletion_insertion(self):
+        assert word_error_rate("the cat sat", "the bat sat") == pytest.approx(1 / 3)
+        assert word_error_rate("the cat sat", "the sat") == pytest.approx(1 / 3)
+        assert word_error_rate("the cat sat", "the cat sat down") == pytest.approx(
+            1 / 3
+        )
+
+    def test_empty(self):
+        assert word_error_rate("", "") == 0.0
+        assert word_error_rate("", "noise") == 1.0
+        assert word_error_rate("said something", "") == 1.0
+
+
+FAKE_TTS = """
+import struct, sys, wave
+path = sys.argv[sys.argv.index("-w") + 1]
+with wave.open(path, "wb") as wav:
+    wav.setnchannels(2)
+    wav.setsampwidth(2)
+    wav.setframerate(22050)
+    wav.writeframes(struct.pack("<2h", 500, -500) * 22050)
+"""
+
+
+class TestGenerateFixtures:
+    """Tests for synthesizing clips from the .txt references."""
+
+    def test_generates_missing_clips(self, tmp_path):
+        (tmp_path / "a.txt").write_text("first clip\n")
+        write_clip(tmp_path, "b", 0.5, "already recorded")
+        script = tmp_path / "fake_tts.py"
+        script.write_text(FAKE_TTS)
+
+        generated = generate_fixtures(str(tmp_path), f"{sys.executable} {script}")
+
+        assert generated == ["a"]
+        with wave.open(str(tmp_path / "a.wav"), "rb") as wav:
+            assert (wav.getnchannels(), wav.getframerate()) == (1, 16000)
+            assert wav.getnframes() == pytest.approx(16000, abs=1)
+        fixtures = load_fixtures(str(tmp_path))
+        assert [f.name for f in fixtures] == ["a", "b"]
+        assert fixtures[1].duration == pytest.approx(0.5)
+
+    def test_repo_fixtures_have_references(self):
+        directory = os.path.join(os.path.dirname(__file__), "fixtures", "voice")
+        assert [e for e in os.listdir(directory) if e.endswith(".txt")]
+
+
+class TestBenchmark:
+    """Tests for running the benchmark on fixtures."""
+
+    def test_load_fixtures_skips_unreferenced(self, tmp_path):
+        write_clip(tmp_path, "b", 0.5, "second clip")
+        write_clip(tmp_path, "a", 1.0, "first clip")
+        write_clip(tmp_path, "c", 1.0)
+
+        fixtures = load_fixtures(str(tmp_path))
+
+        assert [f.name for f in fixtures] == ["a", "b"]
+        assert fixtures[0].reference == "first clip"
+        assert fixtures[1].duration == pytest.approx(0.5)
+
+    def test_load_fixtures_empty(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_fixtures(str(tmp_path))
+
+    def test_in_process(self, tmp_path):
+        pytest.importorskip("numpy")
+        write_clip(tmp_path, "a", 1.0, "hello world")
+        write_clip(tmp_path, "b", 1.0, "hello there world")
+        loads = []
+
+        def loader(model_size, device, compute_type):
+            loads.append((model_size, device, compute_type))
+            return FakeModel()
+
+        result = bench_in_process(
+            load_fixtures(str(tmp_path)), "tiny", "int8", model_loader=loader
+        )
+
+        assert loads == [("tiny", "cpu", "int8")]
+        assert [c.text for c in result.clips] == ["hello world", "hello world"]
+        # One deletion over five reference words
+        assert result.wer == pytest.approx(1 / 5)
+        assert result.rtf > 0
+        assert result.first_partial is not None
+        assert "inprocess" in format_report([result])
+
+    def test_daemon(self, tmp_path):
+        write_clip(tmp_path, "a", 1.0, "hello there")
+        script = tmp_path / "fake_listen.py"
+        script.write_text(FAKE_DAEMON)
+        launcher = tmp_path / "listen"
+        launcher.write_text(f'#!/bin/sh\nexec {sys.executable} {script} "$@"\n')
+        launcher.chmod(0o755)
+
+        result = bench_daemon(load_fixtures(str(tmp_path)), str(launcher))
+
+        assert result.path == "daemon"
+        assert result.wer == 0.0
+        assert result.clips[0].first_partial is not None
+        assert result.load_time > 0
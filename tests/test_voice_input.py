@@ -6,6 +6,7 @@ Tests for voice input functionality using external listen command.
 
 import os
 import sys
+import threading
 import time
 from unittest.mock import Mock, patch
 
@@ -14,6 +15,7 @@ import pytest
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from mychatui.listen_daemon import ListenDaemon, ListenDaemonError
 from mychatui.voice_input import VoiceInput
 
 
@@ -93,6 +95,22 @@ class TestVoiceInputMocked:
         # Verify callback was called with the transcribed text
         callback.assert_called_once_with("hello world")
 
+    @patch("mychatui.voice_input.subprocess.Popen")
+    def test_vad_flags_passed_to_listen(self, mock_popen):
+        """Test that VAD settings are passed on the listen command line."""
+        mock_process = Mock()
+        mock_process.communicate.return_value = ("hello", "")
+        mock_popen.return_value = mock_process
+
+        voice_input = VoiceInput(
+            listen_command_path="/bin/listen", vad=True, silence_seconds=0.8
+        )
+        voice_input.start_recording()
+        time.sleep(0.5)
+
+        args, _ = mock_popen.call_args
+        assert args[0] == ["/bin/listen", "--vad", "--silence", "0.8"]
+
     @patch("mychatui.voice_input.subprocess.Popen")
     def test_recording_with_stderr(self, mock_popen):
         """Test that stderr is handled gracefully."""
@@ -188,6 +206,267 @@ class TestVoiceInputMocked:
             mock_popen.assert_not_called()
 
 
+FAKE_DAEMON = """
+import json, sys, time
+print(json.dumps({"event": "ready"}), flush=True)
+for line in sys.stdin:
+    cmd = json.loads(line)["cmd"]
+    if cmd == "ping":
+        print(json.dumps({"event": "pong"}), flush=True)
+    elif cmd == "stop":
+        print(json.dumps({"event": "partial", "text": "hello"}), flush=True)
+        print(json.dumps({"event": "final", "text": "hello daemon"}), flush=True)
+    elif cmd == "crash":
+        sys.exit(3)
+"""
+
+
+@pytest.fixture
+def fake_daemon(tmp_path):
+    """A ListenDaemon running a stub that speaks the daemon protocol."""
+    script = tmp_path / "fake_listen.py"
+    script.write_text(FAKE_DAEMON)
+    daemon = ListenDaemon([sys.executable, str(script)], startup_timeout=10)
+    yield daemon
+    daemon.stop()
+
+
+class TestListenDaemon:
+    """Tests for the persistent listen daemon and VoiceInput daemon mode."""
+
+    def test_start_and_ping(self, fake_daemon):
+        """Test that the daemon starts once and answers health checks."""
+        fake_daemon.ensure_healthy()
+        process = fake_daemon.process
+
+        assert fake_daemon.ping() is True
+        fake_daemon.ensure_healthy()
+        assert fake_daemon.process is process
+
+    def test_restart_after_crash(self, fake_daemon):
+        """Test that a dead daemon is restarted by the health check."""
+        fake_daemon.ensure_healthy()
+        first = fake_daemon.process
+        fake_daemon.send({"cmd": "crash"})
+        first.wait(timeout=5)
+
+        fake_daemon.ensure_healthy()
+
+        assert fake_daemon.process is not first
+        assert fake_daemon.ping() is True
+
+    def test_gives_up_after_repeated_failures(self, fake_daemon):
+        """Test that restarts are capped."""
+        fake_daemon.max_restarts = 1
+        fake_daemon.ensure_healthy()
+
+        def crash():
+            process = fake_daemon.process
+            fake_daemon.send({"cmd": "crash"})
+            process.wait(timeout=5)
+
+        crash()
+        fake_daemon.ensure_healthy()
+        crash()
+
+        with pytest.raises(ListenDaemonError):
+            fake_daemon.ensure_healthy()
+
+    def test_voice_input_daemon_session(self, fake_daemon):
+        """Test a start/stop recording session through the daemon."""
+        callback = Mock()
+        voice_input = VoiceInput(on_complete=callback, daemon=fake_daemon)
+
+        voice_input.start_recording()
+        time.sleep(0.5)
+        assert voice_input.is_recording is True
+        voice_input.stop_recording()
+        time.sleep(0.5)
+
+        callback.assert_called_once_with("hello daemon")
+        assert voice_input.is_recording is False
+        assert voice_input.process is None
+
+    def test_voice_input_daemon_partials(self, fake_daemon):
+        """Test that partial events from the daemon reach on_partial."""
+        partials = []
+        callback = Mock()
+        voice_input = VoiceInput(
+            on_complete=callback, daemon=fake_daemon, on_partial=partials.append
+        )
+
+        voice_input.start_recording()
+        time.sleep(0.5)
+        voice_input.stop_recording()
+        time.sleep(0.5)
+
+        assert partials == ["hello"]
+        callback.assert_called_once_with("hello daemon")
+
+    def test_voice_input_daemon_hang(self, fake_daemon):
+        """Test that a daemon that never answers a stop doesn't wedge recording."""
+        callback = Mock()
+        voice_input = VoiceInput(
+            on_complete=callback, daemon=fake_daemon, stop_timeout=0.3
+        )
+
+        voice_input.start_recording()
+        time.sleep(0.5)
+        fake_daemon.set_listener(None)  # swallow the final event, like a hang
+        voice_input.stop_recording()
+        time.sleep(1.0)
+
+        callback.assert_called_once_with("")
+        assert voice_input.is_recording is False
+        assert fake_daemon.process is None
+
+    def test_voice_input_daemon_time_limit(self, fake_daemon):
+        """Test that recordings are stopped after max_recording_seconds."""
+        callback = Mock()
+        voice_input = VoiceInput(
+            on_complete=callback, daemon=fake_daemon, max_recording_seconds=0.3
+        )
+
+        voice_input.start_recording()
+        time.sleep(1.5)
+
+        callback.assert_called_once_with("hello daemon")
+        assert voice_input.is_recording is False
+
+    def test_voice_input_daemon_reused(self, fake_daemon):
+        """Test that consecutive recordings share one daemon process."""
+        processes = []
+        for _ in range(2):
+            callback = Mock()
+            voice_input = VoiceInput(on_complete=callback, daemon=fake_daemon)
+            voice_input.start_recording()
+            time.sleep(0.3)
+            voice_input.stop_recording()
+            time.sleep(0.3)
+            callback.assert_called_once_with("hello daemon")
+            processes.append(fake_daemon.process)
+
+        assert processes[0] is processes[1]
+
+    def test_daemon_unavailable(self, tmp_path):
+        """Test that a missing daemon completes with empty text."""
+        daemon = ListenDaemon([str(tmp_path / "missing")], startup_timeout=1)
+        callback = Mock()
+        voice_input = VoiceInput(on_complete=callback, daemon=daemon)
+
+        voice_input.start_recording()
+        time.sleep(0.5)
+
+        callback.assert_called_once_with("")
+        assert voice_input.is_recording is False
+
+
+FAKE_STREAMING_LISTEN = """#!{python}
+import json, sys, time
+assert sys.argv[1:] == ["--stream"]
+for segment in ["the quick", "brown fox", "jumps"]:
+    print(json.dumps({{"event": "partial", "text": segment}}), flush=True)
+    time.sleep({delay})
+print(json.dumps({{"event": "final", "text": "The quick brown fox jumps."}}), flush=True)
+"""
+
+
+def make_streaming_listen(tmp_path, delay):
+    script = tmp_path / "listen_stream"
+    script.write_text(FAKE_STREAMING_LISTEN.format(python=sys.executable, delay=delay))
+    script.chmod(0o755)
+    return str(script)
+
+
+class TestVoiceInputPartials:
+    """Tests for streaming partial transcripts."""
+
+    def test_partials_accumulate_then_final(self, tmp_path):
+        """Test that partial segments build up and the final text replaces them."""
+        partials = []
+        callback = Mock()
+        voice_input = VoiceInput(
+            listen_command_path=make_streaming_listen(tmp_path, 0.2),
+            on_complete=callback,
+            on_partial=partials.append,
+            partial_interval=0.05,
+        )
+
+        voice_input.start_recording()
+        time.sleep(1.5)
+
+        assert partials == [
+            "the quick",
+            "the quick brown fox",
+            "the quick brown fox jumps",
+        ]
+        callback.assert_called_once_with("The quick brown fox jumps.")
+        assert voice_input.is_recording is False
+
+    def test_partials_are_throttled(self, tmp_path):
+        """Test that bursts of segments are coalesced to the latest text."""
+        partials = []
+        callback = Mock()
+        voice_input = VoiceInput(
+            listen_command_path=make_streaming_listen(tmp_path, 0),
+            on_complete=callback,
+            on_partial=partials.append,
+            partial_interval=10,
+        )
+
+        voice_input.start_recording()
+        time.sleep(1)
+
+        # Only the first segment gets through; the final text wins afterwards.
+        assert partials == ["the quick"]
+        callback.assert_called_once_with("The quick brown fox jumps.")
+
+    def test_no_partial_after_close(self, tmp_path):
+        """Test that closing partials waits for a partial already being delivered."""
+        delivered = []
+        in_partial = threading.Event()
+
+        def slow_partial(text):
+            in_partial.set()
+            time.sleep(0.2)
+            delivered.append(text)
+
+        voice_input = VoiceInput(
+            listen_command_path=make_streaming_listen(tmp_path, 0),
+            on_partial=slow_partial,
+        )
+        voice_input._partial_segments = ["the quick"]
+        flush = threading.Thread(target=voice_input._flush_partial)
+        flush.start()
+        assert in_partial.wait(1)
+
+        voice_input._close_partials()
+        # Anything delivered after this point would overwrite the final text.
+        assert delivered == ["the quick"]
+        voice_input._flush_partial()
+        flush.join()
+        assert delivered == ["the quick"]
+
+    def test_plain_text_output_still_works(self, tmp_path):
+        """Test that a listen command without streaming support still completes."""
+        script = tmp_path / "listen_plain"
+        script.write_text(f"#!{sys.executable}\nprint('plain transcription')\n")
+        script.chmod(0o755)
+        partials = []
+        callback = Mock()
+        voice_input = VoiceInput(
+            listen_command_path=str(script),
+            on_complete=callback,
+            on_partial=partials.append,
+        )
+
+        voice_input.start_recording()
+        time.sleep(1)
+
+        assert partials == []
+        callback.assert_called_once_with("plain transcription")
+
+
 @pytest.mark.integration
 class TestVoiceInputIntegration:
     """Integration tests with the actual listen command."""
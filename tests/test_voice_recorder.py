@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+
+"""
+Tests for the in-process VoiceRecorder, fed from WAV files instead of a microphone.
+"""
+
+import os
+import struct
+import sys
+import threading
+import types
+import wave
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mychatui.voice_recorder import (
+    SAMPLE_RATE,
+    AudioRingBuffer,
+    VoiceRecorder,
+    WavFileSource,
+    clear_model_cache,
+    get_whisper_model,
+    merge_overlap,
+)
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+class FakeModel:
+    """Names each chunk after its loudest sample, in thousands."""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio, **kwargs):
+        with self.lock:
+            self.calls += 1
+        level = round(float(abs(audio).max()) * 32768 / 1000)
+        return [types.SimpleNamespace(text=f" word{level} ")], None
+
+
+@pytest.fixture
+def stepped_wav(tmp_path):
+    """Three and a half seconds where second N has sample value N * 1000."""
+    samples = []
+    for second in range(4):
+        length = SAMPLE_RATE if second < 3 else SAMPLE_RATE // 2
+        samples.extend([(second + 1) * 1000] * length)
+    path = tmp_path / "speech.wav"
+    write_wav(path, samples)
+    return str(path)
+
+
+class TestAudioRingBuffer:
+    """Tests for the capture ring buffer."""
+
+    def test_read_across_wraparound(self):
+        ring = AudioRingBuffer(8)
+        ring.write(b"abcdef")
+        ring.write(b"ghij")
+
+        assert ring.total_written == 10
+        assert ring.read(4, 10) == b"efghij"
+
+    def test_overwritten_range_raises(self):
+        ring = AudioRingBuffer(4)
+        ring.write(b"abcdefgh")
+
+        assert ring.read(4, 8) == b"efgh"
+        with pytest.raises(ValueError):
+            ring.read(2, 6)
+
+
+class TestMergeOverlap:
+    """Tests for removing words repeated by overlapping chunks."""
+
+    def test_repeated_words_are_dropped(self):
+        assert merge_overlap("the quick brown", "Brown fox jumps") == "fox jumps"
+
+    def test_punctuation_is_ignored(self):
+        assert merge_overlap("over the lazy dog.", "dog, and cat") == "and cat"
+
+    def test_no_overlap(self):
+        assert merge_overlap("hello there", "general kenobi") == "general kenobi"
+
+
+class TestModelCache:
+    """Tests for the process-wide whisper model cache."""
+
+    def test_model_loaded_once(self):
+        fake_module = types.SimpleNamespace(
+            WhisperModel=Mock(side_effect=lambda *args, **kwargs: object())
+        )
+        clear_model_cache()
+        try:
+            with patch.dict(sys.modules, {"faster_whisper": fake_module}):
+                first = get_whisper_model("tiny")
+                second = get_whisper_model("tiny")
+                other = get_whisper_model("tiny", compute_type="float32")
+        finally:
+            clear_model_cache()
+
+        assert first is second
+        assert other is not first
+        assert fake_module.WhisperModel.call_count == 2
+        _, kwargs = fake_module.WhisperModel.call_args_list[0]
+        assert kwargs["device"] == "cpu"
+        assert kwargs["compute_type"] == "int8"
+
+    def test_recorders_share_model(self):
+        fake_module = types.SimpleNamespace(
+            WhisperModel=Mock(side_effect=lambda *args, **kwargs: object())
+        )
+        clear_model_cache()
+        try:
+            with patch.dict(sys.modules, {"faster_whisper": fake_module}):
+                first = VoiceRecorder(model_size="base")
+                first.initialize_model()
+                second = VoiceRecorder(model_size="base")
+                second.initialize_model()
+        finally:
+            clear_model_cache()
+
+        assert first.model is second.model
+        fake_module.WhisperModel.assert_called_once()
+
+
+class TestVoiceRecorderWav:
+    """Tests for chunked transcription of a WAV file."""
+
+    def test_chunks_reported_in_order(self, stepped_wav):
+        pytest.importorskip("numpy")
+        model = FakeModel()
+        updates = []
+        recorder = VoiceRecorder(
+            on_transcription=updates.append,
+            chunk_seconds=1.0,
+            overlap_seconds=0.25,
+            workers=3,
+            audio_source=WavFileSource(stepped_wav),
+            model=model,
+        )
+
+        recorder.start_recording()
+        assert recorder.wait_until_finished(timeout=5)
+        text = recorder.stop_recording()
+        recorder.cleanup()
+
+        # Three full chunks plus the half-second remainder
+        assert updates == ["word1", "word2", "word3", "word4"]
+        assert text == "word1 word2 word3 word4"
+        assert model.calls == 4
+
+    def test_stop_before_any_full_chunk(self, tmp_path):
+        pytest.importorskip("numpy")
+        path = tmp_path / "short.wav"
+        write_wav(path, [2000] * (SAMPLE_RATE // 4))
+        recorder = VoiceRecorder(
+            chunk_seconds=5.0,
+            audio_source=WavFileSource(str(path)),
+            model=FakeModel(),
+        )
+
+        recorder.start_recording()
+        recorder.wait_until_finished(timeout=5)
+
+        assert recorder.stop_recording() == "word2"
+
+    def test_rejects_wrong_sample_rate(self, tmp_path):
+        path = tmp_path / "cd.wav"
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(44100)
+            wav.writeframes(b"\0" * 400)
+        recorder = VoiceRecorder(audio_source=WavFileSource(str(path)), model=Mock())
+
+        recorder.start_recording()
+        recorder.wait_until_finished(timeout=5)
+        assert recorder.stop_recording() == ""
+        assert isinstance(recorder.error, ValueError)
+
+    def test_vad_stops_after_silence(self, tmp_path):
+        pytest.importorskip("numpy")
+        # Half a second of silence, one second of "speech", then ten seconds of
+        # silence that the recorder should never get to the end of.
+        samples = [0] * (SAMPLE_RATE // 2) + [3000] * SAMPLE_RATE
+        samples += [0] * (SAMPLE_RATE * 10)
+        path = tmp_path / "pause.wav"
+        write_wav(path, samples)
+
+        model = FakeModel()
+        stopped = threading.Event()
+        source = WavFileSource(str(path))
+        recorder = VoiceRecorder(
+            chunk_seconds=5.0,
+            audio_source=source,
+            model=model,
+            vad=True,
+            silence_seconds=0.6,
+            on_silence=stopped.set,
+        )
+
+        recorder.start_recording()
+        recorder.wait_until_finished(timeout=5)
+
+        assert stopped.is_set()
+        # Stopped 0.6s after the speech ended, well before the file did
+        assert recorder._ring.total_written < int(2.3 * SAMPLE_RATE) * 2
+        assert recorder.stop_recording() == "word3"
+        assert model.calls == 1
+
+    def test_vad_skips_silent_chunks(self, tmp_path):
+        pytest.importorskip("numpy")
+        path = tmp_path / "silence.wav"
+        write_wav(path, [0] * (SAMPLE_RATE * 2))
+        model = FakeModel()
+        recorder = VoiceRecorder(
+            chunk_seconds=1.0,
+            audio_source=WavFileSource(str(path)),
+            model=model,
+            vad=True,
+            silence_seconds=5.0,
+        )
+
+        recorder.start_recording()
+        recorder.wait_until_finished(timeout=5)
+
+        assert recorder.stop_recording() == ""
+        assert model.calls == 0